@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+autoeval/analytics.py — Score-tensor analytics over the full iteration history.
+
+Every scores/iter*.json is packed into one int8 array of shape
+(evaluation × plan slot × requirement), cached as score_tensor/scores.npy and
+memory-mapped on load. The cache is keyed by file name, mtime and size, so
+only new or changed score files are parsed. Per-requirement trends, variance,
+per-brief breakdowns and the link between prompt edits and requirement
+movements are then whole-array NumPy operations.
+
+Prompts are archived as prompts/<hash>.md when they are evaluated (see
+run.py), which is what lets a prompt diff be lined up with the scores it
+produced. Run directly for a text report:
+
+  python autoeval/analytics.py
+"""
+
+from __future__ import annotations
+
+import json
+import operator
+import os
+import re
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+
+from rubric import BRIEFS, MAX_REQ_SCORE, NUM_PLANS, NUM_PLANS_PER_BRIEF, RUBRIC
+
+BASE        = os.path.dirname(os.path.abspath(__file__))
+SCORES_DIR  = os.path.join(BASE, "scores")
+PROMPTS_DIR = os.path.join(BASE, "prompts")
+TENSOR_DIR  = os.path.join(BASE, "score_tensor")
+TENSOR_FILE = os.path.join(TENSOR_DIR, "scores.npy")
+INDEX_FILE  = os.path.join(TENSOR_DIR, "index.json")
+
+MISSING         = -1         # tensor value of a requirement a plan was not scored on
+TREND_WINDOW    = 10         # iterations a trend slope is fitted over
+MIN_PROMPT_PAIRS = 5         # prompt edits needed before term correlations mean anything
+
+REQ_COLUMNS = [f"{t}.{r}" for t, reqs in RUBRIC.items() for r in reqs]
+SCORE_FILE  = re.compile(r"iter(\d+)(?:_c(\d+))?\.json")
+TERM        = re.compile(r"[a-z][a-z_-]{3,}")
+
+# Plan-pack index columns plan_sizes() reads (see planpack.PlanPack.entries).
+SIZE_COLUMNS = ["iteration", "candidate", "plan", "size"]
+
+# One C-level lookup per test instead of one per requirement when parsing.
+_GETTERS = {t: operator.itemgetter(*reqs) for t, reqs in RUBRIC.items()}
+
+
+@dataclass
+class ScoreTensor:
+    scores: np.ndarray    # (n, plans, requirements) int8, MISSING where unscored
+    keys: np.ndarray      # (n, 2) int32 (iteration, candidate), sorted
+
+    @property
+    def iterations(self) -> np.ndarray:
+        return self.keys[:, 0]
+
+    @property
+    def candidates(self) -> np.ndarray:
+        return self.keys[:, 1]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+# ── loading ────────────────────────────────────────────────────────────────────
+
+def _test_values(plan: dict, test_key: str, reqs: list[str]) -> list:
+    test_scores = plan.get(test_key)
+    if not isinstance(test_scores, dict):
+        return [None] * len(reqs)
+    try:
+        values = _GETTERS[test_key](test_scores)
+    except KeyError:
+        return [test_scores.get(req) for req in reqs]
+    return list(values) if len(reqs) > 1 else [values]
+
+
+def _number(value: object) -> float:
+    try:
+        return float(int(value))
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def parse_score_file(path: str) -> np.ndarray:
+    """(plan slots, requirements) int8 scores of one score file."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return np.full((0, len(REQ_COLUMNS)), MISSING, dtype=np.int8)
+    plans = {int(k[5:]): v for k, v in data.items()
+             if k.startswith("plan_") and k[5:].isdigit() and isinstance(v, dict)}
+    out = np.full((max(plans, default=0), len(REQ_COLUMNS)), MISSING, dtype=np.int8)
+    if not plans:
+        return out
+    rows = [[v for test_key, reqs in RUBRIC.items() for v in _test_values(plan, test_key, reqs)]
+            for plan in plans.values()]
+    try:
+        values = np.array(rows, dtype=np.float64)   # None -> NaN
+    except (TypeError, ValueError):
+        values = np.array([[_number(v) for v in row] for row in rows])
+    out[[n - 1 for n in plans]] = np.where(np.isnan(values), MISSING, np.clip(np.nan_to_num(values), 0, MAX_REQ_SCORE))
+    return out
+
+
+def _scan(scores_dir: str) -> list[tuple[str, int, int, int, int]]:
+    """(name, mtime_ns, size, iteration, candidate) per score file, in (iteration, candidate) order."""
+    files = []
+    if os.path.isdir(scores_dir):
+        with os.scandir(scores_dir) as entries:
+            for entry in entries:
+                match = SCORE_FILE.fullmatch(entry.name)
+                if match:
+                    st = entry.stat()
+                    files.append((entry.name, st.st_mtime_ns, st.st_size,
+                                  int(match.group(1)), int(match.group(2) or 0)))
+    return sorted(files, key=lambda f: f[3:])
+
+
+def load(scores_dir: str = SCORES_DIR) -> ScoreTensor:
+    """The score tensor for every score file, parsing only files the cache does not hold."""
+    files = _scan(scores_dir)
+    keys = np.array([f[3:] for f in files], dtype=np.int32).reshape(-1, 2)
+
+    cached: dict[str, int] = {}
+    old = None
+    try:
+        with open(INDEX_FILE, encoding="utf-8") as f:
+            index = json.load(f)
+        if index["columns"] == REQ_COLUMNS:
+            old = np.load(TENSOR_FILE, mmap_mode="r")
+            current = {f[:3] for f in files}
+            cached = {name: row for row, (name, mtime, size) in enumerate(index["files"])
+                      if row < len(old) and (name, mtime, size) in current}
+    except (OSError, ValueError, KeyError):
+        old = None
+    if old is not None and len(cached) == len(files) == len(old) and \
+            all(cached.get(f[0]) == row for row, f in enumerate(files)):
+        return ScoreTensor(old, keys)
+
+    fresh = {f[0]: parse_score_file(os.path.join(scores_dir, f[0])) for f in files if f[0] not in cached}
+    plans = max([old.shape[1] if cached else 0, *(a.shape[0] for a in fresh.values())], default=0)
+    os.makedirs(TENSOR_DIR, exist_ok=True)
+    tmp = f"{TENSOR_FILE}.tmp.{os.getpid()}.npy"
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.int8, shape=(len(files), plans, len(REQ_COLUMNS)))
+    out[:] = MISSING
+    for row, (name, *_) in enumerate(files):
+        if name in cached:
+            out[row, :old.shape[1]] = old[cached[name]]
+        else:
+            out[row, :len(fresh[name])] = fresh[name]
+    out.flush()
+    del out, old
+    os.replace(tmp, TENSOR_FILE)
+    with open(f"{INDEX_FILE}.tmp", "w", encoding="utf-8") as f:
+        json.dump({"columns": REQ_COLUMNS, "files": [f_[:3] for f_ in files]}, f)
+    os.replace(f"{INDEX_FILE}.tmp", INDEX_FILE)
+    return ScoreTensor(np.load(TENSOR_FILE, mmap_mode="r"), keys)
+
+# ── per-requirement statistics ─────────────────────────────────────────────────
+
+def _masked(t: ScoreTensor) -> np.ndarray:
+    """Scores as float32 with NaN where unscored."""
+    scores = np.asarray(t.scores)
+    return np.where(scores == MISSING, np.nan, scores.astype(np.float32))
+
+
+def req_means(t: ScoreTensor) -> np.ndarray:
+    """(n, requirements) mean score over each evaluation's plans; NaN if no plan scored it."""
+    scores = np.asarray(t.scores)
+    valid = scores != MISSING
+    counts = valid.sum(axis=1)
+    sums = np.where(valid, scores, 0).sum(axis=1, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def main_line(t: ScoreTensor) -> np.ndarray:
+    """Row indices of candidate 0, one per iteration: the prompt.md lineage."""
+    return np.flatnonzero(t.candidates == 0)
+
+
+def trends(t: ScoreTensor, window: int = TREND_WINDOW) -> np.ndarray:
+    """(requirements,) least-squares slope per iteration over the last `window` main-line evaluations."""
+    rows = main_line(t)[-window:]
+    y = req_means(t)[rows]
+    x = np.broadcast_to(t.iterations[rows, None].astype(np.float64), y.shape)
+    seen = ~np.isnan(y)
+    n = seen.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = np.where(seen, x - np.where(seen, x, 0).sum(axis=0) / n, 0)
+        dy = np.where(seen, y - np.nansum(y, axis=0) / n, 0)
+        return np.where(n >= 2, (dx * dy).sum(axis=0) / (dx * dx).sum(axis=0), np.nan)
+
+
+def variance(t: ScoreTensor) -> tuple[np.ndarray, np.ndarray]:
+    """Per requirement: (plan-to-plan variance within an evaluation, averaged over history;
+    variance of the main-line mean across iterations)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN slices
+        within = np.nanmean(np.nanvar(_masked(t), axis=1), axis=0)
+        between = np.nanvar(req_means(t)[main_line(t)], axis=0)
+    return within, between
+
+
+def slot_brief(slot: int) -> int:
+    """Brief index of a 0-based plan slot, following run.generation_jobs."""
+    return slot // NUM_PLANS_PER_BRIEF if slot < NUM_PLANS else (slot - NUM_PLANS) % len(BRIEFS)
+
+
+def brief_means(t: ScoreTensor) -> np.ndarray:
+    """(n, briefs, requirements) mean score over each brief's plans; NaN where none scored."""
+    scores = np.asarray(t.scores)
+    onehot = np.zeros((scores.shape[1], len(BRIEFS)))
+    onehot[np.arange(scores.shape[1]), [slot_brief(s) for s in range(scores.shape[1])]] = 1
+    valid = scores != MISSING
+    sums = np.einsum("npr,pb->nbr", np.where(valid, scores, 0).astype(np.float64), onehot)
+    counts = np.einsum("npr,pb->nbr", valid.astype(np.float64), onehot)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+def plan_points(t: ScoreTensor) -> np.ndarray:
+    """(n, plans) total points of each fully scored plan; NaN for plans with unscored requirements."""
+    scores = np.asarray(t.scores)
+    complete = (scores != MISSING).all(axis=2)
+    return np.where(complete, scores.sum(axis=2, dtype=np.float64), np.nan)
+
+
+def plan_sizes(t: ScoreTensor, entries: list) -> np.ndarray:
+    """(n, plans) UTF-8 size of each plan, from plan-pack index rows of
+    (iteration, candidate, plan, size); NaN where not packed."""
+    sizes = np.full(t.scores.shape[:2], np.nan)
+    if not entries or not len(t):
+        return sizes
+    e = np.array([tuple(r) for r in entries], dtype=np.int64)
+    wanted = e[:, 0] << 16 | e[:, 1]
+    have = t.keys[:, 0].astype(np.int64) << 16 | t.keys[:, 1]
+    rows = np.minimum(np.searchsorted(have, wanted), len(have) - 1)
+    ok = (have[rows] == wanted) & (e[:, 2] >= 1) & (e[:, 2] <= sizes.shape[1])
+    sizes[rows[ok], e[ok, 2] - 1] = e[ok, 3]
+    return sizes
+
+
+def size_correlation(t: ScoreTensor, sizes: np.ndarray) -> tuple[float, int]:
+    """(Pearson r between plan size and plan points, plans compared)."""
+    points = plan_points(t)
+    both = ~np.isnan(points) & ~np.isnan(sizes)
+    n = int(both.sum())
+    if n < 3:
+        return float("nan"), n
+    with np.errstate(invalid="ignore"):
+        return float(np.corrcoef(sizes[both], points[both])[0, 1]), n
+
+# ── prompt edits vs requirement movements ──────────────────────────────────────
+
+def archive_prompt(prompt_hash: str, prompt: str) -> None:
+    """Keep the text behind a results.tsv prompt_hash (written once per hash)."""
+    path = os.path.join(PROMPTS_DIR, f"{prompt_hash}.md")
+    if not os.path.exists(path):
+        os.makedirs(PROMPTS_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(prompt)
+
+
+def archived_prompts(rows: list[dict]) -> dict[tuple[int, int], str]:
+    """(iteration, candidate) -> prompt text, for results rows whose prompt is archived."""
+    texts: dict[str, str | None] = {}
+    out = {}
+    for r in rows:
+        h = r.get("prompt_hash", "")
+        if h not in texts:
+            path = os.path.join(PROMPTS_DIR, f"{h}.md")
+            texts[h] = open(path, encoding="utf-8").read() if h and os.path.exists(path) else None
+        if texts[h] is not None:
+            out[(int(r["iteration"]), int(r.get("candidate") or 0))] = texts[h]
+    return out
+
+
+def reference_rows(t: ScoreTensor) -> np.ndarray:
+    """Per row, the main-line row of the latest earlier iteration (what its prompt was derived
+    from, near enough), or -1 for the first iteration."""
+    main = main_line(t)
+    pos = np.searchsorted(t.iterations[main], t.iterations, side="left") - 1
+    return np.where(pos >= 0, main[np.maximum(pos, 0)], -1)
+
+
+def movements(t: ScoreTensor) -> np.ndarray:
+    """(n, requirements) change in mean score from each row's reference row; NaN for none."""
+    means = req_means(t)
+    ref = reference_rows(t)
+    return np.where((ref >= 0)[:, None], means - means[np.maximum(ref, 0)], np.nan)
+
+
+def prompt_term_correlation(
+    t: ScoreTensor, prompts: dict[tuple[int, int], str],
+) -> tuple[list[str], np.ndarray, int]:
+    """(terms, (terms, requirements) correlations, pairs) between how often a term's count
+    changed in a prompt edit and how each requirement moved with it."""
+    ref = reference_rows(t)
+    keys = [tuple(k) for k in t.keys.tolist()]
+    pairs = [(i, ref[i]) for i in range(len(t))
+             if ref[i] >= 0 and keys[i] in prompts and keys[ref[i]] in prompts
+             and prompts[keys[i]] != prompts[keys[ref[i]]]]
+    if len(pairs) < MIN_PROMPT_PAIRS:
+        return [], np.zeros((0, len(REQ_COLUMNS))), len(pairs)
+
+    counted = {k: {} for k in {keys[p] for pair in pairs for p in pair}}
+    for k, counts in counted.items():
+        for term in TERM.findall(prompts[k].lower()):
+            counts[term] = counts.get(term, 0) + 1
+    terms = sorted({term for counts in counted.values() for term in counts})
+    column = {term: j for j, term in enumerate(terms)}
+    counts = np.zeros((len(counted), len(terms)))
+    order = {k: i for i, k in enumerate(counted)}
+    for k, c in counted.items():
+        counts[order[k], [column[term] for term in c]] = list(c.values())
+
+    rows, refs = np.array(pairs).T
+    edits = counts[[order[keys[i]] for i in rows]] - counts[[order[keys[i]] for i in refs]]
+    moves = np.nan_to_num(movements(t)[rows])
+    edits = edits - edits.mean(axis=0)
+    moves = moves - moves.mean(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = (edits.T @ moves) / np.outer(np.linalg.norm(edits, axis=0), np.linalg.norm(moves, axis=0))
+    changed = np.abs(edits).sum(axis=0) > 0
+    return [term for term, keep in zip(terms, changed) if keep], np.nan_to_num(corr[changed]), len(pairs)
+
+# ── reporting ──────────────────────────────────────────────────────────────────
+
+def _fmt(values: np.ndarray, idx: np.ndarray, fmt: str) -> str:
+    return ", ".join(fmt.format(req=REQ_COLUMNS[j], v=values[j]) for j in idx)
+
+
+def history_notes(
+    t: ScoreTensor,
+    prompts: dict[tuple[int, int], str] | None = None,
+    brief_names: list[str] | None = None,
+    top: int = 5,
+    sizes: np.ndarray | None = None,
+) -> str:
+    """A few lines on what the score history says, for the improvement prompt and the CLI."""
+    rows = main_line(t)
+    if len(rows) < 2:
+        return ""
+    lines = []
+    recent = req_means(t)[rows[-TREND_WINDOW:]]
+    slope = trends(t)
+    falling = [j for j in np.argsort(slope) if slope[j] < -0.05][:top]
+    if falling:
+        lines.append(f"Falling over the last {len(recent)} iterations: "
+                     + _fmt(slope, falling, "{req} ({v:+.2f}/iteration)"))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        level = np.nanmean(recent, axis=0)
+    weak = [j for j in np.argsort(np.nan_to_num(level, nan=np.inf)) if level[j] < 0.7 * MAX_REQ_SCORE][:top]
+    if weak:
+        lines.append(f"Persistently weak (mean over the last {len(recent)} iterations): "
+                     + _fmt(level, weak, "{req} {v:.1f}/10"))
+    within, _ = variance(t)
+    noisy = [j for j in np.argsort(-np.nan_to_num(within)) if within[j] > 0][:3]
+    if noisy:
+        lines.append("Most inconsistent across plans of one prompt (score sd): "
+                     + _fmt(np.sqrt(within), noisy, "{req} {v:.1f}"))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        per_brief = np.nanmean(brief_means(t)[rows[-TREND_WINDOW:]], axis=0)
+        gap = per_brief - np.nanmean(per_brief, axis=0)
+    names = brief_names or [f"brief {b + 1}" for b in range(len(BRIEFS))]
+    for b, name in enumerate(names[:len(BRIEFS)]):
+        behind = [j for j in np.argsort(np.nan_to_num(gap[b])) if gap[b, j] <= -1][:3]
+        if behind:
+            lines.append(f"Behind the other briefs on {name}: "
+                         + _fmt(per_brief[b], behind, "{req} {v:.1f}"))
+    if sizes is not None:
+        r, n = size_correlation(t, sizes)
+        if n >= 20 and abs(r) >= 0.2:
+            lines.append(f"Longer plans score {'higher' if r > 0 else 'lower'} "
+                         f"(size vs points r = {r:+.2f} over {n} plans)")
+    if prompts:
+        terms, corr, pairs = prompt_term_correlation(t, prompts)
+        if terms:
+            flat = np.argsort(-np.abs(corr), axis=None)[:top]
+            lines.append(f"Prompt wording most linked to requirement moves ({pairs} edits; correlation, not cause): "
+                         + ", ".join(f"'{terms[i]}' ~ {REQ_COLUMNS[j]} ({corr[i, j]:+.2f})"
+                                     for i, j in zip(*np.unravel_index(flat, corr.shape))))
+    return "\n".join(f"- {line}" for line in lines)
+
+
+def main() -> None:
+    import store
+    from planpack import PlanPack
+    t = load()
+    print(f"{len(t)} evaluation(s), {t.scores.shape[1]} plan slot(s), {len(REQ_COLUMNS)} requirements "
+          f"({t.scores.nbytes / 1024:.0f} KiB tensor)")
+    notes = history_notes(t, archived_prompts(store.load_iterations(store.connect())),
+                          sizes=plan_sizes(t, PlanPack().entries(columns=SIZE_COLUMNS)))
+    print(notes or "Not enough history yet.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+autoeval/cascade.py — Which cheap-scorer requirement scores to re-check with the expensive scorer.
+
+The cheap model scores every requirement first. A requirement is escalated to
+the expensive scorer when its cheap score sits in the uncertain mid-band, or
+when the cheap model has not (yet) agreed with the expensive one often enough
+on that requirement. Every escalation records whether the two agreed, so the
+set of trusted requirements grows or shrinks with the evidence; a small audit
+sample of trusted scores keeps those agreement rates honest.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+
+CASCADE_BAND = (3, 8)          # cheap scores in this range (inclusive) are always escalated
+CASCADE_TOLERANCE = 1          # |cheap − expensive| within this counts as agreement
+CASCADE_MIN_AGREEMENT = 0.9    # agreement rate needed before a requirement is trusted
+CASCADE_MIN_SAMPLES = 20       # comparisons needed before the rate is believed
+CASCADE_AUDIT_RATE = 0.1       # share of trusted scores escalated anyway
+
+
+class AgreementTracker:
+    """Thread-safe per-requirement counts of cheap-vs-expensive agreement."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts: dict[tuple[str, str], list[int]] = {}   # (test, req) -> [compared, agreed]
+        self._new: dict[tuple[str, str], list[int]] = {}
+
+    def load(self, counts: dict[tuple[str, str], tuple[int, int]]) -> None:
+        with self._lock:
+            for key, (compared, agreed) in counts.items():
+                self.counts[key] = [compared, agreed]
+
+    def trusted(self, test: str, req: str) -> bool:
+        with self._lock:
+            compared, agreed = self.counts.get((test, req), (0, 0))
+        return compared >= CASCADE_MIN_SAMPLES and agreed / compared >= CASCADE_MIN_AGREEMENT
+
+    def record(self, test: str, req: str, cheap: int, expensive: int) -> None:
+        agreed = int(abs(cheap - expensive) <= CASCADE_TOLERANCE)
+        with self._lock:
+            for counts in (self.counts, self._new):
+                entry = counts.setdefault((test, req), [0, 0])
+                entry[0] += 1
+                entry[1] += agreed
+
+    def drain(self) -> dict[tuple[str, str], tuple[int, int]]:
+        """Comparisons recorded since the last drain, for persisting."""
+        with self._lock:
+            new, self._new = self._new, {}
+        return {key: (compared, agreed) for key, (compared, agreed) in new.items()}
+
+    def summary(self) -> str:
+        with self._lock:
+            keys = list(self.counts)
+        trusted = sum(self.trusted(*key) for key in keys)
+        return f"{trusted}/{len(keys)} requirement(s) trusted to the cheap scorer"
+
+
+def _audited(plan_text: str, test: str, req: str) -> bool:
+    # Deterministic per plan and requirement, so a cached or replayed score
+    # would have made the same choice.
+    digest = hashlib.md5(f"{plan_text}\0{test}\0{req}".encode()).digest()
+    return int.from_bytes(digest[:4], "big") < CASCADE_AUDIT_RATE * 2 ** 32
+
+
+def escalations(
+    cheap: dict,
+    plans: list[str],
+    tracker: AgreementTracker,
+) -> dict[str, set[str]]:
+    """test -> requirements any plan of the shard needs the expensive scorer for.
+
+    `cheap` is a parsed shard ({"plan_1": {...}, ...}) for `plans`.
+    """
+    escalate: dict[str, set[str]] = {}
+    for i, plan_text in enumerate(plans, start=1):
+        for test, reqs in cheap[f"plan_{i}"].items():
+            if not isinstance(reqs, dict):
+                continue
+            for req, value in reqs.items():
+                try:
+                    mid_band = CASCADE_BAND[0] <= int(value) <= CASCADE_BAND[1]
+                except (TypeError, ValueError):
+                    mid_band = True
+                if mid_band or not tracker.trusted(test, req) or _audited(plan_text, test, req):
+                    escalate.setdefault(test, set()).add(req)
+    return escalate
@@ -0,0 +1,125 @@
+"""
+autoeval/journal.py — Write-ahead journal of completed paid steps for one iteration.
+
+Each finished generation, plan score, analysis, improvement and logged result is
+appended as one JSON line (flushed and fsynced) to journal/iterNNNN.jsonl. If
+run.py dies mid-iteration, the next run finds the journal, reloads the
+iteration's starting state from its header and replays every recorded step
+instead of paying for it again. The file is deleted once the iteration is logged.
+journal/ is not committed; the workflow carries it between runs with its cache
+steps, so a scheduled run that dies is resumed by the next one.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import re
+import threading
+from typing import Any
+
+import tracing
+
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "journal")
+
+
+class Journal:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.header: dict = {}
+        self.entries: dict[tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "rb+") as f:
+                data = f.read()
+                if data and not data.endswith(b"\n"):
+                    # Drop a torn final line from a crash mid-append so the next
+                    # record starts on a fresh line.
+                    f.truncate(data.rfind(b"\n") + 1)
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record["kind"] == "start":
+                        self.header = record["value"]
+                    else:
+                        self.entries[(record["kind"], record["key"])] = record["value"]
+
+    @classmethod
+    def start(cls, iteration: int, header: dict) -> Journal:
+        """Begin a journal whose header records the iteration's starting state."""
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        journal = cls(os.path.join(JOURNAL_DIR, f"iter{iteration:04d}.jsonl"))
+        journal.header = {"iteration": iteration, **header}
+        journal._append("start", "", journal.header)
+        return journal
+
+    @classmethod
+    def unfinished(cls) -> Journal | None:
+        """The most recent journal left behind by an interrupted run, if any."""
+        paths = sorted(
+            p for p in glob.glob(os.path.join(JOURNAL_DIR, "iter*.jsonl"))
+            if re.search(r"iter\d+\.jsonl$", p)
+        )
+        for path in reversed(paths):
+            journal = cls(path)
+            if journal.header:
+                return journal
+        return None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, kind: str, key: str) -> Any | None:
+        with self._lock:
+            return self.entries.get((kind, key))
+
+    def _append(self, kind: str, key: str, value: Any) -> None:
+        line = json.dumps({"kind": kind, "key": key, "value": value}, ensure_ascii=False)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        with self._lock, tracing.span("journal {kind}", "io", kind=kind):
+            self._append(kind, key, value)
+            self.entries[(kind, key)] = value
+
+    def close(self) -> None:
+        """The iteration is fully logged; nothing is left to resume."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class JournaledCache:
+    """A DiskCache-shaped view that checks the journal before the (optional) disk cache.
+
+    Writes go to both, so a resumed iteration replays its own results even when
+    the disk cache is disabled, refreshed or has evicted them.
+    """
+
+    def __init__(self, journal: Journal, kind: str, cache: Any | None = None) -> None:
+        self.journal = journal
+        self.kind = kind
+        self.cache = cache
+        self.replayed = 0
+
+    def get(self, key: str) -> Any | None:
+        value = self.journal.get(self.kind, key)
+        if value is not None:
+            self.replayed += 1
+            return value
+        return self.cache.get(key) if self.cache is not None else None
+
+    def put(self, key: str, value: Any) -> None:
+        self.journal.put(self.kind, key, value)
+        if self.cache is not None:
+            self.cache.put(key, value)
+
+    def stats(self) -> str:
+        cached = self.cache.stats() if self.cache is not None else "disk cache off"
+        return f"{cached}, {self.replayed} replayed from journal" if self.replayed else cached
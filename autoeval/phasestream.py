@@ -0,0 +1,104 @@
+"""
+autoeval/phasestream.py — Incremental tracking of phase objects in a streamed plan.
+
+PhaseTracker is fed text deltas as they arrive and records the offset just past
+each complete object in the top-level "phases" array, so a response cut off by
+max_tokens can be resumed from the last complete phase. The scorer's streamed
+tool input is tracked the same way over its "plans" array.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+
+
+class PhaseTracker:
+    def __init__(self, array_key: str = "phases") -> None:
+        self.array_key = array_key
+        self.text = ""
+        self.phase_starts: list[int] = [] # offsets of each phase object's opening brace
+        self.phase_ends: list[int] = []   # offsets just past each complete phase object
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key = ""
+        self._phases_depth = -1           # stack depth of the "phases" array, once seen
+
+    def feed(self, delta: str) -> int:
+        """Consume a text delta; return how many phases completed in it."""
+        before = len(self.phase_ends)
+        base = len(self.text)
+        self.text += delta
+        for i, ch in enumerate(delta, start=base):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_key = self.text[self._string_start:i]
+                continue
+            if ch == '"' and self._stack:
+                self._in_string = True
+                self._string_start = i + 1
+            elif ch in "{[":
+                if ch == "[" and self._stack == ["{"] and self._last_key == self.array_key:
+                    self._phases_depth = 1
+                elif ch == "{" and self._phases_depth >= 0 and len(self._stack) == self._phases_depth + 1:
+                    self.phase_starts.append(i)
+                self._stack.append(ch)
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                if ch == "}" and self._phases_depth >= 0 and len(self._stack) == self._phases_depth + 1:
+                    self.phase_ends.append(i + 1)
+                elif ch == "]" and len(self._stack) == self._phases_depth:
+                    self._phases_depth = -1
+        return len(self.phase_ends) - before
+
+    @property
+    def phases_completed(self) -> int:
+        return len(self.phase_ends)
+
+    def phases(self) -> list[str]:
+        """Source text of every complete phase object so far."""
+        return [self.text[start:end] for start, end in zip(self.phase_starts, self.phase_ends)]
+
+    def resume_prefix(self) -> str:
+        """Text up to the last complete phase (or everything, if none completed)."""
+        if self.phase_ends:
+            return self.text[:self.phase_ends[-1]]
+        return self.text.rstrip()
+
+
+@dataclass
+class GenerationStats:
+    phases_completed: int = 0
+    output_tokens: int = 0
+    continuations: int = 0
+    stop_reason: str = ""
+    first_token_s: float | None = None
+    elapsed_s: float = 0.0
+    _start: float = field(default_factory=time.monotonic, repr=False)
+
+    def mark_token(self) -> None:
+        if self.first_token_s is None:
+            self.first_token_s = time.monotonic() - self._start
+
+    def finish(self) -> None:
+        self.elapsed_s = time.monotonic() - self._start
+
+    @property
+    def tokens_per_s(self) -> float:
+        return self.output_tokens / self.elapsed_s if self.elapsed_s else 0.0
+
+    def summary(self) -> str:
+        ttft = f"{self.first_token_s:.1f}s" if self.first_token_s is not None else "n/a"
+        return (
+            f"{self.phases_completed} phases, {self.output_tokens} tok in {self.elapsed_s:.1f}s "
+            f"({self.tokens_per_s:.0f} tok/s, ttft {ttft}), {self.continuations} resume(s), "
+            f"stop={self.stop_reason}"
+        )
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+autoeval/planpack.py — Content-addressed, compressed archive of generated plans.
+
+Each distinct plan text is stored once, keyed by its SHA-256, as a zlib record
+appended to plans/plans.pack. plans/index.tsv lists every plan slot of every
+evaluation (iteration, candidate, plan, brief, variant, score) against the
+offset and length of its record, one appended line per slot. plans/index.db is
+a local, uncommitted SQLite copy of that list, brought up to date from
+index.tsv whenever the pack is opened, so reading one plan is an index probe
+and a single positioned read; the rest of the pack is never touched.
+
+A record is written and synced before its index.tsv line, and the line before
+its index.db row, so a crash can leave unreferenced bytes at the end of the
+pack but never an index row pointing at nothing. Run directly to move the loose
+plans/iter*_plan*_score*.json files (and baseline.json) into the pack, or to
+see what it holds:
+
+  python autoeval/planpack.py migrate [--delete]
+  python autoeval/planpack.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+
+BASE       = os.path.dirname(os.path.abspath(__file__))
+PLANS_DIR  = os.path.join(BASE, "plans")
+SCORES_DIR = os.path.join(BASE, "scores")
+PACK_NAME  = "plans.pack"
+LOG_NAME   = "index.tsv"
+INDEX_NAME = "index.db"
+
+COMPRESS_LEVEL = 9
+LOOSE_PLAN = re.compile(r"iter(\d+)(?:_c(\d+))?_plan(\d+)_score(-?\d+)\.json")
+BASELINE   = "baseline.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash   TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,   -- compressed bytes in the pack
+    size   INTEGER NOT NULL    -- UTF-8 bytes of the plan
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS plans (
+    iteration INTEGER NOT NULL,
+    candidate INTEGER NOT NULL,
+    plan      INTEGER NOT NULL,
+    brief     TEXT NOT NULL,
+    variant   INTEGER NOT NULL,
+    score     INTEGER,          -- the plan's own points; NULL if it was never scored
+    total     INTEGER NOT NULL, -- the evaluation's score
+    size      INTEGER NOT NULL, -- UTF-8 bytes of the plan (as in blobs, to spare a join)
+    hash      TEXT NOT NULL,
+    current   INTEGER NOT NULL, -- 0 once a re-run of the same slot has been added
+    UNIQUE (iteration, candidate, plan, total)
+);
+CREATE INDEX IF NOT EXISTS plans_brief ON plans (brief, variant, iteration);
+CREATE INDEX IF NOT EXISTS plans_score ON plans (score);
+CREATE INDEX IF NOT EXISTS plans_hash ON plans (hash);
+
+CREATE TABLE IF NOT EXISTS replayed (
+    lines INTEGER NOT NULL      -- index.tsv rows the tables above reflect
+);
+"""
+
+INDEX_COLUMNS = ["iteration", "candidate", "plan", "brief", "variant", "score", "total", "size", "hash"]
+LOG_COLUMNS   = [*INDEX_COLUMNS, "offset", "length"]
+
+
+def plan_totals(score_data: dict) -> dict[int, int]:
+    """plan number -> total points, for the plans a score breakdown covers."""
+    totals = {}
+    for plan_key, plan_scores in score_data.items():
+        if not plan_key.startswith("plan_") or not isinstance(plan_scores, dict):
+            continue
+        points = 0
+        for reqs in plan_scores.values():
+            if isinstance(reqs, dict):
+                for score in reqs.values():
+                    try:
+                        points += int(score)
+                    except (TypeError, ValueError):
+                        pass
+        totals[int(plan_key.removeprefix("plan_"))] = points
+    return totals
+
+
+class PlanPack:
+    def __init__(self, directory: str = PLANS_DIR) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.pack_path = os.path.join(directory, PACK_NAME)
+        self.log_path = os.path.join(directory, LOG_NAME)
+        self.conn = sqlite3.connect(os.path.join(directory, INDEX_NAME), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+        self._replay()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self.conn.close()
+
+    # ── index.tsv ──
+
+    def _replayed(self) -> int:
+        row = self.conn.execute("SELECT lines FROM replayed").fetchone()
+        return row["lines"] if row else 0
+
+    def _read_log(self) -> list[tuple]:
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()[1:]
+        return [
+            tuple(None if v == "" else v if c in ("brief", "hash") else int(v)
+                  for c, v in zip(LOG_COLUMNS, line.split("\t")))
+            for line in lines if line
+        ]
+
+    def _write_log(self, rows: list[tuple]) -> None:
+        new = not os.path.exists(self.log_path)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            if new:
+                f.write("\t".join(LOG_COLUMNS) + "\n")
+            f.writelines("\t".join("" if v is None else str(v) for v in row) + "\n" for row in rows)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _index(self, rows: list[tuple], lines: int) -> None:
+        """Apply index.tsv rows (LOG_COLUMNS order) to the tables; `lines` is the new log length.
+
+        Of several rows for one slot, the last is current, whether or not they
+        arrive in the same batch.
+        """
+        last = {r[:3]: i for i, r in enumerate(rows)}
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO blobs (hash, offset, length, size) VALUES (?, ?, ?, ?)",
+                [(r[8], r[9], r[10], r[7]) for r in rows],
+            )
+            self.conn.executemany(
+                "UPDATE plans SET current = 0 WHERE iteration = ? AND candidate = ? AND plan = ?",
+                [r[:3] for r in rows],
+            )
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO plans ({', '.join(INDEX_COLUMNS)}, current) "
+                f"VALUES ({', '.join('?' * len(INDEX_COLUMNS))}, ?)",
+                [(*r[:len(INDEX_COLUMNS)], int(last[r[:3]] == i)) for i, r in enumerate(rows)],
+            )
+            self.conn.execute("DELETE FROM replayed")
+            self.conn.execute("INSERT INTO replayed (lines) VALUES (?)", (lines,))
+
+    def _replay(self) -> None:
+        """Bring index.db up to date with index.tsv, e.g. after a pull added lines."""
+        if not os.path.exists(self.log_path):
+            # An index.db from before index.tsv existed: write its rows out once.
+            rows = [tuple(r) for r in self.conn.execute(
+                f"SELECT {', '.join('p.' + c for c in INDEX_COLUMNS)}, b.offset, b.length "
+                "FROM plans p JOIN blobs b USING (hash) ORDER BY p.rowid")]
+            if rows:
+                self._write_log(rows)
+                self._index([], len(rows))
+            return
+        rows = self._read_log()
+        done = self._replayed()
+        if len(rows) < done:
+            # index.tsv was replaced by an older or different one: start over.
+            with self.conn:
+                self.conn.executescript("DELETE FROM plans; DELETE FROM blobs; DELETE FROM replayed;")
+            done = 0
+        if len(rows) > done:
+            self._index(rows[done:], len(rows))
+
+    # ── writing ──
+
+    def add_many(self, records: list[tuple[int, int, int, str, int, str, int | None, int]]) -> None:
+        """Record plan slots, each (iteration, candidate, plan, brief, variant, text, score, total).
+
+        Texts already in the pack are not stored again. New records cost one
+        pack sync, the index.tsv lines one more and the index rows one
+        transaction, however many there are.
+        An evaluation re-run under the same number (as loose files could be)
+        keeps both sets of plans; the one added last is what readers see.
+        """
+        rows, blobs, located = [], {}, {}
+        with self._lock:
+            for iteration, candidate, plan, brief, variant, text, score, total in records:
+                data = text.encode("utf-8")
+                digest = hashlib.sha256(data).hexdigest()
+                if digest not in blobs and digest not in located:
+                    row = self.conn.execute("SELECT offset, length FROM blobs WHERE hash = ?", (digest,)).fetchone()
+                    if row is None:
+                        blobs[digest] = data
+                    else:
+                        located[digest] = tuple(row)
+                rows.append((iteration, candidate, plan, brief, variant, score, total, len(data), digest))
+            if blobs:
+                with open(self.pack_path, "ab") as f:
+                    offset = f.seek(0, os.SEEK_END)
+                    for digest, data in blobs.items():
+                        record = zlib.compress(data, COMPRESS_LEVEL)
+                        f.write(record)
+                        located[digest] = (offset, len(record))
+                        offset += len(record)
+                    f.flush()
+                    os.fsync(f.fileno())
+            rows = [(*r, *located[r[8]]) for r in rows]
+            self._write_log(rows)
+            self._index(rows, self._replayed() + len(rows))
+
+    def add(self, iteration: int, candidate: int, plan: int, brief: str, variant: int,
+            text: str, score: int | None, total: int) -> None:
+        self.add_many([(iteration, candidate, plan, brief, variant, text, score, total)])
+
+    # ── reading ──
+
+    def read(self, digest: str) -> str:
+        row = self.conn.execute("SELECT offset, length FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        with self._lock:
+            if self._fd is None:
+                self._fd = os.open(self.pack_path, os.O_RDONLY)
+        return zlib.decompress(os.pread(self._fd, row["length"], row["offset"])).decode("utf-8")
+
+    def get(self, iteration: int, candidate: int, plan: int) -> str | None:
+        row = self.conn.execute(
+            "SELECT hash FROM plans WHERE iteration = ? AND candidate = ? AND plan = ? AND current = 1",
+            (iteration, candidate, plan),
+        ).fetchone()
+        return None if row is None else self.read(row["hash"])
+
+    def plans(self, iteration: int, candidate: int = 0) -> list[str]:
+        """An evaluation's plans in plan_N order."""
+        return [self.read(r["hash"]) for r in self.entries(iteration=iteration, candidate=candidate)]
+
+    def entries(self, iteration: int | None = None, candidate: int | None = None,
+                brief: str | None = None, latest: bool = True,
+                columns: list[str] = INDEX_COLUMNS) -> list[sqlite3.Row]:
+        """Index rows, filtered by whichever of the arguments are given; `latest=False`
+        includes plans superseded by a re-run of the same slot."""
+        filters = {"iteration": iteration, "candidate": candidate, "brief": brief}
+        where = [f"{k} = ?" for k, v in filters.items() if v is not None] + (["current = 1"] if latest else [])
+        return self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM plans"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + " ORDER BY iteration, candidate, plan" + ("" if latest else ", rowid"),
+            [v for v in filters.values() if v is not None],
+        ).fetchall()
+
+    def weakest(self, iteration: int, candidate: int = 0) -> list[str]:
+        """The lowest-scoring scored plan of each brief in one evaluation, in brief order."""
+        rows = self.conn.execute(
+            "SELECT hash FROM (SELECT hash, plan, ROW_NUMBER() OVER "
+            "(PARTITION BY brief ORDER BY score, plan) AS rank FROM plans "
+            "WHERE iteration = ? AND candidate = ? AND score IS NOT NULL AND current = 1) "
+            "WHERE rank = 1 ORDER BY plan",
+            (iteration, candidate),
+        ).fetchall()
+        return [self.read(r["hash"]) for r in rows]
+
+    def stats(self) -> dict[str, int]:
+        row = self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM plans) AS plans, COUNT(*) AS blobs, "
+            "COALESCE(SUM(length), 0) AS packed_bytes, "
+            "(SELECT COALESCE(SUM(size), 0) FROM plans) AS raw_bytes FROM blobs"
+        ).fetchone()
+        return dict(row)
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"{s['plans']} plan(s), {s['blobs']} distinct, {s['packed_bytes'] / 1024:.0f} KiB packed "
+                f"from {s['raw_bytes'] / 1024:.0f} KiB")
+
+# ── migration ──────────────────────────────────────────────────────────────────
+
+def migrate(pack: PlanPack, directory: str = PLANS_DIR, delete: bool = False) -> int:
+    """Pack every loose plan file in `directory`; returns how many were packed.
+
+    Each file is read back from the pack and compared before `delete` removes it.
+    """
+    import run  # for generation_jobs(); run.py needs its API dependencies anyway
+    import store
+
+    cached: dict[tuple[int, int], dict[int, int]] = {}
+
+    def scores(iteration: int, candidate: int) -> dict[int, int]:
+        if (iteration, candidate) not in cached:
+            path = os.path.join(SCORES_DIR, f"{run.iteration_tag(iteration, candidate)}.json")
+            try:
+                with open(path, encoding="utf-8") as f:
+                    cached[iteration, candidate] = plan_totals(json.load(f))
+            except (OSError, ValueError):
+                cached[iteration, candidate] = {}
+        return cached[iteration, candidate]
+
+    # Where an iteration number was reused, add the plans results.db recorded last.
+    recorded = {(int(r["iteration"]), int(r["candidate"] or 0)): int(r["score"] or r.get("score_bound") or 0)
+                for r in store.load_iterations(store.connect())}
+
+    def order(name: str) -> tuple:
+        match = LOOSE_PLAN.fullmatch(name)
+        if not match:
+            return (-1,)
+        iteration, candidate, plan, total = (int(g or 0) for g in match.groups())
+        return iteration, candidate, plan, recorded.get((iteration, candidate)) == total, total
+
+    moved = []
+    names = sorted(os.listdir(directory), key=order) if os.path.isdir(directory) else []
+    for name in names:
+        match = LOOSE_PLAN.fullmatch(name)
+        if match:
+            iteration, candidate, plan, total = (int(g or 0) for g in match.groups())
+            brief_path, variant = run.generation_jobs(max(plan, run.NUM_PLANS))[plan - 1]
+            slots = [(plan, os.path.basename(brief_path), variant)]
+        elif name == BASELINE:
+            # score_baseline.py scores the baseline plan in every slot of iteration 0.
+            iteration, candidate = 0, 0
+            total = sum(scores(0, 0).values())
+            slots = [(p, BASELINE, p - 1) for p in range(1, run.NUM_PLANS + 1)]
+        else:
+            continue
+        path = os.path.join(directory, name)
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        pack.add_many([(iteration, candidate, plan, brief, variant, text, scores(iteration, candidate).get(plan), total)
+                       for plan, brief, variant in slots])
+        if any(pack.get(iteration, candidate, plan) != text for plan, _, _ in slots):
+            raise RuntimeError(f"{name}: packed copy does not match; nothing deleted")
+        moved.append(path)
+    if delete:
+        for path in moved:
+            os.remove(path)
+    return len(moved)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Plan pack maintenance.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate_cmd = sub.add_parser("migrate", help="pack the loose plan files in plans/")
+    migrate_cmd.add_argument("--delete", action="store_true", help="remove each loose file once it is packed")
+    sub.add_parser("stats", help="summarise the pack")
+    args = parser.parse_args()
+
+    pack = PlanPack()
+    if args.command == "migrate":
+        count = migrate(pack, delete=args.delete)
+        print(f"Packed {count} loose plan file(s){' and removed them' if args.delete else ''}.")
+    print(pack.summary())
+    pack.close()
+
+
+if __name__ == "__main__":
+    main()
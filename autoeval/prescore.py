@@ -0,0 +1,94 @@
+"""
+autoeval/prescore.py — Deterministic offline scoring for mechanically checkable requirements.
+
+Each plan is parsed and validated against schema.PhasePlan. Valid plans get
+0–10 scores for the requirements in DETERMINISTIC_REQS without any API call;
+plans that fail to parse or validate return None and are scored in full by the
+model scorer.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+
+from pydantic import ValidationError
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from schema import PhasePlan  # noqa: E402
+
+MIN_PHASES = 6
+MAX_PHASES = 12
+MAX_TASKS_PER_PHASE = 8
+MIN_TASK_WORDS = 3
+
+# eval_suite.md test_5 req_2
+BANNED_DELIVERABLE_WORDS = re.compile(r"\b(working|complete|functional|ready|done)\b", re.IGNORECASE)
+# Placeholder commit conditions (test_6 req_4)
+PLACEHOLDER_CONDITION = re.compile(
+    r"^\s*(phase (is )?(complete|completed|done|finished)|all tasks (are )?(complete|completed|done))\.?\s*$",
+    re.IGNORECASE,
+)
+# A commit condition states an expected output if it says what a command returns
+# or arrows to a value. A bare "tests pass" is the counter-example eval_suite.md
+# gives (test_6 req_2); a number or a quoted command alone is not an output.
+EXPECTED_OUTPUT = re.compile(
+    r"\b(returns?|outputs?|prints?|displays?|shows?|responds? with|renders?|contains?|equals?|"
+    r"exits? with)\s+\S|(→|->)\s*\S",
+    re.IGNORECASE,
+)
+
+DETERMINISTIC_REQS: dict[str, tuple[str, ...]] = {
+    "test_5": ("req_2",),
+    "test_6": ("req_2", "req_4"),
+    "test_7": ("req_2",),
+    "test_9": ("req_1", "req_3", "req_4"),
+}
+
+
+def parse_plan(text: str) -> PhasePlan | None:
+    """Extract and validate the plan JSON; None if it is truncated or malformed."""
+    match = re.search(r"\{[\s\S]*\}", text)
+    if not match:
+        return None
+    try:
+        return PhasePlan.model_validate(json.loads(match.group()))
+    except (ValueError, ValidationError):
+        return None
+
+
+def _fraction_score(ok: int, total: int) -> int:
+    return round(10 * ok / total) if total else 10
+
+
+def prescore_plan(text: str) -> dict[str, dict[str, int]] | None:
+    """Score DETERMINISTIC_REQS for one plan, or None if it cannot be validated."""
+    plan = parse_plan(text)
+    if plan is None or not plan.phases:
+        return None
+    phases = plan.phases
+    conditions = [p.commit_condition for p in phases]
+    tasks = [t for p in phases for t in p.tasks]
+    return {
+        "test_5": {
+            "req_2": 0 if any(BANNED_DELIVERABLE_WORDS.search(p.deliverable) for p in phases) else 10,
+        },
+        "test_6": {
+            "req_2": _fraction_score(sum(1 for c in conditions if EXPECTED_OUTPUT.search(c)), len(conditions)),
+            "req_4": 0 if any(PLACEHOLDER_CONDITION.match(c) for c in conditions) else 10,
+        },
+        "test_7": {
+            "req_2": 0 if any(len(t.split()) < MIN_TASK_WORDS for t in tasks) else 10,
+        },
+        "test_9": {
+            "req_1": 10 if MIN_PHASES <= len(phases) <= MAX_PHASES else 0,
+            "req_3": 0 if any(len(p.tasks) <= 1 for p in phases) else 10,
+            "req_4": 0 if any(len(p.tasks) > MAX_TASKS_PER_PHASE for p in phases) else 10,
+        },
+    }
+
+
+def prescore_plans(plans: list[str]) -> list[dict[str, dict[str, int]] | None]:
+    return [prescore_plan(p) for p in plans]
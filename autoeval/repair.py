@@ -0,0 +1,161 @@
+"""
+autoeval/repair.py — Schema validation of generated plans and splicing of repaired phases.
+
+check_plan() runs each phase through schema.PhaseItem and the whole plan
+through the phase-count bounds. When only some phases are invalid, run.py asks
+the generator for just those phases (repair_prompt) and splice() puts the
+replacements back, instead of paying for a whole new plan.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import threading
+from dataclasses import dataclass, field
+
+from pydantic import ValidationError
+
+from prescore import MAX_PHASES, MIN_PHASES
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from schema import PhaseItem  # noqa: E402
+
+PHASE_FIELDS = list(PhaseItem.model_fields)
+
+
+@dataclass
+class PlanCheck:
+    text: str
+    doc: dict | None = None                                  # parsed plan JSON
+    span: tuple[int, int] = (0, 0)                           # where the JSON sits in `text`
+    invalid: dict[int, str] = field(default_factory=dict)    # phase index -> first error
+    problems: list[str] = field(default_factory=list)        # plan-level problems
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems and not self.invalid
+
+    @property
+    def repairable(self) -> bool:
+        """Some, but not all, phases are broken and the plan is otherwise sound."""
+        return not self.problems and 0 < len(self.invalid) < len(self.doc["phases"])
+
+    def summary(self) -> str:
+        issues = self.problems + [f"phase {i + 1}: {e}" for i, e in sorted(self.invalid.items())]
+        return "; ".join(issues) or "valid"
+
+
+def _first_error(e: ValidationError) -> str:
+    err = e.errors()[0]
+    return f"{'.'.join(str(p) for p in err['loc']) or 'phase'} {err['msg'].lower()}"
+
+
+def check_plan(text: str) -> PlanCheck:
+    check = PlanCheck(text)
+    match = re.search(r"\{[\s\S]*\}", text)
+    if not match:
+        check.problems.append("no JSON object")
+        return check
+    try:
+        doc = json.loads(match.group())
+    except json.JSONDecodeError as e:
+        check.problems.append(f"malformed JSON ({e.msg})")
+        return check
+    phases = doc.get("phases") if isinstance(doc, dict) else None
+    if not isinstance(phases, list):
+        check.problems.append("no phases array")
+        return check
+    check.doc, check.span = doc, match.span()
+    if not MIN_PHASES <= len(phases) <= MAX_PHASES:
+        check.problems.append(f"{len(phases)} phases (needs {MIN_PHASES}–{MAX_PHASES})")
+    for i, phase in enumerate(phases):
+        try:
+            PhaseItem.model_validate(phase)
+        except ValidationError as e:
+            check.invalid[i] = _first_error(e)
+    return check
+
+
+def repair_prompt(brief: str, check: PlanCheck) -> str:
+    """Ask for just the invalid phases, with the valid phases around each as context."""
+    phases = check.doc["phases"]
+    context = sorted({
+        j
+        for i in check.invalid
+        for j in (max((k for k in range(i) if k not in check.invalid), default=None),
+                  min((k for k in range(i + 1, len(phases)) if k not in check.invalid), default=None))
+        if j is not None
+    })
+    wanted = ", ".join(str(i + 1) for i in sorted(check.invalid))
+    neighbours = "\n".join(f"Phase {j + 1}: {json.dumps(phases[j], ensure_ascii=False)}" for j in context)
+    broken = "\n".join(
+        f"Phase {i + 1} ({err}): {json.dumps(phases[i], ensure_ascii=False)[:600]}"
+        for i, err in sorted(check.invalid.items())
+    )
+    return f"""{brief}
+
+A {len(phases)}-phase plan was generated for this brief, but phases {wanted} do not match the phase schema.
+
+BROKEN PHASES:
+{broken}
+
+VALID NEIGHBOURING PHASES (keep consistent with these):
+{neighbours}
+
+Rewrite only phases {wanted}. Return ONLY a JSON array of {len(check.invalid)} phase object(s), in order,
+each with exactly these keys: {", ".join(PHASE_FIELDS)} ("id" is the phase number, "tasks" a list of strings).
+"""
+
+
+def splice(check: PlanCheck, response: str) -> str | None:
+    """The plan text with the invalid phases replaced, or None if the replacements are unusable."""
+    match = re.search(r"\[[\s\S]*\]", response)
+    if not match:
+        return None
+    try:
+        replacements = json.loads(match.group())
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(replacements, list) or len(replacements) != len(check.invalid):
+        return None
+    phases = list(check.doc["phases"])
+    for i, phase in zip(sorted(check.invalid), replacements):
+        if not isinstance(phase, dict):
+            return None
+        phases[i] = {**phase, "id": i + 1}
+    doc = {**check.doc, "phases": phases}
+    start, end = check.span
+    return check.text[:start] + json.dumps(doc, indent=2, ensure_ascii=False) + check.text[end:]
+
+
+class RepairMeter:
+    """Thread-safe per-iteration counts of validation and repair outcomes."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.invalid = 0
+        self.repaired = 0
+        self.phases_repaired = 0
+        self.regenerated = 0
+        self.repair_tokens = 0
+        self.saved_tokens = 0
+
+    def record(self, outcome: str, phases: int = 0, tokens: int = 0, saved: int = 0) -> None:
+        """outcome: "valid", "repaired", "regenerated" or "unrepaired"."""
+        with self._lock:
+            self.checked += 1
+            self.invalid += outcome != "valid"
+            self.repaired += outcome == "repaired"
+            self.regenerated += outcome == "regenerated"
+            self.phases_repaired += phases
+            self.repair_tokens += tokens
+            self.saved_tokens += saved
+
+    def summary(self) -> str:
+        return (f"{self.checked} plan(s) validated, {self.invalid} invalid: {self.repaired} repaired "
+                f"({self.phases_repaired} phase(s), {self.repair_tokens} tok, ≈{self.saved_tokens} tok saved "
+                f"vs full regeneration), {self.regenerated} regenerated in full")
@@ -0,0 +1,133 @@
+"""
+autoeval/rubric.py — The scoring rubric, parsed once from eval_suite.md.
+
+Every place that needs the shape of the eval suite (requirement counts, score
+maxima, the scorer's tool schema and the validation of its output) derives it
+from RUBRIC, so editing eval_suite.md is the only change a new requirement needs.
+The plan slots the rubric is applied to (which briefs, how many plans each) are
+defined here too, so the runner and the readers count plans the same way.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+
+BASE      = os.path.dirname(os.path.abspath(__file__))
+EVAL_FILE = os.path.join(BASE, "eval_suite.md")
+MAX_REQ_SCORE = 10
+
+_TEST_HEADING = re.compile(r"^## Test (\d+): (.+?) \((\d+) (?:requirements|questions)\)\s*$")
+_REQ_LINE     = re.compile(r"^- (req_\d+|q\d+): ")
+
+
+def load_rubric(path: str = EVAL_FILE) -> dict[str, list[str]]:
+    """test key -> its requirement keys, in eval-suite order."""
+    rubric: dict[str, list[str]] = {}
+    declared: dict[str, int] = {}
+    test_key = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if heading := _TEST_HEADING.match(line):
+                test_key = f"test_{heading.group(1)}"
+                rubric[test_key] = []
+                declared[test_key] = int(heading.group(3))
+            elif test_key and (req := _REQ_LINE.match(line)):
+                rubric[test_key].append(req.group(1))
+    for test_key, count in declared.items():
+        if len(rubric[test_key]) != count:
+            raise ValueError(f"{path}: {test_key} declares {count} requirements "
+                             f"but lists {len(rubric[test_key])}.")
+    if not rubric:
+        raise ValueError(f"{path}: no '## Test N: ...' sections found.")
+    return rubric
+
+
+RUBRIC = load_rubric()
+REQ_COUNTS = {test_key: len(reqs) for test_key, reqs in RUBRIC.items()}
+TOTAL_REQS = sum(REQ_COUNTS.values())
+MAX_PLAN_SCORE = TOTAL_REQS * MAX_REQ_SCORE
+
+
+def req_keys(test_key: str) -> list[str]:
+    return RUBRIC[test_key]
+
+# ── plan slots ─────────────────────────────────────────────────────────────────
+
+BRIEFS = [
+    os.path.join(BASE, "brief.md"),       # StudyBattles  — 11 phases, MVP at 7
+    os.path.join(BASE, "brief_cli.md"),   # DevLogSummarizer — 6 phases, MVP at 4
+    os.path.join(BASE, "brief_saas.md"),  # InvoiceFlow   —  8 phases, MVP at 5
+]
+NUM_PLANS_PER_BRIEF = 3                          # plans generated per brief
+NUM_PLANS = NUM_PLANS_PER_BRIEF * len(BRIEFS)    # 3 briefs × 3 = 9 total
+
+# ── scorer tool ────────────────────────────────────────────────────────────────
+
+SCORE_TOOL_NAME = "record_scores"
+
+
+def score_tool() -> dict:
+    """Tool definition the scorer is forced to call.
+
+    The schema is the same for every shard (requirements are optional in it and
+    checked by validate_plan), so it never invalidates the cached prompt prefix.
+    """
+    req_schema = {"type": "integer", "minimum": 0, "maximum": MAX_REQ_SCORE}
+    plan_schema = {
+        "type": "object",
+        "properties": {
+            "plan": {"type": "integer", "description": "The N of '=== PLAN N ==='."},
+            **{
+                test_key: {
+                    "type": "object",
+                    "properties": {req: req_schema for req in reqs},
+                    "additionalProperties": False,
+                }
+                for test_key, reqs in RUBRIC.items()
+            },
+            "notes": {"type": "string", "description": "1 sentence on this plan's weakest requirements."},
+        },
+        "required": ["plan", "notes"],
+    }
+    return {
+        "name": SCORE_TOOL_NAME,
+        "description": "Record the 0–10 score of every requirement for every plan.",
+        "input_schema": {
+            "type": "object",
+            "properties": {"plans": {"type": "array", "items": plan_schema}},
+            "required": ["plans"],
+        },
+    }
+
+
+def validate_plan(entry: object, skip: dict[str, tuple[str, ...]] | None = None) -> list[str]:
+    """Problems with one scorer entry; empty when every requested requirement is a 0–10 int."""
+    if not isinstance(entry, dict):
+        return ["not an object"]
+    problems = []
+    for test_key, reqs in RUBRIC.items():
+        wanted = [r for r in reqs if r not in (skip or {}).get(test_key, ())]
+        scores = entry.get(test_key)
+        if not wanted:
+            continue
+        if not isinstance(scores, dict):
+            problems.append(f"{test_key} missing")
+            continue
+        for req in wanted:
+            value = scores.get(req)
+            if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_REQ_SCORE:
+                problems.append(f"{test_key} {req}={value!r}")
+    return problems
+
+
+def plan_scores(entry: dict, skip: dict[str, tuple[str, ...]] | None = None) -> dict:
+    """A validated entry in score-data form: requested requirements only, plus notes."""
+    scores: dict = {}
+    for test_key, reqs in RUBRIC.items():
+        kept = {r: entry[test_key][r] for r in reqs
+                if r not in (skip or {}).get(test_key, ()) and r in entry.get(test_key, {})}
+        if kept:
+            scores[test_key] = kept
+    scores["notes"] = str(entry.get("notes", ""))
+    return scores
@@ -7,44 +7,81 @@ Inspired by karpathy/autoresearch:
   - Fixed evaluation:           eval_suite.md (49 requirements, 0–10 each)
   - Fixed test input:           brief.md (StudyBattles project brief)
   - Scoring:                    9 plans (3×brief) × 49 requirements × 10 pts = 4410 max
-  - Accept/reject:              keep prompt if score > champion_score, else revert
+  - Accept/reject:              keep prompt if it beats champion_score with confidence, else revert
   - Results log:                results.tsv
 
 Loop per iteration:
   1. Load prompt.md (challenger) or champion_prompt.md if last run failed
-  2. Generate 5 plans via Claude API
-  3. Score all plans against all 49 requirements
-  4. If score > champion: save champion_prompt.md, update SKILL.md Step 2
-  5. Always generate improved prompt.md for next iteration
-  6. Append row to results.tsv
+     (--population K adds challengers/challenger_1..K-1.md, evaluated side by side)
+  2. Generate 9 plans via Claude API (concurrently, --concurrency caps in-flight calls),
+     validate them against schema.py and regenerate only the invalid phases (repair.py)
+  3. Score plans one per brief per round (parallel per-plan shards) until a
+     sequential test (sequential.py) decides challenger vs champion, adding
+     plans up to --max-plans while undecided; a cheap model scores first and
+     Opus re-scores only contested requirements (cascade.py, --no-cascade)
+  4. If a challenger is confidently better: save champion_prompt.md, update SKILL.md Step 2
+  5. Always generate improved prompt.md (and K-1 challengers) for next iteration
+  6. Append one row per candidate to results.tsv
+
+Every paid step is journalled (journal.py), so an interrupted iteration resumes
+where it stopped on the next run. Every API call's latency, tokens, cost and
+stop reason go to telemetry/iterNNNN.jsonl (telemetry.py), rolled up per
+candidate into results.tsv. --trace writes a Chrome trace of the iteration's
+stages, calls, retries, waits and disk writes to traces/ (tracing.py).
 """
 
 import anthropic
+import argparse
+import contextvars
 import datetime
 import hashlib
+import itertools
 import json
 import os
 import re
+import sqlite3
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import analytics
+from cache import DiskCache, cache_key
+from cascade import AgreementTracker, escalations
+from journal import Journal, JournaledCache
+from phasestream import GenerationStats, PhaseTracker
+from planpack import PlanPack
+import planpack
+from prescore import DETERMINISTIC_REQS, prescore_plans
+from repair import RepairMeter, check_plan, repair_prompt, splice
+from rubric import BRIEFS, MAX_PLAN_SCORE, NUM_PLANS, NUM_PLANS_PER_BRIEF, REQ_COUNTS, TOTAL_REQS, req_keys
+import rubric
+from sequential import Decision, compare, stratified_mean
+import store
+import telemetry
+import tracing
+from telemetry import Ledger
 
 # ── paths ──────────────────────────────────────────────────────────────────────
 BASE         = os.path.dirname(os.path.abspath(__file__))
 PROMPT_FILE  = os.path.join(BASE, "prompt.md")
 CHAMP_FILE   = os.path.join(BASE, "champion_prompt.md")
 EVAL_FILE    = os.path.join(BASE, "eval_suite.md")
-BRIEFS = [
-    os.path.join(BASE, "brief.md"),       # StudyBattles  — 11 phases, MVP at 7
-    os.path.join(BASE, "brief_cli.md"),   # DevLogSummarizer — 6 phases, MVP at 4
-    os.path.join(BASE, "brief_saas.md"),  # InvoiceFlow   —  8 phases, MVP at 5
-]
 RESULTS_FILE = os.path.join(BASE, "results.tsv")
 SKILL_FILE   = os.path.join(BASE, "..", "SKILL.md")
 PLANS_DIR    = os.path.join(BASE, "plans")
 SCORES_DIR   = os.path.join(BASE, "scores")
-
-NUM_PLANS_PER_BRIEF = 3                            # plans generated per brief
-NUM_PLANS = NUM_PLANS_PER_BRIEF * len(BRIEFS)      # 3 briefs × 3 = 9 total
-MAX_SCORE = NUM_PLANS * 49 * 10                    # 9 × 49 × 10 = 4410
+CHALLENGERS_DIR = os.path.join(BASE, "challengers")  # extra population challengers (1..K-1)
+
+MAX_SCORE = NUM_PLANS * MAX_PLAN_SCORE             # 9 × 49 × 10 = 4410
+GEN_CONCURRENCY = NUM_PLANS                        # max in-flight generation calls
+GEN_MODEL = "claude-haiku-4-5-20251001"            # cheapest model — generation only
+GEN_MAX_TOKENS = 9000
+GEN_MAX_CONTINUATIONS = 2                          # resumes after a max_tokens cut-off
+REPAIR_ATTEMPTS = 2                                # partial-repair rounds for an invalid plan
+REPAIR_TOKENS_PER_PHASE = 1500                     # max_tokens per phase asked for in a repair
+GEN_CACHE_BYTES = 50 * 1024 * 1024                 # LRU bound for cached generations
+SCORE_CACHE_BYTES = 10 * 1024 * 1024               # LRU bound for cached plan scores
 
 # ── helpers ────────────────────────────────────────────────────────────────────
 
@@ -53,15 +90,147 @@ def load(path: str) -> str:
         return f.read()
 
 def save(path: str, content: str) -> None:
-    with open(path, "w", encoding="utf-8") as f:
+    """Write atomically (temp file + rename), so a crash never leaves a half-written file."""
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
         f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+_LOG_LOCK = threading.Lock()
 
 def log(msg: str) -> None:
     ts = datetime.datetime.now().strftime("%H:%M:%S")
-    print(f"[{ts}] {msg}", flush=True)
+    with _LOG_LOCK:  # generation/scoring threads log concurrently
+        print(f"[{ts}] {msg}", flush=True)
 
 # ── claude client ──────────────────────────────────────────────────────────────
 
+WARM_TIMEOUT_S = 60          # max wait for the first call to populate the prompt cache
+
+
+class UsageMeter:
+    """Thread-safe per-stage token counters, including prompt-cache reads/writes."""
+
+    FIELDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stages: dict[str, dict[str, int]] = {}
+
+    def record(self, stage: str, usage: object) -> None:
+        with self._lock:
+            totals = self.stages.setdefault(stage, {f: 0 for f in self.FIELDS} | {"calls": 0})
+            totals["calls"] += 1
+            for f in self.FIELDS:
+                totals[f] += getattr(usage, f, None) or 0
+
+    def summary(self) -> str:
+        return " | ".join(
+            f"{stage}: {t['calls']} call(s), in {t['input_tokens']}, out {t['output_tokens']}, "
+            f"cache read {t['cache_read_input_tokens']}, cache write {t['cache_creation_input_tokens']}"
+            for stage, t in self.stages.items()
+        )
+
+
+USAGE = UsageMeter()
+REPAIRS = RepairMeter()
+LEDGER: Ledger | None = None     # set by main(); one JSONL record per API call
+JOURNAL: Journal | None = None   # set by main(); replays paid steps of an interrupted iteration
+AGREEMENT: AgreementTracker | None = None   # set by main() to score through the cascade
+
+
+def record_call(
+    stage: str,
+    model: str,
+    message,
+    start: float | None,
+    ttft_s: float | None = None,
+    batch: bool = False,
+) -> None:
+    """Count a finished call's tokens and, during an iteration, add it to the ledger."""
+    USAGE.record(stage, message.usage)
+    if LEDGER is not None:
+        LEDGER.record(stage, model, message, None if start is None else time.monotonic() - start,
+                      ttft_s, batch)
+
+
+def journaled(kind: str, key: str, fn):
+    """Return the journaled result for (kind, key), or compute it with fn() and journal it."""
+    if JOURNAL is None:
+        return fn()
+    value = JOURNAL.get(kind, key)
+    if value is None:
+        value = fn()
+        JOURNAL.put(kind, key, value)
+    return value
+
+
+def cached_text(text: str) -> dict:
+    """A text content block marked as a prompt-cache breakpoint."""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+def eval_suite_block(eval_suite: str) -> dict:
+    """Cacheable eval-suite prefix, shared by every shard of a scoring pass and by the
+    population's improvement calls (the two never share an entry: scorer requests
+    lead with the score tool, and a different tools block is a different prefix)."""
+    return cached_text(f"EVAL SUITE ({TOTAL_REQS} requirements across {len(REQ_COUNTS)} tests; "
+                       f"fixed, never change this):\n{eval_suite}")
+
+
+def call_model(
+    client: anthropic.Anthropic,
+    stage: str,
+    warm: threading.Event | None = None,
+    on_json=None,
+    **kwargs,
+):
+    """Stream one request and return the final message, recording token usage.
+
+    `warm` is set once output starts: by then the prompt prefix has been written
+    to the cache, so parallel callers waiting on it will read rather than re-write it.
+    `on_json` is fed each fragment of streamed tool-call input as it arrives.
+    """
+    start = time.monotonic()
+    ttft = None
+    with tracing.span("{stage} call", "call", stage=stage, model=kwargs["model"]), \
+            client.messages.stream(**kwargs) as stream:
+        for event in stream:
+            if event.type not in ("text", "input_json"):
+                continue
+            if ttft is None:
+                ttft = time.monotonic() - start
+            if warm is not None:
+                warm.set()
+            if on_json is not None and event.type == "input_json":
+                on_json(event.partial_json)
+        final = stream.get_final_message()
+    record_call(stage, kwargs["model"], final, start, ttft)
+    return final
+
+
+def fan_out(pool: ThreadPoolExecutor, fn, jobs: list, warm: threading.Event) -> dict:
+    """Submit jobs[0] first, wait until it has warmed the prompt cache, then the rest.
+
+    Returns {future: job}. `fn(job, warm_or_None)` should set `warm` once its prompt
+    prefix is cached (call_model does this); it is also set when jobs[0] finishes
+    or fails, so a cache hit or error never stalls the rest.
+    """
+    # Each job runs in a copy of the caller's context, so telemetry tags follow it.
+    futures = {}
+    if jobs:
+        first = pool.submit(contextvars.copy_context().run, fn, jobs[0], warm)
+        first.add_done_callback(lambda _: warm.set())
+        futures[first] = jobs[0]
+        with tracing.span("wait for prompt cache", "wait"):
+            warm.wait(WARM_TIMEOUT_S)
+    for job in jobs[1:]:
+        futures[pool.submit(contextvars.copy_context().run, fn, job, None)] = job
+    return futures
+
+
 def make_client() -> anthropic.Anthropic:
     key = os.environ.get("ANTHROPIC_API_KEY", "").strip()
     if not key:
@@ -77,62 +246,334 @@ def make_client() -> anthropic.Anthropic:
 
 # ── generation ─────────────────────────────────────────────────────────────────
 
-def generate_plan(client: anthropic.Anthropic, prompt: str, brief: str) -> str:
-    response = client.messages.create(
-        model="claude-haiku-4-5-20251001",  # cheapest model — generation only
-        max_tokens=9000,
-        system=prompt,
-        messages=[{"role": "user", "content": brief}],
-    )
-    return response.content[0].text
+def generation_params(prompt: str, brief: str, prefix: str = "") -> dict:
+    """Request parameters for one plan; `prefix` continues a truncated response."""
+    messages: list[dict] = [{"role": "user", "content": brief}]
+    if prefix:
+        messages.append({"role": "assistant", "content": prefix})
+    return {
+        "model": GEN_MODEL,
+        "max_tokens": GEN_MAX_TOKENS,
+        "system": [cached_text(prompt)],
+        "messages": messages,
+    }
+
+
+def stream_plan(
+    client: anthropic.Anthropic,
+    prompt: str,
+    brief: str,
+    warm: threading.Event | None = None,
+) -> tuple[str, GenerationStats]:
+    """Stream one plan, resuming from the last complete phase if cut off by max_tokens."""
+    stats = GenerationStats()
+    tracker = PhaseTracker()
+    prefix = ""
+    while True:
+        start = time.monotonic()
+        ttft = None
+        with tracing.span("generation call", "call", model=GEN_MODEL, continuation=stats.continuations), \
+                client.messages.stream(**generation_params(prompt, brief, prefix)) as stream:
+            for delta in stream.text_stream:
+                if warm is not None:
+                    warm.set()
+                if ttft is None:
+                    ttft = time.monotonic() - start
+                stats.mark_token()
+                tracker.feed(delta)
+            final = stream.get_final_message()
+        record_call("generation", GEN_MODEL, final, start, ttft)
+        stats.output_tokens += final.usage.output_tokens
+        stats.stop_reason = final.stop_reason or ""
+        if final.stop_reason != "max_tokens" or stats.continuations >= GEN_MAX_CONTINUATIONS:
+            break
+        # Drop the partial phase and let the model continue from the last complete one.
+        prefix = tracker.resume_prefix()
+        stats.continuations += 1
+        tracker = PhaseTracker()
+        tracker.feed(prefix)
+    stats.phases_completed = tracker.phases_completed
+    stats.finish()
+    return tracker.text, stats
+
+
+def repair_plan(client: anthropic.Anthropic, prompt: str, brief: str, plan: str) -> str:
+    """Validate a generated plan and fix whatever fails the schema as cheaply as possible.
+
+    Invalid phases are regenerated on their own, with their valid neighbours as
+    context; a plan that cannot be parsed or has the wrong number of phases is
+    regenerated in full once. Outcomes are counted in REPAIRS.
+    """
+    check = check_plan(plan)
+    if check.ok:
+        REPAIRS.record("valid")
+        return plan
+    log(f"  Plan fails validation: {check.summary()[:160]}")
+    if not check.repairable:
+        # Nothing sound to anchor a partial repair on.
+        plan, _ = stream_plan(client, prompt, brief)
+        REPAIRS.record("regenerated")
+        return plan
+
+    num_phases = len(check.doc["phases"])
+    requested = repaired = tokens = 0
+    for attempt in range(REPAIR_ATTEMPTS):
+        with tracing.span("repair round {round}", "retry", round=attempt + 1, phases=len(check.invalid)):
+            response = call_model(
+                client,
+                "repair",
+                model=GEN_MODEL,
+                max_tokens=REPAIR_TOKENS_PER_PHASE * len(check.invalid),
+                system=[cached_text(prompt)],
+                messages=[{"role": "user", "content": repair_prompt(brief, check)}],
+            )
+        requested += len(check.invalid)
+        tokens += response.usage.output_tokens
+        fixed = splice(check, response.content[0].text)
+        if fixed is None:
+            continue
+        before = len(check.invalid)
+        check = check_plan(fixed)
+        plan = fixed
+        repaired += before - len(check.invalid)
+        if not check.repairable:
+            break
+    # A full plan costs about as much per phase as the repaired phases did.
+    saved = max(0, round(tokens / requested * num_phases) - tokens)
+    outcome = "repaired" if check.ok else "unrepaired"
+    REPAIRS.record(outcome, repaired, tokens, saved)
+    log(f"  Plan {outcome}: {repaired} phase(s) regenerated in {tokens} tok (≈{saved} tok saved)"
+        + ("" if check.ok else f"; still {check.summary()[:120]}"))
+    return plan
+
+
+def generate_plan(
+    client: anthropic.Anthropic,
+    prompt: str,
+    brief: str,
+    variant: int = 0,
+    cache: DiskCache | None = None,
+    warm: threading.Event | None = None,
+) -> tuple[str, GenerationStats | None]:
+    """Return (plan, stats); stats is None when the plan came from the cache."""
+    key = cache_key(prompt, brief, GEN_MODEL, GEN_MAX_TOKENS, variant)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, None
+    plan, stats = stream_plan(client, prompt, brief, warm)
+    plan = repair_plan(client, prompt, brief, plan)
+    if cache is not None:
+        cache.put(key, plan)
+    return plan, stats
+
+
+def generation_jobs(num_plans: int = NUM_PLANS) -> list[tuple[str, int]]:
+    """Return (brief_path, variant) for every plan slot, in plan_N order.
+
+    The first NUM_PLANS slots are grouped by brief; extra slots added by
+    sequential evaluation go round-robin over the briefs, one new variant each.
+    """
+    jobs = [
+        (brief_path, j)
+        for brief_path in BRIEFS
+        for j in range(NUM_PLANS_PER_BRIEF)
+    ]
+    for extra in range(num_plans - NUM_PLANS):
+        jobs.append((BRIEFS[extra % len(BRIEFS)], NUM_PLANS_PER_BRIEF + extra // len(BRIEFS)))
+    return jobs[:num_plans]
+
+
+def slot_brief(slot: int) -> int:
+    """Index into BRIEFS of the brief a plan slot was generated from."""
+    return BRIEFS.index(generation_jobs(slot + 1)[slot][0])
+
+
+def generate_plans(
+    client: anthropic.Anthropic,
+    prompt: str,
+    concurrency: int = GEN_CONCURRENCY,
+    cache: DiskCache | None = None,
+    slots: list[int] | None = None,
+) -> list[str]:
+    """Generate plan slots concurrently (default: the first NUM_PLANS); results follow `slots`."""
+    slots = list(range(NUM_PLANS)) if slots is None else slots
+    jobs = generation_jobs(max(slots) + 1)
+    briefs = {path: load(path) for path in BRIEFS}
+    plans: dict[int, str] = {}
+
+    def run_job(slot: int, warm: threading.Event | None) -> tuple[str, GenerationStats | None]:
+        brief_path, variant = jobs[slot]
+        with telemetry.tag(slot=slot + 1), tracing.span("plan {plan}", "task", plan=slot + 1):
+            return generate_plan(client, prompt, briefs[brief_path], variant, cache, warm)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        # The first call writes the system prompt to the prompt cache; the rest read it.
+        futures = fan_out(pool, run_job, slots, threading.Event())
+        for done, future in enumerate(as_completed(futures), start=1):
+            slot = futures[future]
+            brief_path, variant = jobs[slot]
+            plans[slot], stats = future.result()
+            log(f"  Plan {slot + 1}/{len(jobs)} ({os.path.basename(brief_path)}, "
+                f"variant {variant + 1}) done [{done}/{len(slots)}]: "
+                + (stats.summary() if stats else "cached"))
+    return [plans[slot] for slot in slots]
+
+# ── message batches ────────────────────────────────────────────────────────────
+
+BATCH_FILE = os.path.join(BASE, "batches.json")   # in-flight batch ids, so a rerun resumes
+BATCH_POLL_S = 30                                  # first poll interval; doubles up to the max
+BATCH_POLL_MAX_S = 600
+BATCH_TIMEOUT_S = 24 * 3600                        # batches expire after 24h
+
+
+def _load_batch_journal() -> dict[str, str]:
+    return json.loads(load(BATCH_FILE)) if os.path.exists(BATCH_FILE) else {}
+
+
+def run_batch(
+    client: anthropic.Anthropic,
+    stage: str,
+    requests: dict[str, dict],
+    tags: dict[str, dict] | None = None,
+) -> dict:
+    """Run custom_id -> params as one Message Batch; return custom_id -> message (None if errored).
+
+    `tags` adds per-request telemetry fields (custom_id -> fields) to the ledger.
+
+    The batch id is journalled under a hash of the requests, so if this process
+    dies while polling, the next run with the same requests resumes the batch
+    instead of paying for a new one.
+    """
+    journal_key = f"{stage}:{cache_key(requests)}"
+    journal = _load_batch_journal()
+    batch_id = journal.get(journal_key)
+    if batch_id is None:
+        batch = client.messages.batches.create(requests=[
+            {"custom_id": custom_id, "params": params} for custom_id, params in requests.items()
+        ])
+        batch_id = batch.id
+        journal[journal_key] = batch_id
+        save(BATCH_FILE, json.dumps(journal, indent=2))
+        log(f"  Submitted {stage} batch {batch_id} ({len(requests)} requests).")
+    else:
+        log(f"  Resuming {stage} batch {batch_id}.")
+
+    delay = BATCH_POLL_S
+    deadline = time.monotonic() + BATCH_TIMEOUT_S
+    with tracing.span("wait for {stage} batch", "wait", stage=stage, requests=len(requests)):
+        while client.messages.batches.retrieve(batch_id).processing_status != "ended":
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{stage} batch {batch_id} did not finish in {BATCH_TIMEOUT_S}s")
+            time.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_S)
+
+    results: dict = {}
+    for entry in client.messages.batches.results(batch_id):
+        if entry.result.type == "succeeded":
+            with telemetry.tag(**(tags or {}).get(entry.custom_id, {})):
+                record_call(stage, requests[entry.custom_id]["model"], entry.result.message, None, batch=True)
+            results[entry.custom_id] = entry.result.message
+        else:
+            results[entry.custom_id] = None
+    journal = _load_batch_journal()
+    journal.pop(journal_key, None)
+    save(BATCH_FILE, json.dumps(journal, indent=2))
+    log(f"  {stage} batch {batch_id} ended: "
+        f"{sum(r is not None for r in results.values())}/{len(requests)} succeeded.")
+    return results
+
+
+def generate_plans_batch(
+    client: anthropic.Anthropic,
+    prompts: dict[str, str],
+    cache: DiskCache | None = None,
+    tags: dict[str, dict] | None = None,
+) -> dict[str, list[str]]:
+    """Generate every plan slot for several prompts (label -> prompt) in one batch.
+
+    `tags` gives telemetry fields per label (e.g. the candidate number).
+
+    Queuing several prompts' jobs together lets one batch cover more than one
+    iteration's generation. Failed or truncated results are regenerated by
+    streaming, which can resume from the last complete phase.
+    """
+    jobs = generation_jobs()
+    briefs = {path: load(path) for path in BRIEFS}
+    plans = {label: [""] * len(jobs) for label in prompts}
+    requests: dict[str, dict] = {}
+    keys: dict[str, str] = {}
+    call_tags: dict[str, dict] = {}
+    for label, prompt in prompts.items():
+        for slot, (brief_path, variant) in enumerate(jobs):
+            key = cache_key(prompt, briefs[brief_path], GEN_MODEL, GEN_MAX_TOKENS, variant)
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                plans[label][slot] = cached
+                continue
+            custom_id = f"{label}-plan_{slot + 1}"
+            requests[custom_id] = generation_params(prompt, briefs[brief_path])
+            keys[custom_id] = key
+            call_tags[custom_id] = {**(tags or {}).get(label, {}), "slot": slot + 1}
+    if not requests:
+        return plans
+
+    results = run_batch(client, "generation", requests, call_tags)
+    for custom_id, key in keys.items():
+        label, _, plan_key = custom_id.rpartition("-")
+        slot = int(plan_key.removeprefix("plan_")) - 1
+        message = results.get(custom_id)
+        with telemetry.tag(**call_tags[custom_id]):
+            if message is None or message.stop_reason == "max_tokens":
+                log(f"  {custom_id}: batch result unusable, regenerating by streaming.")
+                brief_path, _ = jobs[slot]
+                text, _ = stream_plan(client, prompts[label], briefs[brief_path])
+            else:
+                text = message.content[0].text
+            plans[label][slot] = text = repair_plan(client, prompts[label], briefs[jobs[slot][0]], text)
+        if cache is not None:
+            cache.put(key, text)
+    return plans
 
 # ── scoring ────────────────────────────────────────────────────────────────────
 
-SCORE_SCHEMA = """{
-  "plan_1": {
-    "test_1":  {"req_1": 0, "req_2": 0, "req_3": 0, "req_4": 0},
-    "test_2":  {"req_1": 0, "req_2": 0, "req_3": 0, "req_4": 0},
-    "test_3":  {"req_1": 0, "req_2": 0, "req_3": 0, "req_4": 0, "req_5": 0},
-    "test_4":  {"req_1": 0, "req_2": 0, "req_3": 0, "req_4": 0},
-    "test_5":  {"req_1": 0, "req_2": 0, "req_3": 0, "req_4": 0},
-    "test_6":  {"req_1": 0, "req_2": 0, "req_3": 0, "req_4": 0},
-    "test_7":  {"req_1": 0, "req_2": 0, "req_3": 0, "req_4": 0},
-    "test_8":  {"req_1": 0, "req_2": 0, "req_3": 0, "req_4": 0, "req_5": 0},
-    "test_9":  {"req_1": 0, "req_2": 0, "req_3": 0, "req_4": 0, "req_5": 0},
-    "test_10": {"req_1": 0, "req_2": 0, "req_3": 0, "req_4": 0, "req_5": 0},
-    "test_11": {"q1": 0, "q2": 0, "q3": 0, "q4": 0, "q5": 0}
-  },
-  "plan_2": { ... same structure ... },
-  "plan_3": { ... same structure ... },
-  "plan_4": { ... same structure ... },
-  "plan_5": { ... same structure ... },
-  "plan_6": { ... same structure ... },
-  "plan_7": { ... same structure ... },
-  "plan_8": { ... same structure ... },
-  "plan_9": { ... same structure ... },
-  "analysis": "2–3 sentences on the most common failure patterns"
-}"""
-
-
-def score_plans(client: anthropic.Anthropic, plans: list[str], eval_suite: str) -> tuple[int, dict]:
+SCORER_MODEL = "claude-opus-4-6"
+CASCADE_MODEL = GEN_MODEL                          # cheap first-pass scorer (cascade.py)
+SCORE_SHARD_SIZE = 1                               # plans per scoring request
+SCORE_CONCURRENCY = NUM_PLANS                      # max in-flight scoring calls
+SEQ_MAX_PLANS = 2 * NUM_PLANS                      # sequential-test budget per challenger
+SCORE_RETRIES = 1                                  # extra attempts per failed shard
+
+def shard_params(
+    plans: list[str],
+    eval_suite: str,
+    skip: dict[str, tuple[str, ...]] | None = None,
+    model: str = SCORER_MODEL,
+) -> dict:
+    """Request parameters for scoring one shard of plans.
+
+    The score tool, the eval suite and the rubric instructions are the same for
+    every shard and sent as a cached prefix; only the plans block (and the list
+    of requirements to leave out) differs between shards.
+    """
     plans_block = "\n\n".join(
         f"=== PLAN {i + 1} ===\n{p}" for i, p in enumerate(plans)
     )
+    skipped = ", ".join(f"{t} {r}" for t, reqs in (skip or {}).items() for r in reqs)
+    skip_note = (
+        f"Leave these requirements out; they are scored elsewhere: {skipped}.\n\n"
+        if skipped else ""
+    )
 
-    prompt = f"""You are a strict evaluator for phase-compiler plans.
-Score every requirement for every plan on a 0–10 scale:
+    rubric_text = f"""You are a strict evaluator for phase-compiler plans.
+Score every requirement of the EVAL SUITE above for every plan below on a 0–10 scale:
   0  = completely fails
   5  = partially meets
   10 = fully meets
 
-EVAL SUITE (49 requirements across 11 tests):
-{eval_suite}
-
-PLANS TO EVALUATE:
-{plans_block}
-
-Return ONLY valid JSON matching this schema (replace 0s with actual scores):
-{SCORE_SCHEMA}
+Call {rubric.SCORE_TOOL_NAME} once with one entry per plan, in plan order. Each entry
+gives the plan number, an integer score for every requirement (test_1..test_{len(REQ_COUNTS)},
+keyed req_N, or qN for test_11) and a one-sentence note.
 
 Important:
 - test_11 asks 5 retrieval questions — score 10 if the plan alone answers the question, 0 if it cannot, 5 if partially.
@@ -140,31 +581,447 @@ Important:
 - A commit condition with no expected output scores 0 for test_6 req_2.
 """
 
-    response = client.messages.create(
-        model="claude-opus-4-6",
-        max_tokens=16000,
+    return {
+        "model": model,
+        "max_tokens": 2000 * len(plans),
+        "tools": [rubric.score_tool()],
+        "tool_choice": {"type": "tool", "name": rubric.SCORE_TOOL_NAME},
+        "messages": [{"role": "user", "content": [
+            eval_suite_block(eval_suite),
+            cached_text(rubric_text),
+            {"type": "text", "text": f"{skip_note}PLANS TO EVALUATE:\n{plans_block}"},
+        ]}],
+    }
+
+
+def parse_shard(
+    response,
+    num_plans: int,
+    skip: dict[str, tuple[str, ...]] | None = None,
+    streamed: PhaseTracker | None = None,
+) -> tuple[dict, dict]:
+    """Split a scorer response into ({"plan_N": scores}, {"plan_N": problem}).
+
+    Entries come from the tool call, or from the objects `streamed` saw complete
+    when the call was cut off, so a truncated or partly malformed response still
+    yields every plan it scored correctly.
+    """
+    entries: list = []
+    tool_input = next((b.input for b in response.content if getattr(b, "type", "") == "tool_use"), None)
+    if response.stop_reason != "max_tokens" and isinstance(tool_input, dict) and "plans" in tool_input:
+        entries = tool_input["plans"] if isinstance(tool_input["plans"], list) else []
+    elif streamed is not None:
+        for text in streamed.phases():
+            try:
+                entries.append(json.loads(text))
+            except json.JSONDecodeError:
+                pass
+    good: dict = {}
+    bad: dict = {}
+    for entry in entries:
+        plan = entry.get("plan") if isinstance(entry, dict) else None
+        if not isinstance(plan, int) or not 1 <= plan <= num_plans:
+            continue
+        problems = rubric.validate_plan(entry, skip)
+        if problems:
+            bad[f"plan_{plan}"] = ", ".join(problems[:3])
+        else:
+            good[f"plan_{plan}"] = rubric.plan_scores(entry, skip)
+    for i in range(1, num_plans + 1):
+        if f"plan_{i}" not in good and f"plan_{i}" not in bad:
+            bad[f"plan_{i}"] = "truncated" if response.stop_reason == "max_tokens" else "omitted"
+    return good, bad
+
+
+def call_scorer(
+    client: anthropic.Anthropic,
+    stage: str,
+    warm: threading.Event | None,
+    plans: list[str],
+    eval_suite: str,
+    skip: dict[str, tuple[str, ...]] | None = None,
+    model: str = SCORER_MODEL,
+) -> tuple[dict, dict]:
+    """One scorer call, parsing each plan's entry as soon as it has streamed in."""
+    tracker = PhaseTracker("plans")
+    response = call_model(client, stage, warm, on_json=tracker.feed,
+                          **shard_params(plans, eval_suite, skip, model))
+    return parse_shard(response, len(plans), skip, tracker)
+
+
+def score_shard(
+    client: anthropic.Anthropic,
+    plans: list[str],
+    eval_suite: str,
+    skip: dict[str, tuple[str, ...]] | None = None,
+    warm: threading.Event | None = None,
+) -> tuple[dict, dict]:
+    """Score one shard of plans; returns ({"plan_N": scores}, {"plan_N": problem}) keyed shard-locally.
+
+    With the cascade on, CASCADE_MODEL scores everything and SCORER_MODEL only
+    re-scores the requirements cascade.escalations() picks; its scores win.
+    """
+    if AGREEMENT is None:
+        return call_scorer(client, "scoring", warm, plans, eval_suite, skip)
+
+    cheap, bad = call_scorer(client, "scoring-cheap", warm, plans, eval_suite, skip, CASCADE_MODEL)
+    # Only plans the cheap pass scored cleanly go on; the rest are retried whole.
+    local = sorted(cheap, key=lambda k: int(k[5:]))
+    escalate = escalations({f"plan_{j}": cheap[k] for j, k in enumerate(local, start=1)},
+                           [plans[int(k[5:]) - 1] for k in local], AGREEMENT)
+    if not escalate:
+        return cheap, bad
+    # Everything not escalated is left out of the expensive request, alongside
+    # whatever the caller already skips.
+    expensive_skip = {
+        test: tuple(r for r in req_keys(test) if r in (skip or {}).get(test, ()) or r not in escalate.get(test, ()))
+        for test in REQ_COUNTS
+    }
+    expensive, expensive_bad = call_scorer(client, "scoring", None, [plans[int(k[5:]) - 1] for k in local],
+                                           eval_suite, expensive_skip)
+    good: dict = {}
+    for j, key in enumerate(local, start=1):
+        if f"plan_{j}" in expensive_bad:
+            bad[key] = expensive_bad[f"plan_{j}"]
+            continue
+        plan_scores = cheap[key]
+        for test, reqs in expensive[f"plan_{j}"].items():
+            if not isinstance(reqs, dict):
+                continue
+            for req, value in reqs.items():
+                AGREEMENT.record(test, req, plan_scores[test][req], value)
+                plan_scores[test][req] = value
+        good[key] = plan_scores
+    return good, bad
+
+
+def summarise_scores(client: anthropic.Anthropic, score_data: dict) -> str:
+    """Write the iteration-level `analysis` from merged shard scores and notes."""
+    plan_keys = sorted((k for k in score_data if k.startswith("plan_")), key=lambda k: int(k[5:]))
+    lines = []
+    for plan_key in plan_keys:
+        plan_scores = score_data[plan_key]
+        low = [
+            f"{test_key}.{req_key}={v}"
+            for test_key, test_scores in plan_scores.items()
+            if isinstance(test_scores, dict)
+            for req_key, v in test_scores.items()
+            if int(v) < 8
+        ]
+        lines.append(
+            f"PLAN {plan_key[5:]}: low requirements: {', '.join(low) or 'none'} | "
+            f"notes: {plan_scores.get('notes', '')}"
+        )
+    totals = compute_test_totals(score_data)
+    prompt = f"""Below are per-plan evaluation results for {len(plan_keys)} phase-compiler plans.
+
+PER-TEST TOTALS: {", ".join(f"{k}={v}" for k, v in totals.items())}
+
+{chr(10).join(lines)}
+
+In 2–3 sentences, describe the most common failure patterns across all plans.
+Return only the sentences.
+"""
+    response = call_model(
+        client,
+        "analysis",
+        model=SCORER_MODEL,
+        max_tokens=600,
         messages=[{"role": "user", "content": prompt}],
     )
-    raw = response.content[0].text
-
-    # Extract JSON — handle both bare and fenced output
-    match = re.search(r"\{[\s\S]*\}", raw)
-    if not match:
-        raise ValueError(f"Scorer returned no JSON:\n{raw[:800]}")
-    data = json.loads(match.group())
-
-    total = 0
-    for plan_key in [f"plan_{i}" for i in range(1, NUM_PLANS + 1)]:
-        plan_scores = data.get(plan_key, {})
-        for test_scores in plan_scores.values():
-            if isinstance(test_scores, dict):
-                total += sum(int(v) for v in test_scores.values())
+    return response.content[0].text.strip()
+
+
+def merge_prescores(plan_scores: dict, prescore: dict | None) -> dict:
+    """Combine scorer output with deterministic scores in rubric order."""
+    merged: dict = {}
+    for test_key in REQ_COUNTS:
+        test_scores = dict(plan_scores.get(test_key, {}))
+        test_scores.update((prescore or {}).get(test_key, {}))
+        merged[test_key] = {k: test_scores[k] for k in req_keys(test_key) if k in test_scores}
+    if "notes" in plan_scores:
+        merged["notes"] = plan_scores["notes"]
+    return merged
+
+
+def prescore_upper_bound(prescores: list[dict | None]) -> int:
+    """Best total the plans could reach given their deterministic scores."""
+    per_plan_max = MAX_PLAN_SCORE
+    deterministic_max = sum(len(reqs) for reqs in DETERMINISTIC_REQS.values()) * 10
+    return sum(
+        per_plan_max if p is None
+        else per_plan_max - deterministic_max + sum(sum(t.values()) for t in p.values())
+        for p in prescores
+    )
+
+
+def prereject_score_data(prescores: list[dict | None], champion_score: int) -> dict:
+    """score_data for a challenger rejected offline: only its deterministic scores.
+
+    Requirements the scorer never saw are left out rather than filled in, and
+    the upper bound is kept as `score_bound`, never as a total_score, so no
+    invented score reaches the history.
+    """
+    data: dict = {}
+    for slot, prescore in enumerate(prescores):
+        if prescore is not None:
+            data[f"plan_{slot + 1}"] = {t: v for t, v in merge_prescores({}, prescore).items() if v}
+    bound = prescore_upper_bound(prescores)
+    failing = sorted({
+        f"{t} {r}"
+        for p in prescores if p is not None
+        for t, reqs in p.items() for r, v in reqs.items() if v < 10
+    })
+    data["analysis"] = (
+        f"Rejected by the deterministic pre-scorer: even with every subjective requirement "
+        f"at 10, this prompt scores at most {bound}, not above the champion's {champion_score}. "
+        f"Failing mechanical checks: {', '.join(failing) or 'none'}."
+    )
+    data["score_bound"] = bound
+    return data
+
+
+def score_slots(
+    client: anthropic.Anthropic,
+    plans: list[str],
+    eval_suite: str,
+    slots: list[int],
+    shard_size: int = SCORE_SHARD_SIZE,
+    concurrency: int = SCORE_CONCURRENCY,
+    cache: DiskCache | None = None,
+    prescores: list[dict | None] | None = None,
+    batch: bool = False,
+) -> dict:
+    """Score the given plan slots in parallel shards; returns {"plan_N": {...}} for those slots.
+
+    Identical plan texts are scored once, and plans already scored against this
+    eval suite by this model are served from `cache` without a scorer call.
+    Plans with `prescores` are only asked about the non-deterministic requirements.
+    With `batch`, all shards go out as one Message Batch instead of parallel calls.
+    """
+    shard_size = max(1, shard_size)
+    prescores = prescores or [None] * len(plans)
+    slots_by_key: dict[str, list[int]] = {}
+    prescored_keys: set[str] = set()
+    for slot in slots:
+        plan = plans[slot]
+        prescored = prescores[slot] is not None
+        key = cache_key(plan, eval_suite, SCORER_MODEL, DETERMINISTIC_REQS if prescored else None,
+                        *([CASCADE_MODEL] if AGREEMENT is not None else []))
+        slots_by_key.setdefault(key, []).append(slot)
+        if prescored:
+            prescored_keys.add(key)
+
+    merged: dict[int, dict] = {}
+    pending: list[str] = []
+    for key, key_slots in slots_by_key.items():
+        cached = cache.get(key) if cache is not None else None
+        if cached is None:
+            pending.append(key)
+            continue
+        for slot in key_slots:
+            merged[slot] = cached
+    if len(pending) < len(slots):
+        log(f"  {len(slots) - len(pending)} plan(s) served from cache or deduplicated; "
+            f"{len(pending)} to score")
+    shards = []
+    for group in ([k for k in pending if k in prescored_keys], [k for k in pending if k not in prescored_keys]):
+        shards += [group[i:i + shard_size] for i in range(0, len(group), shard_size)]
+
+    def skip_for(keys: list[str]) -> dict[str, tuple[str, ...]] | None:
+        return DETERMINISTIC_REQS if keys[0] in prescored_keys else None
+
+    def run_shard(keys: list[str], warm: threading.Event | None) -> dict[str, dict]:
+        """Scores by plan key; a retry re-sends only the plans that came back malformed."""
+        scored: dict[str, dict] = {}
+        for attempt in range(SCORE_RETRIES + 1):
+            todo = [k for k in keys if k not in scored]
+            slots_tag = [slots_by_key[k][0] + 1 for k in todo]
+            with telemetry.tag(**({"slot": slots_tag[0]} if len(slots_tag) == 1 else {"slots": slots_tag})), \
+                    tracing.span("score plan(s) {plans}", "retry" if attempt else "task",
+                                 plans=slots_tag, attempt=attempt + 1):
+                good, bad = score_shard(client, [plans[slots_by_key[k][0]] for k in todo], eval_suite,
+                                        skip_for(keys), warm)
+            scored.update((k, good[f"plan_{i}"]) for i, k in enumerate(todo, start=1) if f"plan_{i}" in good)
+            problems = "; ".join(f"plan {slots_by_key[k][0] + 1}: {bad[f'plan_{i}']}"
+                                 for i, k in enumerate(todo, start=1) if f"plan_{i}" in bad)
+            if len(scored) == len(keys):
+                return scored
+            if attempt == SCORE_RETRIES:
+                raise ValueError(f"Scorer output still malformed after {SCORE_RETRIES} retries — {problems}")
+            log(f"  Malformed scores ({problems[:120]}), rescoring those plan(s)...")
+            warm = None
+        raise AssertionError("unreachable")
+
+    def store_score(scored: dict[str, dict]) -> None:
+        if not scored:
+            return
+        slots_scored = []
+        for key, plan_scores in scored.items():
+            if cache is not None:
+                cache.put(key, plan_scores)
+            for slot in slots_by_key[key]:
+                merged[slot] = plan_scores
+                slots_scored.append(slot + 1)
+        log(f"  Scored plan(s) {', '.join(str(n) for n in sorted(slots_scored))}")
+
+    if batch and shards:
+        requests = {
+            f"shard_{i}": shard_params([plans[slots_by_key[k][0]] for k in keys], eval_suite, skip_for(keys))
+            for i, keys in enumerate(shards)
+        }
+        results = run_batch(client, "scoring", requests)
+        retry = []
+        for i, keys in enumerate(shards):
+            message = results.get(f"shard_{i}")
+            if message is None:
+                log(f"  Batch shard {i} failed; rescoring directly.")
+                retry.append(keys)
+                continue
+            good, bad = parse_shard(message, len(keys), skip_for(keys))
+            store_score({k: good[f"plan_{j}"] for j, k in enumerate(keys, start=1) if f"plan_{j}" in good})
+            if bad:
+                log(f"  Batch shard {i}: {len(bad)} plan(s) malformed; rescoring those directly.")
+                retry.append([k for j, k in enumerate(keys, start=1) if f"plan_{j}" in bad])
+        shards = retry
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        # The first shard writes the eval-suite/rubric prefix to the prompt cache.
+        futures = fan_out(pool, run_shard, shards, threading.Event())
+        for future in as_completed(futures):
+            store_score(future.result())
+    return {
+        f"plan_{slot + 1}": merge_prescores(merged[slot], prescores[slot])
+        for slot in sorted(merged)
+    }
+
+
+def plan_total(plan_scores: dict) -> int:
+    return sum(
+        sum(int(v) for v in test_scores.values())
+        for test_scores in plan_scores.values()
+        if isinstance(test_scores, dict)
+    )
+
+
+def finish_score_data(client: anthropic.Anthropic, data: dict) -> tuple[int, dict]:
+    """Add the analysis summary and total_score to merged per-plan scores."""
+    data["analysis"] = journaled("analysis", cache_key(data), lambda: summarise_scores(client, data))
+    total = sum(plan_total(v) for k, v in data.items() if k.startswith("plan_"))
     data["total_score"] = total
     return total, data
 
 
+def score_plans(
+    client: anthropic.Anthropic,
+    plans: list[str],
+    eval_suite: str,
+    shard_size: int = SCORE_SHARD_SIZE,
+    concurrency: int = SCORE_CONCURRENCY,
+    cache: DiskCache | None = None,
+    prescores: list[dict | None] | None = None,
+    batch: bool = False,
+) -> tuple[int, dict]:
+    """Score every plan and merge into one plan_N/test_N/req_N dict."""
+    data = score_slots(
+        client, plans, eval_suite, list(range(len(plans))),
+        shard_size, concurrency, cache, prescores, batch,
+    )
+    return finish_score_data(client, data)
+
+
+def plan_samples(data: dict) -> dict[int, list[float]]:
+    """Per-brief lists of plan totals, for the sequential test."""
+    samples: dict[int, list[float]] = {}
+    for key, plan_scores in data.items():
+        if key.startswith("plan_"):
+            samples.setdefault(slot_brief(int(key[5:]) - 1), []).append(plan_total(plan_scores))
+    return samples
+
+
+def champion_samples() -> dict[int, list[float]]:
+    """The current champion's per-brief plan totals (empty if they were never stored)."""
+    samples: dict[int, list[float]] = {}
+    for plan, total in store.champion_plan_scores(results_db()).items():
+        samples.setdefault(slot_brief(plan - 1), []).append(total)
+    return samples
+
+
+def score_sequential(
+    client: anthropic.Anthropic,
+    prompt: str,
+    plans: list[str],
+    eval_suite: str,
+    champion_score: int,
+    champion: dict[int, list[float]] | None = None,
+    cache: DiskCache | None = None,
+    gen_cache: DiskCache | None = None,
+    prescores: list[dict | None] | None = None,
+    concurrency: int = SCORE_CONCURRENCY,
+    max_plans: int = SEQ_MAX_PLANS,
+) -> tuple[int, dict, Decision]:
+    """Score one plan per brief per round until the champion comparison is decided.
+
+    The generated NUM_PLANS plans are scored round-robin across briefs. If the
+    difference is still undecided after them, more rounds are generated and
+    scored, up to `max_plans`; `plans` and `prescores` are extended in place.
+    The exact prescore upper bound still rejects a challenger that cannot win.
+    Returns (score, score_data, decision); the score is the per-brief mean
+    scaled to NUM_PLANS plans, so it stays comparable with champion_score.
+    """
+    prescores = prescores if prescores is not None else [None] * len(plans)
+    data: dict = {}
+    decision = compare({}, champion, champion_score / NUM_PLANS, NUM_PLANS)
+    for round_no in itertools.count():
+        if round_no < NUM_PLANS_PER_BRIEF:
+            slots = [b * NUM_PLANS_PER_BRIEF + round_no for b in range(len(BRIEFS))]
+        elif len(plans) + len(BRIEFS) <= max_plans:
+            slots = list(range(len(plans), len(plans) + len(BRIEFS)))
+            log(f"  Undecided after {len(plans)} plans — generating {len(slots)} more.")
+            extra = generate_plans(client, prompt, concurrency, gen_cache, slots)
+            plans.extend(extra)
+            prescores.extend(prescore_plans(extra))
+        else:
+            break
+        with tracing.span("round {round}", "round", round=round_no + 1, slots=[s + 1 for s in slots]):
+            data.update(score_slots(client, plans, eval_suite, slots, concurrency=concurrency,
+                                    cache=cache, prescores=prescores))
+        decision = compare(plan_samples(data), champion, champion_score / NUM_PLANS, NUM_PLANS)
+        log(f"  Round {round_no + 1}: {len(data)} plan(s) scored, {decision.summary()}")
+        if decision.verdict:
+            break
+        unscored = [prescores[i] for i in range(NUM_PLANS) if f"plan_{i + 1}" not in data]
+        scored = sum(plan_total(data[f"plan_{i + 1}"]) for i in range(NUM_PLANS) if f"plan_{i + 1}" in data)
+        if unscored and scored + prescore_upper_bound(unscored) <= champion_score:
+            log(f"  Challenger cannot beat the champion — stopping after {len(data)} plan(s).")
+            decision.verdict = "reject"
+            break
+    _, data = finish_score_data(client, data)
+    data["total_score"] = round(stratified_mean(plan_samples(data)) * NUM_PLANS)
+    return data["total_score"], data, decision
+
+
 # ── prompt improvement ─────────────────────────────────────────────────────────
 
+def test_points(score_data: dict) -> tuple[dict[str, int], dict[str, int]]:
+    """Per-test points and the most those same requirements could have scored.
+
+    Only requirements that were actually scored count towards a maximum, so a
+    pre-rejected candidate's partial scores still rank its tests fairly.
+    """
+    points: dict[str, int] = {}
+    maxes: dict[str, int] = {}
+    for plan_key, plan_scores in score_data.items():
+        if not plan_key.startswith("plan_") or not isinstance(plan_scores, dict):
+            continue
+        for test_key in REQ_COUNTS:
+            test_scores = plan_scores.get(test_key, {})
+            if isinstance(test_scores, dict) and test_scores:
+                points[test_key] = points.get(test_key, 0) + sum(int(v) for v in test_scores.values())
+                maxes[test_key] = maxes.get(test_key, 0) + len(test_scores) * 10
+    return points, maxes
+
+
 def improve_prompt(
     client: anthropic.Anthropic,
     current_prompt: str,
@@ -172,26 +1029,13 @@ def improve_prompt(
     score_data: dict,
     eval_suite: str,
     champion_score: int,
+    focus: str | None = None,
+    history: str = "",
 ) -> str:
+    """Rewrite a prompt against its failures; `focus` steers one population member and
+    `history` adds what the score history says (see score_history)."""
     # Aggregate per-test scores across all plans to find worst tests
-    test_totals: dict[str, int] = {}
-    test_maxes: dict[str, int] = {}
-    req_counts = {
-        "test_1": 4, "test_2": 4, "test_3": 5, "test_4": 4,
-        "test_5": 4, "test_6": 4, "test_7": 4, "test_8": 5,
-        "test_9": 5, "test_10": 5, "test_11": 5,
-    }
-    for test_key, req_count in req_counts.items():
-        total_pts = 0
-        for plan_key in [f"plan_{i}" for i in range(1, NUM_PLANS + 1)]:
-            plan_scores = score_data.get(plan_key, {})
-            test_scores = plan_scores.get(test_key, {})
-            if isinstance(test_scores, dict):
-                total_pts += sum(int(v) for v in test_scores.values())
-        max_pts = NUM_PLANS * req_count * 10
-        test_totals[test_key] = total_pts
-        test_maxes[test_key] = max_pts
-
+    test_totals, test_maxes = test_points(score_data)
     worst = sorted(test_totals.items(), key=lambda x: x[1] / test_maxes[x[0]])[:4]
     worst_str = "; ".join(
         f"{t} scored {test_totals[t]}/{test_maxes[t]}" for t, _ in worst
@@ -201,22 +1045,21 @@ def improve_prompt(
         f"=== PLAN {i + 1} (first 1200 chars) ===\n{p[:1200]}"
         for i, p in enumerate(plans[:3])
     )
+    history_section = f"\nSCORE HISTORY (every iteration so far):\n{history}\n" if history else ""
 
     prompt = f"""You are improving a plan-generation system prompt for a software project planning skill called phase-compiler.
+The plans it generates are scored against the EVAL SUITE above.
 
 CURRENT PROMPT:
 {current_prompt}
 
-EVAL SUITE (fixed, never change this):
-{eval_suite}
-
-CURRENT SCORE: {score_data.get('total_score', 0)}/{MAX_SCORE}
+CURRENT SCORE: {score_data.get('total_score', 'unscored')}/{MAX_SCORE}
 CHAMPION SCORE: {champion_score}/{MAX_SCORE}
 
 FAILURE ANALYSIS: {score_data.get('analysis', 'none')}
 WORST TESTS: {worst_str}
-
-SAMPLE GENERATED PLANS (first 3):
+{history_section}
+SAMPLE GENERATED PLANS (the lowest-scoring plan of each brief):
 {sample}
 
 Your task: rewrite the CURRENT PROMPT to fix the identified failure patterns.
@@ -231,97 +1074,217 @@ Rules for your rewrite:
 
 Return ONLY the improved prompt text — no preamble, no explanation, no markdown wrapper.
 """
+    if focus:
+        prompt += f"\nFOCUS: {focus}\n"
 
-    response = client.messages.create(
+    response = call_model(
+        client,
+        "improvement",
         model="claude-opus-4-6",
         max_tokens=4000,
-        messages=[{"role": "user", "content": prompt}],
+        messages=[{"role": "user", "content": [
+            eval_suite_block(eval_suite),
+            {"type": "text", "text": prompt},
+        ]}],
     )
     return response.content[0].text.strip()
 
 
+@tracing.traced("score_history")
+def score_history(iteration: int, prompts: list[str]) -> str:
+    """analytics.history_notes over every score file, this iteration's included."""
+    texts = analytics.archived_prompts(store.load_iterations(results_db()))
+    texts.update({(iteration, k): p for k, p in enumerate(prompts)})
+    tensor = analytics.load()
+    sizes = analytics.plan_sizes(tensor, plan_pack().entries(columns=analytics.SIZE_COLUMNS))
+    return analytics.history_notes(tensor, texts, [os.path.basename(b) for b in BRIEFS], sizes=sizes)
+
+
+def improve_population(
+    client: anthropic.Anthropic,
+    base_prompt: str,
+    plans: list[str],
+    score_data: dict,
+    eval_suite: str,
+    champion_score: int,
+    size: int,
+    history: str = "",
+) -> list[str]:
+    """Write `size` challengers from one base prompt, in parallel.
+
+    Challenger 1 is the plain rewrite; each other one is told to prioritise a
+    different weak test, so the population spreads over several fixes instead
+    of K near-identical rewrites.
+    """
+    totals, maxes = test_points(score_data)
+    worst = sorted(totals, key=lambda t: totals[t] / maxes[t]) or list(REQ_COUNTS)
+    focuses: list[str | None] = [None] + [
+        f"You are writing challenger {i + 1} of {size}. Prioritise {t} "
+        f"(scored {totals.get(t, 0)}/{maxes.get(t, 0)}) above every other weak test, "
+        f"and take a different approach from the most obvious rewrite."
+        for i, t in zip(range(1, size), worst * size)
+    ]
+
+    def run_job(i: int, warm: threading.Event | None) -> str:
+        return journaled(
+            "improvement", cache_key(base_prompt, score_data, focuses[i]),
+            lambda: improve_prompt(client, base_prompt, plans, score_data, eval_suite, champion_score,
+                                   focuses[i], history),
+        )
+
+    results: dict[int, str] = {}
+    with ThreadPoolExecutor(max_workers=size) as pool:
+        futures = fan_out(pool, run_job, list(range(size)), threading.Event())
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return [results[i] for i in range(size)]
+
+
 # ── results log ────────────────────────────────────────────────────────────────
 
-def load_champion_score() -> int:
-    if not os.path.exists(RESULTS_FILE):
-        return 0
-    scores = []
-    with open(RESULTS_FILE, encoding="utf-8") as f:
-        for line in f.readlines()[1:]:  # skip header
-            parts = line.strip().split("\t")
-            if len(parts) >= 3:
-                try:
-                    scores.append(int(parts[2]))
-                except ValueError:
-                    pass
-    return max(scores) if scores else 0
+def results_db() -> sqlite3.Connection:
+    """The results database, opened (and imported from results.tsv) on first use."""
+    global _RESULTS_DB
+    if _RESULTS_DB is None:
+        _RESULTS_DB = store.connect(extra_columns=RESULTS_EXTRA_COLUMNS)
+    return _RESULTS_DB
 
 
-def get_iteration() -> int:
-    if not os.path.exists(RESULTS_FILE):
-        return 1
-    max_iter = 0
-    with open(RESULTS_FILE, encoding="utf-8") as f:
-        for line in f.readlines()[1:]:  # skip header
-            parts = line.split("\t")
-            try:
-                max_iter = max(max_iter, int(parts[0]))
-            except (ValueError, IndexError):
-                pass
-    return max_iter + 1
+_RESULTS_DB: sqlite3.Connection | None = None
+
+
+def plan_pack() -> PlanPack:
+    """The plan archive (see planpack.py), opened on first use."""
+    global _PLAN_PACK
+    if _PLAN_PACK is None:
+        _PLAN_PACK = PlanPack(PLANS_DIR)
+    return _PLAN_PACK
+
 
+_PLAN_PACK: PlanPack | None = None
 
-REQ_COUNTS = {
-    "test_1": 4, "test_2": 4, "test_3": 5, "test_4": 4,
-    "test_5": 4, "test_6": 4, "test_7": 4, "test_8": 5,
-    "test_9": 5, "test_10": 5, "test_11": 5,
-}
+
+def load_champion_score() -> int:
+    return store.champion_score(results_db())
+
+
+def get_iteration() -> int:
+    return store.next_iteration(results_db())
 
 
 def compute_test_totals(score_data: dict) -> dict[str, int]:
-    """Return per-test aggregate scores across all plans."""
-    totals: dict[str, int] = {k: 0 for k in REQ_COUNTS}
-    for plan_key in [f"plan_{i}" for i in range(1, NUM_PLANS + 1)]:
-        plan_scores = score_data.get(plan_key, {})
+    """Return per-test scores on total_score's scale; tests nothing scored are left out.
+
+    Like total_score, each test is the mean per brief over every scored plan
+    (the sequential test may score more than NUM_PLANS), averaged across briefs
+    and scaled to NUM_PLANS plans, so the per-test columns add up to the score.
+    """
+    samples: dict[str, dict[int, list[float]]] = {}
+    for plan_key, plan_scores in score_data.items():
+        if not plan_key.startswith("plan_") or not isinstance(plan_scores, dict):
+            continue
+        brief = slot_brief(int(plan_key.removeprefix("plan_")) - 1)
         for test_key in REQ_COUNTS:
             test_scores = plan_scores.get(test_key, {})
-            if isinstance(test_scores, dict):
-                totals[test_key] += sum(int(v) for v in test_scores.values())
-    return totals
+            if isinstance(test_scores, dict) and test_scores:
+                samples.setdefault(test_key, {}).setdefault(brief, []).append(
+                    sum(int(v) for v in test_scores.values()))
+    return {t: round(stratified_mean(samples[t]) * NUM_PLANS) for t in REQ_COUNTS if t in samples}
 
 
-def save_score_data(score_data: dict, iteration: int) -> None:
+def iteration_tag(iteration: int, candidate: int = 0) -> str:
+    """File name stem for an iteration; population candidates after the first get a suffix."""
+    return f"iter{iteration:04d}" + (f"_c{candidate}" if candidate else "")
+
+
+@tracing.traced("save_score_data", "io")
+def save_score_data(score_data: dict, iteration: int, candidate: int = 0) -> None:
     """Persist the full per-requirement score breakdown as JSON."""
     os.makedirs(SCORES_DIR, exist_ok=True)
-    path = os.path.join(SCORES_DIR, f"iter{iteration:04d}.json")
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(score_data, f, indent=2)
+    path = os.path.join(SCORES_DIR, f"{iteration_tag(iteration, candidate)}.json")
+    save(path, json.dumps(score_data, indent=2))
+    store.record_scores(results_db(), iteration, score_data, candidate)
+
+
+# Extra columns go after `analysis` so rows written before they existed still line up.
+RESULTS_EXTRA_COLUMNS = ["plans_evaluated", "candidate", "ci_low", "ci_high", *telemetry.ROLLUP_COLUMNS,
+                         "score_bound"]
+
 
+def results_header() -> str:
+    per_test_header = "\t".join(REQ_COUNTS)
+    extra = "".join(f"\t{c}" for c in RESULTS_EXTRA_COLUMNS)
+    return f"iteration\ttimestamp\tscore\tchampion_score\tstatus\tprompt_hash\tbrief\t{per_test_header}\tanalysis{extra}\n"
 
+
+def ensure_results_header(drop: tuple[int, int] | None = None) -> None:
+    """Create results.tsv, or rewrite it under the current header.
+
+    Values are moved to their columns by name, since an older header (or a
+    store.py export) may order or omit the extra columns differently. `drop`
+    removes any row already logged for that (iteration, candidate), so an
+    iteration resumed after appending it does not log it twice.
+    """
+    header = results_header()
+    if not os.path.exists(RESULTS_FILE):
+        save(RESULTS_FILE, header)
+        return
+    with open(RESULTS_FILE, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    old = lines[0].split("\t") if lines else []
+    rows = [dict(zip(old, line.split("\t"))) for line in lines[1:] if line]
+    kept = [row for row in rows if drop is None
+            or (row.get("iteration"), row.get("candidate") or "0") != tuple(map(str, drop))]
+    if lines and lines[0] + "\n" == header and len(kept) == len(rows):
+        return
+    new = header.rstrip("\n").split("\t")
+    save(RESULTS_FILE, header + "".join("\t".join(row.get(c, "") for c in new) + "\n" for row in kept))
+
+
+@tracing.traced("append_result", "io")
 def append_result(
     iteration: int,
-    score: int,
+    score: int | None,
     champion_score: int,
     status: str,
     prompt_hash: str,
     brief_name: str,
     analysis: str,
     test_totals: dict[str, int],
+    plans_evaluated: int = NUM_PLANS,
+    candidate: int = 0,
+    ci_low: int | None = None,
+    ci_high: int | None = None,
+    rollup: dict[str, int] | None = None,
+    score_bound: int | None = None,
 ) -> None:
-    write_header = not os.path.exists(RESULTS_FILE)
+    """Log one evaluation. A pre-rejected one has no `score`, only the `score_bound`
+    the pre-scorer proved it could not exceed."""
+    ts = datetime.datetime.now().isoformat()
+    safe_analysis = analysis.replace("\t", " ").replace("\n", " ")
+    store.record_iteration(results_db(), {
+        "iteration": iteration, "timestamp": ts, "score": score,
+        "champion_score": champion_score, "status": status, "prompt_hash": prompt_hash,
+        "brief": brief_name, "analysis": safe_analysis, "plans_evaluated": plans_evaluated,
+        "candidate": candidate, "ci_low": ci_low, "ci_high": ci_high, **(rollup or {}),
+        "score_bound": score_bound,
+    }, test_totals)
+
+    # results.tsv stays as an append-only export for tools that read it directly.
+    ensure_results_header(drop=(iteration, candidate))
     test_keys = list(REQ_COUNTS.keys())
     with open(RESULTS_FILE, "a", encoding="utf-8") as f:
-        if write_header:
-            per_test_header = "\t".join(test_keys)
-            f.write(f"iteration\ttimestamp\tscore\tchampion_score\tstatus\tprompt_hash\tbrief\t{per_test_header}\tanalysis\n")
-        ts = datetime.datetime.now().isoformat()
-        safe_analysis = analysis.replace("\t", " ").replace("\n", " ")
-        per_test_vals = "\t".join(str(test_totals.get(k, 0)) for k in test_keys)
-        f.write(f"{iteration}\t{ts}\t{score}\t{champion_score}\t{status}\t{prompt_hash}\t{brief_name}\t{per_test_vals}\t{safe_analysis}\n")
+        per_test_vals = "\t".join(str(test_totals.get(k, "")) for k in test_keys)
+        extra_vals = "\t".join("" if v is None else str(v) for v in [
+            plans_evaluated, candidate, ci_low, ci_high,
+            *((rollup or {}).get(c) for c in telemetry.ROLLUP_COLUMNS), score_bound,
+        ])
+        f.write(f"{iteration}\t{ts}\t{'' if score is None else score}\t{champion_score}\t{status}\t{prompt_hash}\t{brief_name}\t{per_test_vals}\t{safe_analysis}\t{extra_vals}\n")
 
 
 # ── skill.md sync ──────────────────────────────────────────────────────────────
 
+@tracing.traced("sync_to_skill_md", "io")
 def sync_to_skill_md(champion_prompt: str) -> None:
     """Replace the Step 2 generation content in SKILL.md with the champion prompt."""
     if not os.path.exists(SKILL_FILE):
@@ -350,82 +1313,291 @@ def sync_to_skill_md(champion_prompt: str) -> None:
 
 # ── save plans ─────────────────────────────────────────────────────────────────
 
-def save_plans(plans: list[str], iteration: int, score: int) -> None:
-    os.makedirs(PLANS_DIR, exist_ok=True)
-    for i, plan in enumerate(plans):
-        path = os.path.join(PLANS_DIR, f"iter{iteration:04d}_plan{i + 1}_score{score}.json")
-        save(path, plan)
+@tracing.traced("save_plans", "io")
+def save_plans(plans: list[str], iteration: int, score: int, candidate: int = 0, score_data: dict | None = None) -> None:
+    """Archive an evaluation's plans in the plan pack; identical plans are stored once."""
+    plan_scores = planpack.plan_totals(score_data or {})
+    plan_pack().add_many([
+        (iteration, candidate, i + 1, os.path.basename(brief_path), variant, plan, plan_scores.get(i + 1), score)
+        for i, (plan, (brief_path, variant)) in enumerate(zip(plans, generation_jobs(len(plans))))
+    ])
 
 
 # ── main loop ──────────────────────────────────────────────────────────────────
 
+def load_challengers(size: int) -> list[str]:
+    """prompt.md, then up to size-1 extra challengers from challengers/."""
+    if os.path.exists(PROMPT_FILE):
+        prompts = [load(PROMPT_FILE)]
+    elif os.path.exists(CHAMP_FILE):
+        prompts = [load(CHAMP_FILE)]
+        save(PROMPT_FILE, prompts[0])
+    else:
+        sys.exit("No prompt.md or champion_prompt.md found.")
+    for k in range(1, size):
+        path = os.path.join(CHALLENGERS_DIR, f"challenger_{k}.md")
+        if os.path.exists(path):
+            prompts.append(load(path))
+    return prompts
+
+
+@tracing.traced("save_challengers", "io")
+def save_challengers(prompts: list[str]) -> None:
+    """Write the next iteration's challengers, dropping any left over from a larger population."""
+    save(PROMPT_FILE, prompts[0])
+    if len(prompts) > 1:
+        os.makedirs(CHALLENGERS_DIR, exist_ok=True)
+    for k, prompt in enumerate(prompts[1:], start=1):
+        save(os.path.join(CHALLENGERS_DIR, f"challenger_{k}.md"), prompt)
+    if os.path.isdir(CHALLENGERS_DIR):
+        for name in os.listdir(CHALLENGERS_DIR):
+            match = re.fullmatch(r"challenger_(\d+)\.md", name)
+            if match and int(match.group(1)) >= len(prompts):
+                os.remove(os.path.join(CHALLENGERS_DIR, name))
+
+
+def score_candidate(
+    client: anthropic.Anthropic,
+    prompt: str,
+    plans: list[str],
+    eval_suite: str,
+    champion_score: int,
+    champion: dict[int, list[float]],
+    cache: DiskCache | None,
+    gen_cache: DiskCache | None,
+    concurrency: int,
+    max_plans: int,
+    batch: bool,
+    label: str = "",
+) -> dict:
+    """Prescore, then score one candidate's plans until the champion comparison is decided."""
+    prescores = prescore_plans(plans)
+    bound = prescore_upper_bound(prescores)
+    log(f"{label}Pre-scored {sum(p is not None for p in prescores)}/{NUM_PLANS} plans offline "
+        f"(upper bound {bound}/{MAX_SCORE}).")
+    prerejected = bound <= champion_score
+    decision = None
+    if prerejected:
+        log(f"{label}Deterministic checks alone rule out beating the champion — skipping scorer.")
+        score_data = prereject_score_data(prescores, champion_score)
+        total_score = None
+    elif batch:
+        log(f"{label}Scoring {NUM_PLANS} plans against {TOTAL_REQS} requirements (0–10 each) in one batch...")
+        total_score, score_data = score_plans(
+            client, plans, eval_suite, concurrency=concurrency, cache=cache,
+            prescores=prescores, batch=True,
+        )
+        decision = compare(plan_samples(score_data), champion, champion_score / NUM_PLANS, NUM_PLANS)
+        log(f"{label}{decision.summary()}")
+    else:
+        log(f"{label}Scoring plans round by round (one per brief) against {TOTAL_REQS} requirements "
+            f"(0–10 each) until decided, at most {max_plans} plans...")
+        total_score, score_data, decision = score_sequential(
+            client, prompt, plans, eval_suite, champion_score, champion, cache=cache,
+            gen_cache=gen_cache, prescores=prescores, concurrency=concurrency, max_plans=max_plans,
+        )
+    plans_evaluated = 0 if prerejected else sum(1 for k in score_data if k.startswith("plan_"))
+    log(f"{label}Score: {'unscored' if prerejected else total_score}/{MAX_SCORE} "
+        f"({plans_evaluated} plans scored) | Champion: {champion_score}/{MAX_SCORE}")
+    if prerejected:
+        status = "prereject"
+    elif decision.verdict == "accept":
+        status = "accept"
+    elif decision.verdict == "reject":
+        status = "aborted" if plans_evaluated < len(plans) else "discard"
+    else:
+        status = "undecided"
+    return {
+        "plans": plans,
+        "score_data": score_data,
+        "total_score": total_score,             # None when pre-rejected
+        "score_bound": bound if prerejected else None,
+        "plans_evaluated": plans_evaluated,
+        "status": status,
+        "ci": (max(0, decision.score_low), min(MAX_SCORE, decision.score_high))
+              if decision and decision.score_low is not None else (None, None),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Run one autoeval iteration.")
+    ap.add_argument("--concurrency", type=int, default=None,
+                    help="max parallel generation/scoring calls, shared by all candidates "
+                         f"(default: {GEN_CONCURRENCY} per candidate)")
+    ap.add_argument("--population", type=int, default=1, metavar="K",
+                    help="evaluate K challenger prompts per iteration and keep the best (default: 1)")
+    ap.add_argument("--max-plans", type=int, default=SEQ_MAX_PLANS,
+                    help="plans per challenger the sequential test may score before giving up "
+                         f"undecided (default: {SEQ_MAX_PLANS})")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="neither read nor write the on-disk generation/score caches")
+    ap.add_argument("--batch", action="store_true",
+                    help="run generation and scoring through the Message Batches API "
+                         "(cheaper, slower; disables early abort)")
+    ap.add_argument("--no-cascade", action="store_true",
+                    help=f"score every requirement with {SCORER_MODEL} instead of a {CASCADE_MODEL} "
+                         "first pass that escalates only contested requirements")
+    ap.add_argument("--trace", action="store_true",
+                    help="record timing spans and write traces/iterNNNN.json (Chrome trace format, "
+                         "open in ui.perfetto.dev)")
+    ap.add_argument("--refresh", action="store_true",
+                    help="ignore cached generations/scores but store the fresh results")
+    args = ap.parse_args()
+    if args.population < 1:
+        ap.error("--population must be at least 1")
+    if args.concurrency is None:
+        args.concurrency = GEN_CONCURRENCY * args.population
+    return args
+
+
 def main() -> None:
+    global JOURNAL, AGREEMENT, LEDGER
+    args = parse_args()
+    if args.trace:
+        tracing.start()
+        tracing.stage("setup")
     client = make_client()
     eval_suite = load(EVAL_FILE)
-    champion_score = load_champion_score()
-    iteration = get_iteration()
 
     brief_name = "all_3"
 
-    # Load challenger prompt: use prompt.md if it exists, else fall back to champion
-    if os.path.exists(PROMPT_FILE):
-        current_prompt = load(PROMPT_FILE)
-    elif os.path.exists(CHAMP_FILE):
-        current_prompt = load(CHAMP_FILE)
-        save(PROMPT_FILE, current_prompt)
+    # An interrupted iteration resumes with the state it started from; its
+    # journal replays every generation, score and improvement already paid for.
+    JOURNAL = Journal.unfinished()
+    if JOURNAL is not None:
+        iteration = JOURNAL.header["iteration"]
+        champion_score = JOURNAL.header["champion_score"]
+        prompts = JOURNAL.header["prompts"]
+        log(f"Resuming interrupted iteration {iteration} from its journal "
+            f"({len(JOURNAL)} completed step(s)).")
     else:
-        sys.exit("No prompt.md or champion_prompt.md found.")
-
-    prompt_hash = hashlib.md5(current_prompt.encode()).hexdigest()[:8]
-    log(f"Iteration {iteration} | Briefs: all 3 | Champion: {champion_score}/{MAX_SCORE} | Prompt: {prompt_hash}")
-
-    # ── Step 1: Generate 3 plans per brief (9 total) ──────────────────────────
-    log(f"Generating {NUM_PLANS_PER_BRIEF} plans × {len(BRIEFS)} briefs = {NUM_PLANS} total...")
-    plans: list[str] = []
-    plan_num = 0
-    for brief_path in BRIEFS:
-        brief = load(brief_path)
-        brief_label = os.path.basename(brief_path)
-        for j in range(NUM_PLANS_PER_BRIEF):
-            plan_num += 1
-            log(f"  Plan {plan_num}/{NUM_PLANS} ({brief_label}, variant {j + 1})...")
-            plans.append(generate_plan(client, current_prompt, brief))
-
-    # ── Step 2: Score all plans ────────────────────────────────────────────────
-    log("Scoring 5 plans against 49 requirements (0–10 each)...")
-    total_score, score_data = score_plans(client, plans, eval_suite)
-    analysis = score_data.get("analysis", "")
-    log(f"Score: {total_score}/{MAX_SCORE} | Champion: {champion_score}/{MAX_SCORE}")
-    log(f"Analysis: {analysis[:200]}")
+        champion_score = load_champion_score()
+        iteration = get_iteration()
+        # Candidate 0 is prompt.md; a population adds challengers/challenger_k.md.
+        prompts = load_challengers(args.population)
+        JOURNAL = Journal.start(iteration, {"champion_score": champion_score, "prompts": prompts})
+    LEDGER = Ledger(iteration)
+    tracing.set_name(f"iter{iteration:04d}")
+    prompt_hashes = [hashlib.md5(p.encode()).hexdigest()[:8] for p in prompts]
+    for prompt_hash, prompt in zip(prompt_hashes, prompts):
+        analytics.archive_prompt(prompt_hash, prompt)
+    labels = [f"[c{k}] " if len(prompts) > 1 else "" for k in range(len(prompts))]
+    log(f"Iteration {iteration} | Briefs: all 3 | Champion: {champion_score}/{MAX_SCORE} | "
+        f"Prompt: {', '.join(prompt_hashes)}")
+    # The concurrency budget is split evenly, so K candidates run side by side
+    # in roughly the wall time of one.
+    share = max(1, args.concurrency // len(prompts))
+
+    # ── Step 1: Generate 3 plans per brief (9 total) per candidate ────────────
+    tracing.stage("generate")
+    gen_cache = JournaledCache(JOURNAL, "generation", None if args.no_cache else
+                               DiskCache("generations", GEN_CACHE_BYTES, refresh=args.refresh))
+    if args.batch:
+        log(f"Generating {NUM_PLANS} plans × {len(prompts)} prompt(s) via Message Batches...")
+        batch_plans = generate_plans_batch(client, {f"c{k}": p for k, p in enumerate(prompts)}, gen_cache,
+                                           {f"c{k}": {"candidate": k} for k in range(len(prompts))})
+        all_plans = [batch_plans[f"c{k}"] for k in range(len(prompts))]
+    else:
+        log(f"Generating {NUM_PLANS_PER_BRIEF} plans × {len(BRIEFS)} briefs = {NUM_PLANS} total "
+            f"× {len(prompts)} prompt(s) ({share} in parallel each)...")
+        with ThreadPoolExecutor(max_workers=len(prompts)) as pool:
+            all_plans = list(pool.map(
+                lambda k: telemetry.run_tagged({"candidate": k}, generate_plans, client, prompts[k], share, gen_cache),
+                range(len(prompts)),
+            ))
+    log(f"Generation cache: {gen_cache.stats()}")
+    log(f"Plan validation: {REPAIRS.summary()}")
+
+    # ── Step 2: Score every candidate's plans ──────────────────────────────────
+    tracing.stage("score")
+    score_cache = JournaledCache(JOURNAL, "score", None if args.no_cache else
+                                 DiskCache("scores", SCORE_CACHE_BYTES, refresh=args.refresh))
+    if not (args.no_cascade or args.batch):
+        AGREEMENT = AgreementTracker()
+        AGREEMENT.load(store.scorer_agreement(results_db()))
+        log(f"Cascade scoring: {AGREEMENT.summary()}")
+    champion = champion_samples()
+    with ThreadPoolExecutor(max_workers=len(prompts)) as pool:
+        results = list(pool.map(
+            lambda k: telemetry.run_tagged(
+                {"candidate": k}, score_candidate, client, prompts[k], all_plans[k], eval_suite,
+                champion_score, champion, score_cache, gen_cache, share, args.max_plans, args.batch, labels[k],
+            ),
+            range(len(prompts)),
+        ))
+    log(f"Score cache: {score_cache.stats()}")
+    if AGREEMENT is not None:
+        store.record_agreement(results_db(), AGREEMENT.drain())
+        log(f"Cascade scoring: {AGREEMENT.summary()}")
 
     # ── Step 3: Save plans and score breakdown to disk ────────────────────────
-    save_plans(plans, iteration, total_score)
-    save_score_data(score_data, iteration)
-    test_totals = compute_test_totals(score_data)
-    log("Per-test scores: " + " | ".join(f"{k}:{test_totals[k]}" for k in REQ_COUNTS))
+    tracing.stage("save")
+    for k, result in enumerate(results):
+        log(f"{labels[k]}Analysis: {result['score_data'].get('analysis', '')[:200]}")
+        # A pre-rejected candidate's plans have no totals of their own; the pack
+        # only needs its bound to tell this evaluation from a re-run of the slot.
+        if result["status"] == "prereject":
+            save_plans(result["plans"], iteration, result["score_bound"], k)
+        else:
+            save_plans(result["plans"], iteration, result["total_score"], k, result["score_data"])
+        save_score_data(result["score_data"], iteration, k)
+        result["test_totals"] = compute_test_totals(result["score_data"])
+        log(f"{labels[k]}Per-test scores: "
+            + " | ".join(f"{t}:{result['test_totals'].get(t, '-')}" for t in REQ_COUNTS))
 
     # ── Step 4: Accept / reject ────────────────────────────────────────────────
-    if total_score > champion_score:
-        status = "keep"
-        log(f"IMPROVEMENT: {champion_score} → {total_score}. Saving new champion.")
-        save(CHAMP_FILE, current_prompt)
-        champion_score = total_score
-        sync_to_skill_md(current_prompt)
+    tracing.stage("accept/reject")
+    # Only a challenger the sequential test confidently puts above the champion
+    # can win; among several, the highest score does.
+    contenders = [k for k, r in enumerate(results) if r["status"] == "accept"]
+    winner = max(contenders, key=lambda k: results[k]["total_score"], default=None)
+    for k, result in enumerate(results):
+        if k == winner:
+            result["status"] = "keep"
+        elif result["status"] == "accept":
+            result["status"] = "discard"
+    if winner is not None:
+        best = results[winner]
+        log(f"IMPROVEMENT: {champion_score} → {best['total_score']}. Saving new champion"
+            + (f" (candidate {winner})." if len(prompts) > 1 else "."))
+        base_prompt = prompts[winner]
+        save(CHAMP_FILE, base_prompt)
+        champion_score = best["total_score"]
+        sync_to_skill_md(base_prompt)
     else:
-        status = "discard"
         log("No improvement. Reverting to champion for next improvement base.")
-        # Improve from champion, not the failed challenger
-        if os.path.exists(CHAMP_FILE):
-            current_prompt = load(CHAMP_FILE)
-
-    # ── Step 5: Generate improved prompt for next iteration ───────────────────
-    log("Generating improved prompt for next iteration...")
-    improved = improve_prompt(client, current_prompt, plans, score_data, eval_suite, champion_score)
-    save(PROMPT_FILE, improved)
-    log("Saved improved prompt.md.")
+        # Improve from champion, not a failed challenger, using the best evidence we
+        # have: a pre-rejected candidate only has its deterministic checks to offer.
+        scored = [r for r in results if r["total_score"] is not None] or results
+        best = max(scored, key=lambda r: r["total_score"] or 0)
+        base_prompt = load(CHAMP_FILE) if os.path.exists(CHAMP_FILE) else prompts[results.index(best)]
+
+    # ── Step 5: Generate improved prompt(s) for next iteration ────────────────
+    tracing.stage("improve")
+    history = score_history(iteration, prompts)
+    if history:
+        log(f"Score history:\n{history}")
+    log(f"Generating {args.population} improved prompt(s) for next iteration...")
+    sample = plan_pack().weakest(iteration, results.index(best)) or best["plans"]
+    improved = improve_population(
+        client, base_prompt, sample, best["score_data"], eval_suite, champion_score,
+        args.population, history,
+    )
+    save_challengers(improved)
+    log("Saved improved prompt.md" + (f" and {len(improved) - 1} challenger(s)." if len(improved) > 1 else "."))
 
     # ── Step 6: Log result ─────────────────────────────────────────────────────
-    append_result(iteration, total_score, champion_score, status, prompt_hash, brief_name, analysis, test_totals)
+    tracing.stage("log")
+    for k, result in enumerate(results):
+        if JOURNAL.get("result", str(k)) is not None:
+            continue  # already appended before an interruption
+        append_result(iteration, result["total_score"], champion_score, result["status"], prompt_hashes[k],
+                      brief_name, result["score_data"].get("analysis", ""), result["test_totals"],
+                      result["plans_evaluated"], k, *result["ci"], LEDGER.rollup(k), result["score_bound"])
+        JOURNAL.put("result", str(k), result["status"])
+    JOURNAL.close()
+    log(f"Token usage — {USAGE.summary()}")
+    log(f"API calls — {LEDGER.summary()}")
     log(f"Done. Results appended to results.tsv.")
 
 
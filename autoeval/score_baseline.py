@@ -13,48 +13,58 @@ import sys
 # Reuse helpers from run.py
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from run import (
-    BASE, EVAL_FILE, RESULTS_FILE, SCORES_DIR, CHAMP_FILE, PROMPT_FILE,
-    NUM_PLANS, REQ_COUNTS,
-    load, save, log, make_client,
+    BASE, EVAL_FILE, SCORES_DIR, CHAMP_FILE, PROMPT_FILE,
+    MAX_PLAN_SCORE, MAX_SCORE, NUM_PLANS, REQ_COUNTS, SCORE_CACHE_BYTES,
+    load, save, log, make_client, results_db, plan_pack,
     score_plans, compute_test_totals, save_score_data, append_result,
 )
+from cache import DiskCache
+from planpack import BASELINE, plan_totals
+from prescore import prescore_plans
+from store import has_iteration
 
-BASELINE_PLAN = os.path.join(BASE, "plans", "baseline.json")
+BASELINE_PLAN = os.path.join(BASE, "plans", BASELINE)
 
 
 def main() -> None:
-    if not os.path.exists(BASELINE_PLAN):
-        sys.exit(f"Baseline plan not found: {BASELINE_PLAN}")
+    # The loose file is the input; once migrated it lives in the plan pack.
+    baseline_text = load(BASELINE_PLAN) if os.path.exists(BASELINE_PLAN) else plan_pack().get(0, 0, 1)
+    if baseline_text is None:
+        sys.exit(f"Baseline plan not found: {BASELINE_PLAN} (nor in the plan pack)")
 
     # Check we haven't already seeded
-    if os.path.exists(RESULTS_FILE):
-        with open(RESULTS_FILE) as f:
-            lines = f.readlines()
-        for line in lines[1:]:
-            if line.startswith("0\t"):
-                log("Baseline (iteration 0) already in results.tsv — skipping.")
-                return
+    if has_iteration(results_db(), 0):
+        log("Baseline (iteration 0) already recorded — skipping.")
+        return
 
     client = make_client()
     eval_suite = load(EVAL_FILE)
-    baseline_text = load(BASELINE_PLAN)
 
     log(f"Scoring baseline plan (replicated {NUM_PLANS}× to fill all plan slots)...")
 
-    # Replicate baseline NUM_PLANS times so the scorer uses the full rubric
+    # Replicate baseline NUM_PLANS times so the scorer uses the full rubric;
+    # identical slots are scored once and reused from the score cache on re-runs.
     plans = [baseline_text] * NUM_PLANS
-    total_score, score_data = score_plans(client, plans, eval_suite)
+    total_score, score_data = score_plans(
+        client, plans, eval_suite,
+        cache=DiskCache("scores", SCORE_CACHE_BYTES), prescores=prescore_plans(plans),
+    )
     analysis = score_data.get("analysis", "")
     test_totals = compute_test_totals(score_data)
 
     single_plan_score = total_score // NUM_PLANS
-    log(f"Baseline single-plan score: {single_plan_score}/490")
-    log(f"Baseline aggregate ({NUM_PLANS} plans): {total_score}/{NUM_PLANS * 49 * 10}")
+    log(f"Baseline single-plan score: {single_plan_score}/{MAX_PLAN_SCORE}")
+    log(f"Baseline aggregate ({NUM_PLANS} plans): {total_score}/{MAX_SCORE}")
     log(f"Analysis: {analysis}")
     log("Per-test: " + " | ".join(f"{k}:{test_totals[k]}" for k in REQ_COUNTS))
 
     # Save score data
     save_score_data(score_data, 0)
+    plan_scores = plan_totals(score_data)
+    plan_pack().add_many([  # stored once, listed in every slot it was scored in
+        (0, 0, plan, BASELINE, plan - 1, baseline_text, plan_scores.get(plan), total_score)
+        for plan in range(1, NUM_PLANS + 1)
+    ])
 
     # Write iteration 0 to results.tsv
     append_result(
@@ -73,7 +83,7 @@ def main() -> None:
         save(CHAMP_FILE, load(PROMPT_FILE))
         log("Saved current prompt.md as initial champion_prompt.md.")
 
-    log(f"Done. Baseline score {total_score}/{NUM_PLANS * 49 * 10} written as iteration 0.")
+    log(f"Done. Baseline score {total_score}/{MAX_SCORE} written as iteration 0.")
     log("Run `python autoeval/run.py` to start improving.")
 
 
@@ -0,0 +1,94 @@
+"""
+autoeval/sequential.py — Sequential challenger-vs-champion test over per-plan scores.
+
+Plan scores are grouped by brief (stratum), since briefs differ in difficulty
+far more than plans for the same brief do. The estimate is the difference of
+equally weighted per-brief means, with a pooled within-brief variance; the run
+loop adds plans until the interval for that difference excludes zero or the
+plan budget runs out.
+
+The interval uses a Pocock-style constant boundary rather than 1.96, so
+looking after every round of plans does not inflate the false-accept rate.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+# Pocock boundary for α = 0.05 (two-sided) over about five interim looks.
+SEQ_Z = 2.41
+# Floor on the per-plan standard deviation: historical within-brief spread is
+# 5–25 points, and a few identical plans must not look like zero noise.
+MIN_PLAN_SD = 5.0
+
+
+def stratified_mean(samples: dict[int, list[float]]) -> float:
+    means = [sum(v) / len(v) for v in samples.values() if v]
+    return sum(means) / len(means) if means else 0.0
+
+
+def stratified_variance(samples: dict[int, list[float]]) -> float | None:
+    """Variance of the stratified mean, or None until every brief has two plans.
+
+    Within-brief variance is pooled across briefs, which is what makes a
+    decision possible from only two or three plans per brief.
+    """
+    strata = [v for v in samples.values() if v]
+    if not strata or any(len(v) < 2 for v in strata):
+        return None
+    df = sum(len(v) - 1 for v in strata)
+    ss = sum(sum((x - sum(v) / len(v)) ** 2 for x in v) for v in strata)
+    pooled = max(ss / df, MIN_PLAN_SD ** 2)
+    k = len(strata)
+    return pooled * sum(1 / len(v) for v in strata) / (k * k)
+
+
+@dataclass
+class Decision:
+    diff: float             # challenger − champion, per plan
+    diff_low: float
+    diff_high: float
+    score_low: int | None   # challenger score interval on the NUM_PLANS-plan scale
+    score_high: int | None
+    verdict: str | None     # "accept", "reject", or None while undecided
+
+    def summary(self) -> str:
+        state = self.verdict or "undecided"
+        if self.score_low is None:
+            return f"diff {self.diff:+.1f}/plan, too few plans for an interval → {state}"
+        return (f"diff {self.diff:+.1f}/plan [{self.diff_low:+.1f}, {self.diff_high:+.1f}], "
+                f"score CI [{self.score_low}, {self.score_high}] → {state}")
+
+
+def compare(
+    challenger: dict[int, list[float]],
+    champion: dict[int, list[float]] | None,
+    champion_mean: float,
+    scale: int,
+    z: float = SEQ_Z,
+) -> Decision:
+    """Decide whether the challenger's per-plan mean beats the champion's.
+
+    `champion` holds the champion's own per-brief plan scores when they are
+    known; otherwise `champion_mean` is treated as exact.
+    """
+    mean = stratified_mean(challenger)
+    var = stratified_variance(challenger)
+    base = champion_mean
+    champion_var = 0.0
+    if champion:
+        shared = {b: v for b, v in champion.items() if b in challenger}
+        base = stratified_mean(shared) if shared else champion_mean
+        champion_var = stratified_variance(shared) or 0.0
+    diff = mean - base
+    if var is None:
+        return Decision(diff, -math.inf, math.inf, None, None, None)
+    half = z * math.sqrt(var + champion_var)
+    score_half = z * math.sqrt(var)
+    verdict = "accept" if diff - half > 0 else "reject" if diff + half < 0 else None
+    return Decision(
+        diff, diff - half, diff + half,
+        round((mean - score_half) * scale), round((mean + score_half) * scale),
+        verdict,
+    )
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+autoeval/store.py — SQLite store for iteration results and per-requirement scores.
+
+results.db holds one row per evaluated prompt (an iteration's candidates share
+its number), per-test totals and every plan's requirement scores, indexed so the
+champion and next-iteration lookups are single index probes however long the
+history gets. It also keeps the cascade scorer's per-requirement agreement
+counts, mirrored to agreement.tsv on every update.
+
+results.db is a local cache and is not committed: results.tsv, scores/ and
+agreement.tsv are. A fresh database is filled from them on first open, and an
+existing one picks up rows results.tsv gained since (after a pull, say). Run
+directly to redo that import or rewrite the TSV from the database:
+
+  python autoeval/store.py import
+  python autoeval/store.py export
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+import sqlite3
+
+BASE           = os.path.dirname(os.path.abspath(__file__))
+DB_FILE        = os.path.join(BASE, "results.db")
+RESULTS_FILE   = os.path.join(BASE, "results.tsv")
+SCORES_DIR     = os.path.join(BASE, "scores")
+AGREEMENT_FILE = os.path.join(BASE, "agreement.tsv")
+
+# Fixed iteration columns, in results.tsv order (the per-test totals sit
+# between `brief` and `analysis` there, and live in test_totals here).
+HEAD_COLUMNS = ["iteration", "timestamp", "score", "champion_score", "status", "prompt_hash", "brief"]
+INT_COLUMNS  = {"iteration", "score", "champion_score"}
+NULLABLE     = {"score"}   # empty for a candidate the pre-scorer rejected unscored
+
+# Integer columns results.tsv gained later are added with ALTER TABLE in TSV
+# order; these need a default because older rows have no value for them.
+COLUMN_DEFAULTS = {"candidate": "NOT NULL DEFAULT 0"}
+
+SCHEMA_VERSION = 3  # 2: iterations keyed by (iteration, candidate); 3: score may be NULL
+
+# The tables filled from results.tsv and scores/; a rebuild drops only these, so
+# scorer_agreement (merged from agreement.tsv instead) is kept.
+DROP_IMPORTED = ("DROP TABLE IF EXISTS iterations; DROP TABLE IF EXISTS test_totals; "
+                 "DROP TABLE IF EXISTS req_scores;")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS iterations (
+    iteration      INTEGER NOT NULL,
+    timestamp      TEXT NOT NULL,
+    score          INTEGER,
+    champion_score INTEGER NOT NULL,
+    status         TEXT NOT NULL,
+    prompt_hash    TEXT NOT NULL,
+    brief          TEXT NOT NULL,
+    analysis       TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS iterations_score ON iterations (score);
+CREATE INDEX IF NOT EXISTS iterations_status ON iterations (status, iteration);
+CREATE INDEX IF NOT EXISTS iterations_prompt ON iterations (prompt_hash);
+
+CREATE TABLE IF NOT EXISTS test_totals (
+    iteration INTEGER NOT NULL,
+    candidate INTEGER NOT NULL,
+    test      TEXT NOT NULL,
+    total     INTEGER NOT NULL,
+    PRIMARY KEY (iteration, candidate, test)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS test_totals_history ON test_totals (test, iteration);
+
+CREATE TABLE IF NOT EXISTS req_scores (
+    iteration INTEGER NOT NULL,
+    candidate INTEGER NOT NULL,
+    plan      INTEGER NOT NULL,
+    test      TEXT NOT NULL,
+    req       TEXT NOT NULL,
+    score     INTEGER NOT NULL,
+    PRIMARY KEY (iteration, candidate, plan, test, req)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS req_scores_history ON req_scores (test, req, iteration);
+
+CREATE TABLE IF NOT EXISTS scorer_agreement (
+    test     TEXT NOT NULL,
+    req      TEXT NOT NULL,
+    compared INTEGER NOT NULL,
+    agreed   INTEGER NOT NULL,
+    PRIMARY KEY (test, req)
+) WITHOUT ROWID;
+"""
+
+
+def _test_order(test: str) -> int:
+    return int(test.rsplit("_", 1)[-1])
+
+
+def _tsv_extra_columns() -> list[str]:
+    """Columns of results.tsv after `analysis`, in file order."""
+    if not os.path.exists(RESULTS_FILE):
+        return []
+    with open(RESULTS_FILE, encoding="utf-8") as f:
+        header = f.readline().rstrip("\n").split("\t")
+    return header[header.index("analysis") + 1:] if "analysis" in header else []
+
+
+def _ensure_columns(conn: sqlite3.Connection, extra_columns: list[str]) -> None:
+    """Add integer columns that results.tsv gained after the table was created."""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(iterations)")}
+    for column in extra_columns:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE iterations ADD COLUMN {column} INTEGER "
+                         f"{COLUMN_DEFAULTS.get(column, '')}")
+            existing.add(column)
+
+
+def connect(path: str = DB_FILE, extra_columns: list[str] | None = None) -> sqlite3.Connection:
+    """Open (creating and importing, if new or outdated) the results database."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    has_tables = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'iterations'"
+    ).fetchone() is not None
+    fresh = not has_tables or version < SCHEMA_VERSION
+    if fresh:
+        # Older layouts are rebuilt from results.tsv, which is always kept in step.
+        conn.executescript(DROP_IMPORTED)
+    conn.executescript(SCHEMA)
+    _ensure_columns(conn, [*_tsv_extra_columns(), *(extra_columns or []), "candidate"])
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS iterations_key ON iterations (iteration, candidate)")
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    if os.path.exists(RESULTS_FILE) and (fresh or _tsv_keys() - _db_keys(conn)):
+        import_legacy(conn)
+    _merge_agreement(conn)
+    return conn
+
+
+def _tsv_keys() -> set[tuple[int, int]]:
+    """(iteration, candidate) of every results.tsv row."""
+    with open(RESULTS_FILE, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+        return {(int(r["iteration"]), int(r.get("candidate") or 0))
+                for r in reader if (r.get("iteration") or "").isdigit()}
+
+
+def _db_keys(conn: sqlite3.Connection) -> set[tuple[int, int]]:
+    return {tuple(r) for r in conn.execute("SELECT iteration, candidate FROM iterations")}
+
+
+def _merge_agreement(conn: sqlite3.Connection) -> None:
+    """Adopt agreement.tsv counts that are ahead of the database's (counts only grow)."""
+    if not os.path.exists(AGREEMENT_FILE):
+        return
+    with open(AGREEMENT_FILE, encoding="utf-8", newline="") as f:
+        rows = [(r["test"], r["req"], int(r["compared"]), int(r["agreed"]))
+                for r in csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)]
+    with conn:
+        conn.executemany(
+            "INSERT INTO scorer_agreement (test, req, compared, agreed) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (test, req) DO UPDATE SET compared = excluded.compared, agreed = excluded.agreed "
+            "WHERE excluded.compared > compared",
+            rows,
+        )
+
+# ── queries ────────────────────────────────────────────────────────────────────
+
+def champion_score(conn: sqlite3.Connection) -> int:
+    """Every row records the champion as it stood after that iteration, so read the latest."""
+    row = conn.execute(
+        "SELECT champion_score FROM iterations ORDER BY iteration DESC, candidate DESC LIMIT 1"
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def champion_plan_scores(conn: sqlite3.Connection) -> dict[int, int]:
+    """plan -> total points for the plans that made the current champion."""
+    row = conn.execute(
+        "SELECT iteration, candidate FROM iterations WHERE status IN ('keep', 'baseline') "
+        "ORDER BY iteration DESC LIMIT 1"
+    ).fetchone()
+    if row is None:
+        return {}
+    return dict(conn.execute(
+        "SELECT plan, SUM(score) FROM req_scores WHERE iteration = ? AND candidate = ? GROUP BY plan",
+        tuple(row),
+    ).fetchall())
+
+
+def next_iteration(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT MAX(iteration) FROM iterations").fetchone()
+    return 1 if row[0] is None else row[0] + 1
+
+
+def has_iteration(conn: sqlite3.Connection, iteration: int) -> bool:
+    return conn.execute("SELECT 1 FROM iterations WHERE iteration = ?", (iteration,)).fetchone() is not None
+
+
+def test_history(conn: sqlite3.Connection, test: str) -> list[tuple[int, int, int]]:
+    """(iteration, candidate, total) for one test across all iterations."""
+    return [tuple(r) for r in conn.execute(
+        "SELECT iteration, candidate, total FROM test_totals WHERE test = ? ORDER BY iteration, candidate",
+        (test,),
+    )]
+
+
+def tests(conn: sqlite3.Connection) -> list[str]:
+    return sorted((r[0] for r in conn.execute("SELECT DISTINCT test FROM test_totals")), key=_test_order)
+
+
+def load_iterations(conn: sqlite3.Connection) -> list[dict[str, str]]:
+    """Every iteration as a results.tsv-style row (string values, per-test totals inlined)."""
+    totals: dict[tuple[int, int], dict[str, int]] = {}
+    for r in conn.execute("SELECT iteration, candidate, test, total FROM test_totals"):
+        totals.setdefault((r["iteration"], r["candidate"]), {})[r["test"]] = r["total"]
+    rows = []
+    for r in conn.execute("SELECT * FROM iterations ORDER BY iteration, candidate"):
+        row = {k: "" if r[k] is None else str(r[k]) for k in r.keys()}
+        row.update({t: str(v) for t, v in totals.get((r["iteration"], r["candidate"]), {}).items()})
+        rows.append(row)
+    return rows
+
+
+def scorer_agreement(conn: sqlite3.Connection) -> dict[tuple[str, str], tuple[int, int]]:
+    """(test, req) -> (compared, agreed) counts of cheap-vs-expensive scores."""
+    return {(r["test"], r["req"]): (r["compared"], r["agreed"])
+            for r in conn.execute("SELECT * FROM scorer_agreement")}
+
+# ── writes ─────────────────────────────────────────────────────────────────────
+
+def record_iteration(
+    conn: sqlite3.Connection,
+    row: dict,
+    test_totals: dict[str, int],
+) -> None:
+    """Insert (or replace) one iteration/candidate row and its per-test totals."""
+    row = {"candidate": 0, **row}
+    columns = list(row)
+    with conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO iterations ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            [row[c] for c in columns],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO test_totals (iteration, candidate, test, total) VALUES (?, ?, ?, ?)",
+            [(row["iteration"], row["candidate"], t, int(v)) for t, v in test_totals.items()],
+        )
+
+
+def record_scores(conn: sqlite3.Connection, iteration: int, score_data: dict, candidate: int = 0) -> None:
+    """Insert every plan_N/test_N/req score of one candidate's score data."""
+    values = []
+    for plan_key, plan_scores in score_data.items():
+        if not plan_key.startswith("plan_") or not isinstance(plan_scores, dict):
+            continue
+        plan = int(plan_key.removeprefix("plan_"))
+        for test, reqs in plan_scores.items():
+            if not isinstance(reqs, dict):
+                continue
+            for req, score in reqs.items():
+                try:
+                    values.append((iteration, candidate, plan, test, req, int(score)))
+                except (TypeError, ValueError):
+                    pass
+    with conn:
+        conn.execute("DELETE FROM req_scores WHERE iteration = ? AND candidate = ?", (iteration, candidate))
+        conn.executemany(
+            "INSERT INTO req_scores (iteration, candidate, plan, test, req, score) VALUES (?, ?, ?, ?, ?, ?)",
+            values,
+        )
+
+
+def record_agreement(conn: sqlite3.Connection, counts: dict[tuple[str, str], tuple[int, int]]) -> None:
+    """Add newly recorded comparisons to the per-requirement agreement counts."""
+    with conn:
+        conn.executemany(
+            "INSERT INTO scorer_agreement (test, req, compared, agreed) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (test, req) DO UPDATE SET compared = compared + excluded.compared, "
+            "agreed = agreed + excluded.agreed",
+            [(test, req, compared, agreed) for (test, req), (compared, agreed) in counts.items()],
+        )
+    lines = ["test\treq\tcompared\tagreed"] + [
+        f"{test}\t{req}\t{compared}\t{agreed}"
+        for (test, req), (compared, agreed) in sorted(scorer_agreement(conn).items())
+    ]
+    tmp = f"{AGREEMENT_FILE}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, AGREEMENT_FILE)
+
+# ── tsv import / export ────────────────────────────────────────────────────────
+
+def import_legacy(conn: sqlite3.Connection) -> int:
+    """Load results.tsv and scores/iter*.json into the database; returns rows imported."""
+    count = 0
+    with open(RESULTS_FILE, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+        extra = [c for c in reader.fieldnames or [] if c not in HEAD_COLUMNS
+                 and c != "analysis" and not re.fullmatch(r"test_\d+", c)]
+        _ensure_columns(conn, extra)
+        for line in reader:
+            try:
+                row: dict = {c: None if c in NULLABLE and not line[c]
+                             else int(line[c]) if c in INT_COLUMNS else line[c] for c in HEAD_COLUMNS}
+            except (TypeError, ValueError):
+                continue
+            row["analysis"] = line.get("analysis") or ""
+            for c in extra:
+                row[c] = int(line[c]) if (line.get(c) or "").isdigit() else None
+            if row.get("candidate") is None:
+                row["candidate"] = 0
+            totals = {k: int(v) for k, v in line.items()
+                      if k and re.fullmatch(r"test_\d+", k) and (v or "").isdigit()}
+            record_iteration(conn, row, totals)
+            count += 1
+    for path in sorted(glob.glob(os.path.join(SCORES_DIR, "iter*.json"))):
+        match = re.search(r"iter(\d+)(?:_c(\d+))?\.json$", path)
+        if not match:
+            continue
+        with open(path, encoding="utf-8") as f:
+            record_scores(conn, int(match.group(1)), json.load(f), int(match.group(2) or 0))
+    return count
+
+
+def export_tsv(conn: sqlite3.Connection, path: str = RESULTS_FILE) -> None:
+    """Rewrite results.tsv from the database."""
+    test_keys = tests(conn)
+    extra = [row[1] for row in conn.execute("PRAGMA table_info(iterations)")
+             if row[1] not in HEAD_COLUMNS and row[1] != "analysis"]
+    lines = ["\t".join([*HEAD_COLUMNS, *test_keys, "analysis", *extra])]
+    for row in load_iterations(conn):
+        lines.append("\t".join([*(row[c] for c in HEAD_COLUMNS),
+                                *(row.get(t, "0") for t in test_keys),
+                                row["analysis"], *(row[c] for c in extra)]))
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Manage the autoeval results database.")
+    ap.add_argument("command", choices=["import", "export"],
+                    help="import: rebuild results.db from results.tsv + scores/ "
+                         "(the scorer agreement counts are kept); "
+                         "export: rewrite results.tsv from results.db")
+    args = ap.parse_args()
+
+    if args.command == "import":
+        if not os.path.exists(RESULTS_FILE):
+            raise SystemExit(f"{RESULTS_FILE} not found.")
+        if os.path.exists(DB_FILE):
+            old = sqlite3.connect(DB_FILE)
+            old.executescript(DROP_IMPORTED)
+            old.close()
+        conn = connect(DB_FILE)
+        count = conn.execute("SELECT COUNT(*) FROM iterations").fetchone()[0]
+        print(f"Imported {count} iteration(s) into {DB_FILE}; champion {champion_score(conn)}.")
+    else:
+        export_tsv(connect(DB_FILE))
+        print(f"Wrote {RESULTS_FILE}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+autoeval/telemetry.py — Per-call API ledger: latency, tokens, cost and stop reason.
+
+Every model call appends one JSON line to telemetry/iterNNNN.jsonl. Calls are
+attributed to a candidate and plan slot through tag(), whose context fan_out()
+carries into worker threads. rollup() sums an iteration's ledger, including
+calls made before an interruption, into the results.tsv telemetry columns.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import datetime
+import json
+import os
+import threading
+from typing import Any
+
+TELEMETRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "telemetry")
+
+# USD per million tokens (input, output). Cache writes cost 1.25× input, cache
+# reads 0.1× input, and Message Batches half of everything.
+PRICES = {
+    "claude-opus-4-6":           (5.00, 25.00),
+    "claude-haiku-4-5-20251001": (1.00, 5.00),
+}
+CACHE_WRITE_RATE = 1.25
+CACHE_READ_RATE  = 0.10
+BATCH_RATE       = 0.50
+
+# Per-iteration rollups appended to results.tsv, in column order.
+ROLLUP_COLUMNS = ["api_calls", "input_tokens", "output_tokens", "cached_tokens",
+                  "cost_cents", "api_seconds", "max_tokens_hits"]
+
+_TAGS: contextvars.ContextVar[dict] = contextvars.ContextVar("telemetry_tags", default={})
+
+
+@contextlib.contextmanager
+def tag(**fields: Any):
+    """Attach fields (candidate, slot, ...) to every call made inside the block."""
+    token = _TAGS.set({**_TAGS.get(), **fields})
+    try:
+        yield
+    finally:
+        _TAGS.reset(token)
+
+
+def run_tagged(fields: dict, fn, *args: Any) -> Any:
+    """fn(*args) with fields attached; for pool.map, which does not copy the context."""
+    with tag(**fields):
+        return fn(*args)
+
+
+def _tokens(usage: object, name: str) -> int:
+    return getattr(usage, name, None) or 0
+
+
+def cost_usd(model: str, usage: object, batch: bool = False) -> float:
+    input_price, output_price = PRICES.get(model, (0.0, 0.0))
+    total = (
+        _tokens(usage, "input_tokens") * input_price
+        + _tokens(usage, "cache_creation_input_tokens") * input_price * CACHE_WRITE_RATE
+        + _tokens(usage, "cache_read_input_tokens") * input_price * CACHE_READ_RATE
+        + _tokens(usage, "output_tokens") * output_price
+    ) / 1_000_000
+    return total * BATCH_RATE if batch else total
+
+
+class Ledger:
+    def __init__(self, iteration: int) -> None:
+        os.makedirs(TELEMETRY_DIR, exist_ok=True)
+        self.path = os.path.join(TELEMETRY_DIR, f"iter{iteration:04d}.jsonl")
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        stage: str,
+        model: str,
+        message: Any,
+        latency_s: float | None,
+        ttft_s: float | None = None,
+        batch: bool = False,
+    ) -> None:
+        usage = message.usage
+        entry = {
+            "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "stage": stage,
+            "model": model,
+            **_TAGS.get(),
+            "batch": batch,
+            "latency_s": None if latency_s is None else round(latency_s, 3),
+            "ttft_s": None if ttft_s is None else round(ttft_s, 3),
+            "input_tokens": _tokens(usage, "input_tokens"),
+            "output_tokens": _tokens(usage, "output_tokens"),
+            "cache_read_tokens": _tokens(usage, "cache_read_input_tokens"),
+            "cache_write_tokens": _tokens(usage, "cache_creation_input_tokens"),
+            "cost_usd": round(cost_usd(model, usage, batch), 6),
+            "stop_reason": getattr(message, "stop_reason", None),
+        }
+        line = json.dumps(entry)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def entries(self) -> list[dict]:
+        entries = []
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # torn by a crash mid-append
+        return entries
+
+    def rollup(self, candidate: int) -> dict[str, int]:
+        """ROLLUP_COLUMNS for one candidate; calls not tied to a candidate count towards 0."""
+        mine = [e for e in self.entries() if e.get("candidate", 0) == candidate]
+        return {
+            "api_calls": len(mine),
+            "input_tokens": sum(e["input_tokens"] for e in mine),
+            "output_tokens": sum(e["output_tokens"] for e in mine),
+            "cached_tokens": sum(e["cache_read_tokens"] for e in mine),
+            "cost_cents": round(100 * sum(e["cost_usd"] for e in mine)),
+            "api_seconds": round(sum(e["latency_s"] or 0 for e in mine)),
+            "max_tokens_hits": sum(e["stop_reason"] == "max_tokens" for e in mine),
+        }
+
+    def summary(self) -> str:
+        """Per-stage calls, summed latency and cost for the whole iteration."""
+        stages: dict[str, list[float]] = {}
+        for e in self.entries():
+            s = stages.setdefault(e["stage"], [0, 0.0, 0.0, 0])
+            s[0] += 1
+            s[1] += e["latency_s"] or 0
+            s[2] += e["cost_usd"]
+            s[3] += e["stop_reason"] == "max_tokens"
+        return " | ".join(
+            f"{stage}: {int(n)} call(s), {secs:.0f}s, ${cost:.2f}" + (f", {int(cut)} max_tokens" if cut else "")
+            for stage, (n, secs, cost, cut) in stages.items()
+        )
@@ -0,0 +1,138 @@
+"""
+autoeval/tests/stub_client.py — In-process stand-in for anthropic.Anthropic.
+
+messages.stream() replies from a handler and models the prompt cache: a request's
+cacheable prefix (tools, system and messages up to the last cache_control block)
+is written when its first output token streams, and requests whose prefix was
+already written report a cache read instead of a cache write.
+messages.batches keeps submitted batches in memory and ends each one after a set
+number of polls.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import types
+
+PLAN = "```json\n" + json.dumps({
+    "project": {"name": "demo"},
+    "phases": [{
+        "id": i, "title": f"Phase {i}", "deliverable": "Creates src/app.py",
+        "tasks": ["Create the app module", "Write unit tests for it"],
+        "commit_condition": "Run pytest; returns 5 passed", "example_input": "x", "example_output": "y",
+    } for i in range(1, 8)],
+}) + "\n```"
+
+
+def message(text: str, stop_reason: str = "end_turn", cache_read: int = 0, cache_write: int = 0):
+    return types.SimpleNamespace(
+        content=[types.SimpleNamespace(type="text", text=text)],
+        stop_reason=stop_reason,
+        usage=types.SimpleNamespace(input_tokens=10, output_tokens=20, cache_read_input_tokens=cache_read,
+                                    cache_creation_input_tokens=cache_write),
+    )
+
+
+def cache_prefix(params: dict) -> str | None:
+    """The part of a request the API would cache, or None if nothing is marked."""
+    parts = [params["model"], params.get("tools")]
+    marked = None
+    system = params.get("system")
+    for block in system if isinstance(system, list) else []:
+        parts.append(block)
+        if "cache_control" in block:
+            marked = len(parts)
+    for msg in params["messages"]:
+        content = msg["content"]
+        for block in content if isinstance(content, list) else [content]:
+            parts.append(block)
+            if isinstance(block, dict) and "cache_control" in block:
+                marked = len(parts)
+    return None if marked is None else json.dumps(parts[:marked], sort_keys=True)
+
+
+class Stream:
+    def __init__(self, messages: Messages, params: dict) -> None:
+        self.messages, self.params = messages, params
+        self.prefix = cache_prefix(params)
+        with messages.lock:
+            self.hit = self.prefix is not None and self.prefix in messages.cached
+        self.text = messages.handler(params)
+
+    def __enter__(self) -> Stream:
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def _first_token(self) -> None:
+        time.sleep(self.messages.latency_s)
+        if self.prefix is not None:
+            with self.messages.lock:
+                self.messages.cached.add(self.prefix)
+
+    def __iter__(self):
+        self._first_token()
+        for i in range(0, len(self.text), 64):
+            yield types.SimpleNamespace(type="text", text=self.text[i:i + 64])
+
+    @property
+    def text_stream(self):
+        for event in self:
+            yield event.text
+
+    def get_final_message(self):
+        marked = self.prefix is not None
+        return message(self.text, cache_read=100 if marked and self.hit else 0,
+                       cache_write=100 if marked and not self.hit else 0)
+
+
+class Batches:
+    def __init__(self, messages: Messages, polls_to_end: int = 2) -> None:
+        self.messages = messages
+        self.polls_to_end = polls_to_end
+        self.submitted: dict[str, list[dict]] = {}
+        self.polls: dict[str, int] = {}
+        self.errored: set[str] = set()
+
+    def create(self, requests: list[dict]):
+        batch_id = f"msgbatch_{len(self.submitted) + 1}"
+        self.submitted[batch_id] = requests
+        self.polls[batch_id] = 0
+        return types.SimpleNamespace(id=batch_id)
+
+    def retrieve(self, batch_id: str):
+        self.polls[batch_id] += 1
+        done = self.polls[batch_id] >= self.polls_to_end
+        return types.SimpleNamespace(id=batch_id, processing_status="ended" if done else "in_progress")
+
+    def results(self, batch_id: str):
+        for request in self.submitted[batch_id]:
+            if request["custom_id"] in self.errored:
+                result = types.SimpleNamespace(type="errored")
+            else:
+                result = types.SimpleNamespace(type="succeeded", message=message(self.messages.handler(request["params"])))
+            yield types.SimpleNamespace(custom_id=request["custom_id"], result=result)
+
+
+class Messages:
+    def __init__(self, handler, latency_s: float) -> None:
+        self.handler = handler
+        self.latency_s = latency_s
+        self.lock = threading.Lock()
+        self.cached: set[str] = set()
+        self.streams: list[Stream] = []
+        self.batches = Batches(self)
+
+    def stream(self, **params) -> Stream:
+        stream = Stream(self, params)
+        with self.lock:
+            self.streams.append(stream)
+        return stream
+
+
+class StubClient:
+    def __init__(self, handler=lambda params: PLAN, latency_s: float = 0.02) -> None:
+        self.messages = Messages(handler, latency_s)
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import run
+from stub_client import StubClient
+
+
+@pytest.fixture(autouse=True)
+def batch_file(tmp_path, monkeypatch):
+    path = tmp_path / "batches.json"
+    monkeypatch.setattr(run, "BATCH_FILE", str(path))
+    monkeypatch.setattr(run.time, "sleep", lambda s: None)
+    return path
+
+
+def requests(n: int = 3) -> dict[str, dict]:
+    return {f"c0-plan_{i}": run.generation_params("SYSTEM PROMPT", f"brief {i}") for i in range(1, n + 1)}
+
+
+def test_submit_poll_and_collect(batch_file):
+    client = StubClient()
+    client.messages.batches.polls_to_end = 3
+    client.messages.batches.errored.add("c0-plan_2")
+    results = run.run_batch(client, "generation", requests())
+    assert list(client.messages.batches.submitted) == ["msgbatch_1"]
+    assert client.messages.batches.polls["msgbatch_1"] == 3
+    assert results["c0-plan_2"] is None
+    assert results["c0-plan_1"].content[0].text == results["c0-plan_3"].content[0].text
+    assert json.loads(batch_file.read_text()) == {}
+
+
+def test_interrupted_poll_resumes_the_same_batch(batch_file):
+    client = StubClient()
+    retrieve = client.messages.batches.retrieve
+
+    def dies_while_polling(batch_id):
+        raise KeyboardInterrupt
+
+    client.messages.batches.retrieve = dies_while_polling
+    with pytest.raises(KeyboardInterrupt):
+        run.run_batch(client, "generation", requests())
+    assert list(json.loads(batch_file.read_text()).values()) == ["msgbatch_1"]
+
+    client.messages.batches.retrieve = retrieve
+    results = run.run_batch(client, "generation", requests())
+    assert list(client.messages.batches.submitted) == ["msgbatch_1"]
+    assert all(r is not None for r in results.values())
+    assert json.loads(batch_file.read_text()) == {}
+
+
+def test_changed_requests_submit_a_new_batch(batch_file):
+    client = StubClient()
+    batch_file.write_text(json.dumps({"generation:stale": "msgbatch_9"}))
+    run.run_batch(client, "generation", requests(2))
+    assert list(client.messages.batches.submitted) == ["msgbatch_1"]
+    assert json.loads(batch_file.read_text()) == {"generation:stale": "msgbatch_9"}
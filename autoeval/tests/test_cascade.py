@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+import cascade
+import store
+
+
+def trusted_tracker() -> cascade.AgreementTracker:
+    tracker = cascade.AgreementTracker()
+    tracker.load({("test_1", "req_1"): (cascade.CASCADE_MIN_SAMPLES, cascade.CASCADE_MIN_SAMPLES)})
+    return tracker
+
+
+def test_trusted_requirements_are_still_audited():
+    tracker = trusted_tracker()
+    plans = [f"plan text {i}" for i in range(2000)]
+    audited = sum(
+        bool(cascade.escalations({"plan_1": {"test_1": {"req_1": 10}}}, [plan], tracker))
+        for plan in plans
+    )
+    assert abs(audited / len(plans) - cascade.CASCADE_AUDIT_RATE) < 0.03
+
+
+def test_audits_can_withdraw_trust():
+    tracker = trusted_tracker()
+    for _ in range(cascade.CASCADE_MIN_SAMPLES):
+        tracker.record("test_1", "req_1", 10, 0)
+    assert not tracker.trusted("test_1", "req_1")
+
+
+@pytest.fixture
+def results(tmp_path, monkeypatch):
+    path = tmp_path / "results.tsv"
+    path.write_text(
+        "iteration\ttimestamp\tscore\tchampion_score\tstatus\tprompt_hash\tbrief\ttest_1\tanalysis\n"
+        "0\t2026-01-01T00:00:00\t100\t100\tbaseline\tbaseline\tbaseline.json\t100\t\n"
+    )
+    monkeypatch.setattr(store, "RESULTS_FILE", str(path))
+    monkeypatch.setattr(store, "SCORES_DIR", str(tmp_path / "scores"))
+    monkeypatch.setattr(store, "DB_FILE", str(tmp_path / "results.db"))
+    monkeypatch.setattr(store, "AGREEMENT_FILE", str(tmp_path / "agreement.tsv"))
+    return path
+
+
+def test_rebuild_keeps_agreement_counts(results, monkeypatch):
+    store.record_agreement(store.connect(store.DB_FILE), {("test_1", "req_1"): (25, 24)})
+    monkeypatch.setattr("sys.argv", ["store.py", "import"])
+    store.main()
+    conn = store.connect(store.DB_FILE)
+    assert store.scorer_agreement(conn) == {("test_1", "req_1"): (25, 24)}
+    assert store.next_iteration(conn) == 1
+
+
+def test_new_database_recovers_agreement_counts(results):
+    conn = store.connect(store.DB_FILE)
+    store.record_agreement(conn, {("test_1", "req_1"): (25, 24)})
+    store.record_agreement(conn, {("test_1", "req_1"): (1, 1)})
+    conn.close()
+    os.remove(store.DB_FILE)
+    assert store.scorer_agreement(store.connect(store.DB_FILE)) == {("test_1", "req_1"): (26, 25)}
+
+
+def test_existing_database_picks_up_new_results_rows(results):
+    store.connect(store.DB_FILE).close()
+    with open(results, "a") as f:
+        f.write("1\t2026-01-02T00:00:00\t120\t120\tkeep\tabc\tall_3\t120\t\n")
+    conn = store.connect(store.DB_FILE)
+    assert store.next_iteration(conn) == 2
+    assert store.champion_score(conn) == 120
@@ -0,0 +1,40 @@
+import os
+import shutil
+
+import planpack
+
+
+def slots(iteration, texts, total=100):
+    return [(iteration, 0, plan, "brief.md", plan - 1, text, 10, total)
+            for plan, text in enumerate(texts, start=1)]
+
+
+def test_index_is_rebuilt_from_index_tsv(tmp_path):
+    pack = planpack.PlanPack(str(tmp_path))
+    pack.add_many(slots(1, ["plan a", "plan b", "plan a"]))
+    pack.add_many(slots(2, ["plan c"]))
+    pack.add_many(slots(2, ["plan c again"], total=120))
+    pack.close()
+    os.remove(tmp_path / planpack.INDEX_NAME)
+
+    pack = planpack.PlanPack(str(tmp_path))
+    assert pack.plans(1) == ["plan a", "plan b", "plan a"]
+    assert pack.plans(2) == ["plan c again"]
+    assert pack.stats()["blobs"] == 4
+
+
+def test_pulled_index_lines_are_replayed(tmp_path):
+    local, remote = tmp_path / "local", tmp_path / "remote"
+    pack = planpack.PlanPack(str(local))
+    pack.add_many(slots(1, ["plan a"]))
+    pack.close()
+    shutil.copytree(local, remote)
+    pack = planpack.PlanPack(str(remote))
+    pack.add_many(slots(1, ["plan a again"], total=120))
+    pack.close()
+    for name in (planpack.PACK_NAME, planpack.LOG_NAME):
+        shutil.copy(remote / name, local / name)
+
+    pack = planpack.PlanPack(str(local))
+    assert pack.get(1, 0, 1) == "plan a again"
+    assert len(pack.entries(latest=False)) == 2
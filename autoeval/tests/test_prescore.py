@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+import prescore
+import run
+
+
+def phase(i, tasks=None, condition="Run `pytest` → 12 passed", deliverable="Parser module"):
+    return {
+        "id": i,
+        "title": f"Phase {i}",
+        "deliverable": deliverable,
+        "tasks": tasks or ["Write the parser module", "Add parser unit tests"],
+        "commit_condition": condition,
+        "example_input": "in",
+        "example_output": "out",
+    }
+
+
+def plan(phases):
+    return json.dumps({"phases": phases})
+
+
+def good_plan(**overrides):
+    phases = [phase(i) for i in range(1, 8)]
+    phases[0].update(overrides)
+    return plan(phases)
+
+
+@pytest.mark.parametrize("condition", [
+    "Run `pytest` and tests pass",
+    "Tests pass on Python 3.11",
+    "All 3 modules import",
+    "Run 'make check'",
+    "tests pass",
+])
+def test_conditions_without_an_output_are_rejected(condition):
+    assert not prescore.EXPECTED_OUTPUT.search(condition)
+
+
+@pytest.mark.parametrize("condition", [
+    "Run `pytest`; it returns all 15 tests passing",
+    "Run `curl localhost:8000/health` → {\"ok\": true}",
+    "Run `cli --version` -> 1.0.0",
+    "Execute `migrate.py` and it prints 'applied 3 migrations'",
+    "Query the users table; it contains 2 rows",
+    "Run `app --bad-flag`; it exits with code 2",
+])
+def test_conditions_with_an_output_are_accepted(condition):
+    assert prescore.EXPECTED_OUTPUT.search(condition)
+
+
+def test_expected_output_is_scored_per_condition():
+    phases = [phase(i) for i in range(1, 9)]
+    for p in phases[:4]:
+        p["commit_condition"] = "Run `pytest` and tests pass"
+    assert prescore.prescore_plan(plan(phases))["test_6"]["req_2"] == 5
+
+
+@pytest.mark.parametrize("test_key, req_key, overrides", [
+    ("test_7", "req_2", {"tasks": ["Setup database", "Write the parser module"]}),
+    ("test_9", "req_3", {"tasks": ["Write the parser module"]}),
+    ("test_9", "req_4", {"tasks": [f"Write parser module {n}" for n in range(9)]}),
+])
+def test_absolute_requirements_fail_on_one_violation(test_key, req_key, overrides):
+    assert prescore.prescore_plan(good_plan())[test_key][req_key] == 10
+    assert prescore.prescore_plan(good_plan(**overrides))[test_key][req_key] == 0
+
+
+def test_invalid_plans_are_left_to_the_scorer():
+    assert prescore.prescore_plan("no json here") is None
+    assert prescore.prescore_plan('{"phases": [{"id": 1}]}') is None
+
+
+def test_upper_bound_counts_unparsed_plans_at_full_marks():
+    clean = prescore.prescore_plan(good_plan())
+    assert run.prescore_upper_bound([None, None]) == 2 * run.MAX_PLAN_SCORE
+    assert run.prescore_upper_bound([clean]) == run.MAX_PLAN_SCORE
+    failing = prescore.prescore_plan(good_plan(tasks=["Write the parser module"]))
+    assert run.prescore_upper_bound([failing]) == run.MAX_PLAN_SCORE - 10
+
+
+def test_prerejected_candidates_carry_a_bound_not_a_score():
+    failing = prescore.prescore_plan(good_plan(tasks=["Write the parser module"]))
+    prescores = [failing, None]
+    data = run.prereject_score_data(prescores, champion_score=2 * run.MAX_PLAN_SCORE)
+    assert "total_score" not in data
+    assert data["score_bound"] == run.prescore_upper_bound(prescores)
+    assert data["plan_1"]["test_9"]["req_3"] == 0
+    assert "plan_2" not in data
+    assert "test_9 req_3" in data["analysis"]
@@ -0,0 +1,29 @@
+import run
+from stub_client import StubClient
+
+
+def test_fan_out_writes_the_generation_prefix_once():
+    client = StubClient()
+    plans = run.generate_plans(client, "SYSTEM PROMPT", concurrency=run.NUM_PLANS)
+    assert len(plans) == run.NUM_PLANS
+    usage = [s.get_final_message().usage for s in client.messages.streams]
+    assert sum(u.cache_creation_input_tokens > 0 for u in usage) == 1
+    assert sum(u.cache_read_input_tokens > 0 for u in usage) == run.NUM_PLANS - 1
+
+
+def test_generation_requests_share_the_cached_system_prompt():
+    a = run.generation_params("SYSTEM PROMPT", "brief one")
+    b = run.generation_params("SYSTEM PROMPT", "brief two", prefix="{")
+    assert a["system"] == b["system"]
+    assert a["system"][-1]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_scoring_shards_differ_only_after_the_cached_prefix():
+    a = run.shard_params(["plan a"], "SUITE")
+    b = run.shard_params(["plan b"], "SUITE", skip={"test_5": ("req_2",)})
+    assert a["tools"] == b["tools"]
+    *prefix_a, tail_a = a["messages"][0]["content"]
+    *prefix_b, tail_b = b["messages"][0]["content"]
+    assert prefix_a == prefix_b
+    assert all("cache_control" in block for block in prefix_a)
+    assert "cache_control" not in tail_a and tail_a != tail_b
@@ -0,0 +1,144 @@
+"""
+autoeval/tracing.py — Nested timing spans for one iteration, exported as a Chrome trace.
+
+With run.py --trace, every stage, API call, retry, wait and disk write becomes a
+span on the thread that ran it; the iteration is written to
+traces/iterNNNN.json in Chrome trace-event format (open it in ui.perfetto.dev
+or chrome://tracing) to see where the time goes and whether parallel work
+really overlaps. Without --trace, span() hands back one shared no-op context
+and traced() calls straight through, so nothing is timed or stored.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any
+
+TRACE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "traces")
+
+TRACER: Tracer | None = None     # set by start(); None means tracing is off
+
+_NOOP = contextlib.nullcontext()
+_PARENT: contextvars.ContextVar[str | None] = contextvars.ContextVar("trace_parent", default=None)
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._tids: dict[int, int] = {}
+        self.events: list[dict] = []
+        self.name = "trace"
+        self._stage: tuple[str, float] | None = None
+
+    def now_us(self) -> float:
+        return (time.perf_counter() - self._t0) * 1e6
+
+    def _tid(self) -> int:
+        ident = threading.get_ident()
+        with self._lock:
+            if ident not in self._tids:
+                self._tids[ident] = len(self._tids) + 1
+                self.events.append({"ph": "M", "name": "thread_name", "pid": os.getpid(),
+                                    "tid": self._tids[ident],
+                                    "args": {"name": threading.current_thread().name}})
+            return self._tids[ident]
+
+    def complete(self, name: str, cat: str, start_us: float, end_us: float, args: dict) -> None:
+        event = {"ph": "X", "name": name, "cat": cat, "pid": os.getpid(), "tid": self._tid(),
+                 "ts": round(start_us, 1), "dur": round(end_us - start_us, 1), "args": args}
+        with self._lock:
+            self.events.append(event)
+
+    def stage(self, name: str | None) -> None:
+        """End the current top-level stage (if any) and begin `name`."""
+        now = self.now_us()
+        if self._stage is not None:
+            self.complete(self._stage[0], "stage", self._stage[1], now, {})
+        self._stage = (name, now) if name else None
+
+    def export(self) -> str:
+        self.stage(None)
+        self.complete(self.name, "iteration", 0.0, self.now_us(), {})
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        path = os.path.join(TRACE_DIR, f"{self.name}.json")
+        with self._lock:
+            events = sorted(self.events, key=lambda e: (e["ph"] != "M", e.get("ts", 0)))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start", "token")
+
+    def __init__(self, name: str, cat: str, args: dict) -> None:
+        self.name, self.cat, self.args = name, cat, args
+
+    def __enter__(self) -> _Span:
+        parent = _PARENT.get()
+        if parent is not None:
+            self.args["parent"] = parent
+        self.token = _PARENT.set(self.name)
+        self.start = TRACER.now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end = TRACER.now_us()
+        _PARENT.reset(self.token)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        TRACER.complete(self.name, self.cat, self.start, end, self.args)
+
+
+def span(name: str, cat: str = "span", **args: Any):
+    """Time a block as a span nested under whatever span encloses it.
+
+    `name` may hold {placeholders} for `args`; it is only formatted when
+    tracing is on, so callers pass "plan {plan}", plan=n rather than an f-string.
+    """
+    if TRACER is None:
+        return _NOOP
+    return _Span(name.format(**args) if "{" in name else name, cat, args)
+
+
+def traced(name: str, cat: str = "span"):
+    """Decorator form of span()."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*a, **kw):
+            if TRACER is None:
+                return fn(*a, **kw)
+            with _Span(name, cat, {}):
+                return fn(*a, **kw)
+        return inner
+    return wrap
+
+
+def stage(name: str) -> None:
+    if TRACER is not None:
+        TRACER.stage(name)
+
+
+def start() -> None:
+    """Turn tracing on for this process; the trace is written at exit, even after a crash."""
+    global TRACER
+    TRACER = Tracer()
+    atexit.register(_export)
+
+
+def set_name(name: str) -> None:
+    if TRACER is not None:
+        TRACER.name = name
+
+
+def _export() -> None:
+    if TRACER is not None:
+        print(f"Trace written to {TRACER.export()} (open in ui.perfetto.dev)", flush=True)
@@ -2,30 +2,43 @@
 """
 autoeval/view_results.py — Generate and open a visualisation dashboard.
 
-Reads results.tsv and scores/*.json, writes dashboard.html, opens in browser.
+Reads results.db (see store.py), the score tensor (see analytics.py) and the
+plan-pack index (see planpack.py), writes
+dashboard.html plus its data files in dashboard_data/, opens in browser.
 Run anytime: python autoeval/view_results.py
+
+The page is a static shell; everything it shows is loaded lazily from
+dashboard_data/*.js. Score files are read through the memory-mapped score
+tensor, so a rebuild only parses new or changed ones. Long series are downsampled (LTTB for the
+trend lines, bucketed means for the heatmap) and the results table is split
+into fixed chunks, so the page stays small however long the history gets.
 """
 
 from __future__ import annotations
 
-import csv
-import glob
 import json
+import math
 import os
 import re
+import time
+import warnings
 import webbrowser
 
+import numpy as np
+
+import analytics
+import planpack
+import store
+from analytics import REQ_COLUMNS
+from rubric import MAX_PLAN_SCORE, MAX_REQ_SCORE, NUM_PLANS, REQ_COUNTS, RUBRIC, TOTAL_REQS
+from store import DB_FILE
+
 BASE         = os.path.dirname(os.path.abspath(__file__))
 RESULTS_FILE = os.path.join(BASE, "results.tsv")
-SCORES_DIR   = os.path.join(BASE, "scores")
 DASHBOARD    = os.path.join(BASE, "dashboard.html")
+DATA_DIR     = os.path.join(BASE, "dashboard_data")
 
-MAX_SCORE    = 4410  # 9 plans × 49 requirements × 10 pts
-MAX_PER_TEST = {     # 9 plans × req_count × 10
-    "test_1": 360, "test_2": 360, "test_3": 450, "test_4": 360,
-    "test_5": 360, "test_6": 360, "test_7": 360, "test_8": 450,
-    "test_9": 450, "test_10": 450, "test_11": 450,
-}
+MAX_SCORE    = NUM_PLANS * MAX_PLAN_SCORE    # 9 plans × 49 requirements × 10 pts
 TEST_LABELS = {
     "test_1":  "T1: Legibility",
     "test_2":  "T2: Tone",
@@ -40,127 +53,234 @@ TEST_LABELS = {
     "test_11": "T11: Retrieval",
 }
 
+TREND_POINTS    = 1000   # LTTB target for the score and spend lines
+HEATMAP_COLUMNS = 400    # iterations are bucketed down to at most this many columns
+ROWS_PER_CHUNK  = 500    # results-table rows per lazily loaded chunk
+
 
 def load_results() -> list[dict]:
-    if not os.path.exists(RESULTS_FILE):
+    if not os.path.exists(DB_FILE) and not os.path.exists(RESULTS_FILE):
         return []
-    rows = []
-    with open(RESULTS_FILE, encoding="utf-8") as f:
-        reader = csv.DictReader(f, delimiter="\t")
-        for row in reader:
-            rows.append(row)
-    return rows
-
-
-def load_latest_score_data() -> dict | None:
-    files = sorted(glob.glob(os.path.join(SCORES_DIR, "iter*.json")))
-    if not files:
-        return None
-    with open(files[-1], encoding="utf-8") as f:
-        return json.load(f)
-
-
-def compute_per_test_pcts(score_data: dict) -> dict[str, float]:
-    """Return percentage score per test for latest iteration."""
-    totals: dict[str, int] = {k: 0 for k in MAX_PER_TEST}
-    num_plans = sum(1 for k in score_data if k.startswith("plan_"))
-    for plan_key in [f"plan_{i}" for i in range(1, num_plans + 1)]:
-        plan_scores = score_data.get(plan_key, {})
-        for test_key in MAX_PER_TEST:
-            test_scores = plan_scores.get(test_key, {})
-            if isinstance(test_scores, dict):
-                totals[test_key] += sum(int(v) for v in test_scores.values())
+    return store.load_iterations(store.connect())
+
+# ── downsampling ───────────────────────────────────────────────────────────────
+
+def lttb(xs: list[float], ys: list[float], threshold: int) -> list[int]:
+    """Indices of the points Largest-Triangle-Three-Buckets keeps to draw the line."""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    keep = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        if next_end > end:
+            avg_x = sum(xs[end:next_end]) / (next_end - end)
+            avg_y = sum(ys[end:next_end]) / (next_end - end)
+        else:
+            avg_x, avg_y = xs[n - 1], ys[n - 1]
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+    keep.append(n - 1)
+    return keep
+
+
+def downsample(points: list[tuple[float, float | None]], threshold: int = TREND_POINTS) -> list[dict]:
+    """{x, y} points for Chart.js, LTTB-downsampled; points without a value are dropped."""
+    points = [(x, y) for x, y in points if y is not None]
+    xs = [float(x) for x, _ in points]
+    ys = [float(y) for _, y in points]
+    return [{"x": points[i][0], "y": points[i][1]} for i in lttb(xs, ys, threshold)]
+
+# ── chart data ─────────────────────────────────────────────────────────────────
+
+def per_test_pcts(means: np.ndarray) -> dict[str, float]:
+    """Percentage score per test from one evaluation's requirement means."""
+    pcts: dict[str, float] = {}
+    col = 0
+    for test_key, reqs in RUBRIC.items():
+        values = means[col:col + len(reqs)]
+        values = values[~np.isnan(values)]
+        col += len(reqs)
+        pcts[test_key] = round(100 * float(values.mean()) / MAX_REQ_SCORE, 1) if values.size else 0
+    return pcts
+
+
+def spend_per_iteration(rows: list[dict]) -> tuple[list[str], list[float | None], list[int | None]]:
+    """(iterations, cost in $, summed API seconds), adding up an iteration's candidates.
+
+    Iterations logged before the telemetry columns existed have None.
+    """
+    cost: dict[str, float | None] = {}
+    seconds: dict[str, int | None] = {}
+    for r in rows:
+        it = r["iteration"]
+        cents, secs = r.get("cost_cents", ""), r.get("api_seconds", "")
+        cost.setdefault(it, None)
+        seconds.setdefault(it, None)
+        if cents.isdigit():
+            cost[it] = (cost[it] or 0) + int(cents) / 100
+        if secs.isdigit():
+            seconds[it] = (seconds[it] or 0) + int(secs)
+    return list(cost), list(cost.values()), list(seconds.values())
+
+
+def trend_data(rows: list[dict]) -> dict:
+    # Pre-rejected candidates were never scored, so they have no point on the line.
+    scores = downsample([(int(r["iteration"]), int(r["score"])) for r in rows if r["score"]])
+    # The champion line only moves on a keep, so its change points draw it exactly.
+    champs: list[dict] = []
+    for r in rows:
+        point = {"x": int(r["iteration"]), "y": int(r["champion_score"])}
+        if not champs or champs[-1]["y"] != point["y"]:
+            champs.append(point)
+    if rows and champs[-1]["x"] != int(rows[-1]["iteration"]):
+        champs.append({"x": int(rows[-1]["iteration"]), "y": int(rows[-1]["champion_score"])})
+    if len(champs) > TREND_POINTS:
+        champs = downsample([(c["x"], c["y"]) for c in champs])
+    return {"scores": scores, "champions": champs, "max": MAX_SCORE, "total": len(rows)}
+
+
+def spend_data(rows: list[dict]) -> dict:
+    iterations, cost, seconds = spend_per_iteration(rows)
     return {
-        k: round(100 * totals[k] / MAX_PER_TEST[k], 1)
-        for k in MAX_PER_TEST
+        "cost": downsample(list(zip((int(i) for i in iterations), cost))),
+        "seconds": downsample(list(zip((int(i) for i in iterations), seconds))),
     }
 
 
-def analysis_to_bullets(text: str, max_bullets: int = 10) -> str:
-    """Convert analysis paragraph into an HTML bullet list (up to max_bullets items)."""
+def heatmap_data(tensor: analytics.ScoreTensor) -> dict:
+    """Evaluation × requirement means, bucketing consecutive evaluations down to HEATMAP_COLUMNS."""
+    means = analytics.req_means(tensor)
+    n = len(means)
+    bucket = max(1, math.ceil(n / HEATMAP_COLUMNS))
+    width = math.ceil(n / bucket)
+    padded = np.full((width * bucket, len(REQ_COLUMNS)), np.nan)
+    padded[:n] = means
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN buckets
+        binned = np.nanmean(padded.reshape(width, bucket, -1), axis=1)
+    firsts = tensor.iterations[::bucket].tolist()
+    lasts = tensor.iterations[np.minimum(np.arange(width) * bucket + bucket - 1, n - 1)].tolist()
+    return {
+        "rows": REQ_COLUMNS,
+        "columns": [f"{a}" if a == b else f"{a}–{b}" for a, b in zip(firsts, lasts)],
+        "values": [[None if math.isnan(v) else int(v) for v in row] for row in np.round(10 * binned).tolist()],
+        "bucket": bucket,
+        "max": 10 * MAX_REQ_SCORE,
+    }
+
+
+def analysis_to_bullets(text: str, max_bullets: int = 10) -> list[str]:
+    """Split an analysis paragraph into bullet points (up to max_bullets items)."""
     # Split on numbered markers like (1), (2), ...
     parts = re.split(r"\s*\(\d+\)\s*", text)
     parts = [p.strip().rstrip(".") for p in parts if p.strip()]
     if len(parts) <= 1:
         # Fall back to sentence splitting
         parts = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
-    bullets = parts[:max_bullets]
-    items = "".join(f"<li>{b}</li>" for b in bullets)
-    return f"<ul>{items}</ul>"
-
-
-def generate_html(rows: list[dict], latest_score_data: dict | None) -> str:
-    # ── data for charts ────────────────────────────────────────────────────────
-    iterations   = [r["iteration"] for r in rows]
-    scores       = [int(r["score"]) for r in rows]
-    champ_scores = [int(r["champion_score"]) for r in rows]
-    statuses     = [r.get("status", "") for r in rows]
-    analyses     = [r.get("analysis", "")[:120] for r in rows]
-    timestamps   = [r.get("timestamp", "")[:16] for r in rows]
-
-    latest_score = scores[-1] if scores else 0
-    latest_pct   = round(100 * latest_score / MAX_SCORE, 1)
-    champion     = max(champ_scores) if champ_scores else 0
-    champ_pct    = round(100 * champion / MAX_SCORE, 1)
-
-    per_test_pcts: dict[str, float] = {}
-    if latest_score_data:
-        per_test_pcts = compute_per_test_pcts(latest_score_data)
-
-    bar_labels = json.dumps([TEST_LABELS[k] for k in MAX_PER_TEST])
-    bar_data   = json.dumps([per_test_pcts.get(k, 0) for k in MAX_PER_TEST])
-    bar_colors = json.dumps([
-        "#22c55e" if per_test_pcts.get(k, 0) >= 80
-        else "#f59e0b" if per_test_pcts.get(k, 0) >= 50
-        else "#ef4444"
-        for k in MAX_PER_TEST
-    ])
-
-    trend_labels = json.dumps(iterations)
-    trend_scores = json.dumps(scores)
-    trend_champs = json.dumps(champ_scores)
-
-    # Table rows
-    table_rows = ""
-    for i, r in enumerate(reversed(rows)):
-        status = r.get("status", "")
-        badge_cls = (
-            "badge-keep" if status == "keep"
-            else "badge-baseline" if status == "baseline"
-            else "badge-discard"
-        )
-        score_val  = int(r.get("score", 0))
-        score_pct  = round(100 * score_val / MAX_SCORE, 1)
-        analysis   = r.get("analysis", "").replace("'", "&#39;").replace('"', "&quot;")
-        brief      = r.get("brief", "")
-        ts         = r.get("timestamp", "")[:16]
-        iteration  = r["iteration"]
-        champ_val  = r.get("champion_score", "")
-        row_id     = f"detail-{i}"
-
-        table_rows += f"""
-        <tr class="data-row" onclick="toggleDetail('{row_id}')">
-          <td class="iter-cell">#{iteration}</td>
-          <td class="ts-cell">{ts}</td>
-          <td class="score-cell">
-            <span class="score-num">{score_val}</span>
-            <span class="score-pct">{score_pct}%</span>
-            <div class="row-bar"><div class="row-bar-fill" style="width:{score_pct}%"></div></div>
-          </td>
-          <td class="champ-val">{champ_val}</td>
-          <td><span class="badge {badge_cls}">{status}</span></td>
-          <td class="brief-cell">{brief}</td>
-          <td class="expand-cell"><span class="expand-icon">▸</span> <span class="preview-text">{r.get('analysis','')[:60]}…</span></td>
-        </tr>
-        <tr class="detail-row" id="{row_id}">
-          <td colspan="7">
-            <div class="analysis-panel">
-              <div class="analysis-label">Analysis</div>
-              <div class="analysis-body">{analysis_to_bullets(r.get('analysis',''))}</div>
-            </div>
-          </td>
-        </tr>"""
+    return parts[:max_bullets]
+
+
+def plan_archive() -> tuple[dict[tuple[int, int], list[list]], dict | None]:
+    """((iteration, candidate) -> [plan, brief, variant, score] per archived plan, pack stats),
+    read from the plan-pack index alone; nothing is decompressed."""
+    if not os.path.exists(os.path.join(planpack.PLANS_DIR, planpack.LOG_NAME)):
+        return {}, None
+    pack = planpack.PlanPack()
+    plans: dict[tuple[int, int], list[list]] = {}
+    columns = ["iteration", "candidate", "plan", "brief", "variant", "score"]
+    for iteration, candidate, *plan in pack.entries(columns=columns):
+        plans.setdefault((iteration, candidate), []).append(plan)
+    stats = pack.stats()
+    pack.close()
+    return plans, stats
+
+
+def table_row(r: dict, plans: dict[tuple[int, int], list[list]]) -> list:
+    """One results-table row: iteration, candidate, timestamp, score (None if pre-rejected),
+    champion, status, brief, analysis preview, analysis bullets, archived plans, score bound."""
+    analysis = r.get("analysis", "")
+    candidate = int(r.get("candidate") or 0)
+    return [
+        r["iteration"], candidate, r.get("timestamp", "")[:16], int(r["score"]) if r.get("score") else None,
+        r.get("champion_score", ""), r.get("status", ""), r.get("brief", ""),
+        analysis[:60], analysis_to_bullets(analysis), plans.get((int(r["iteration"]), candidate), []),
+        int(r["score_bound"]) if r.get("score_bound") else None,
+    ]
+
 
+def summary_data(rows: list[dict], tensor: analytics.ScoreTensor, chunks: int, archive: dict | None) -> dict:
+    scores = [int(r["score"]) for r in rows if r["score"]]
+    champion = max((int(r["champion_score"]) for r in rows), default=0)
+    pcts = per_test_pcts(analytics.req_means(tensor)[-1]) if len(tensor) else {}
+    return {
+        "latest": scores[-1] if scores else 0,
+        "champion": champion,
+        "max": MAX_SCORE,
+        "iterations": len(rows),
+        "improvements": sum(1 for r in rows if r.get("status") == "keep"),
+        "tests": {
+            "labels": [TEST_LABELS.get(k, k) for k in REQ_COUNTS],
+            "pcts": [pcts.get(k, 0) for k in REQ_COUNTS],
+            "iteration": int(tensor.iterations[-1]) if len(tensor) else None,
+        },
+        "chunks": chunks,
+        "archive": archive,
+    }
+
+# ── output ─────────────────────────────────────────────────────────────────────
+
+def write_if_changed(path: str, content: str) -> bool:
+    """Write `content` unless the file already holds it; returns whether it was written."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp, path)
+    return True
+
+
+def write_chunk(name: str, payload: object) -> bool:
+    # Chunks are scripts, not .json: a page opened from file:// may not fetch()
+    # local files, but it can always load a <script src>.
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return write_if_changed(os.path.join(DATA_DIR, f"{name}.js"), f"dashboardChunk({json.dumps(name)}, {body});\n")
+
+
+def build(rows: list[dict]) -> tuple[int, int]:
+    """Write every data chunk and the page shell; returns (chunks written, chunks total)."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tensor = analytics.load()
+    plans, archive = plan_archive()
+    row_chunks = [rows[i:i + ROWS_PER_CHUNK] for i in range(0, len(rows), ROWS_PER_CHUNK)]
+    chunks = {
+        "summary": summary_data(rows, tensor, len(row_chunks), archive),
+        "trend": trend_data(rows),
+        "spend": spend_data(rows),
+        "heatmap": heatmap_data(tensor),
+        **{f"rows_{i:04d}": [table_row(r, plans) for r in chunk] for i, chunk in enumerate(row_chunks)},
+    }
+    written = sum(write_chunk(name, payload) for name, payload in chunks.items())
+    write_if_changed(DASHBOARD, generate_html())
+    return written, len(chunks)
+
+
+def generate_html() -> str:
     return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -230,49 +350,75 @@ def generate_html(rows: list[dict], latest_score_data: dict | None) -> str:
   .badge-keep     {{ background: rgba(34,197,94,0.12); color: #4ade80; border: 1px solid rgba(34,197,94,0.25); }}
   .badge-discard  {{ background: rgba(239,68,68,0.12); color: #f87171; border: 1px solid rgba(239,68,68,0.25); }}
   .badge-baseline {{ background: rgba(99,102,241,0.12); color: #818cf8; border: 1px solid rgba(99,102,241,0.25); }}
+  .badge-aborted  {{ background: rgba(245,158,11,0.12); color: #fbbf24; border: 1px solid rgba(245,158,11,0.25); }}
+  .badge-prereject {{ background: rgba(100,116,139,0.12); color: #94a3b8; border: 1px solid rgba(100,116,139,0.25); }}
+  .badge-undecided {{ background: rgba(14,165,233,0.12); color: #38bdf8; border: 1px solid rgba(14,165,233,0.25); }}
   @media (max-width: 768px) {{ .chart-row {{ grid-template-columns: 1fr; }} }}
+  .heatmap-wrap {{ overflow-x: auto; }}
+  .heatmap-wrap canvas {{ display: block; }}
+  .heatmap-tip {{ font-size: 0.75rem; color: #94a3b8; margin-top: 8px; font-family: monospace; }}
+  .load-more {{ margin-top: 12px; background: #334155; color: #e2e8f0; border: 1px solid #475569;
+               border-radius: 6px; padding: 6px 14px; cursor: pointer; font-size: 0.8rem; }}
+  .load-more:hover {{ background: #475569; }}
+  .plans-line {{ margin-top: 10px; font-size: 0.75rem; color: #64748b; }}
 </style>
 </head>
 <body>
 <h1>Phase-Compiler Autoeval</h1>
-<p class="sub">Self-improving skill loop · 9 plans (3×brief) × 49 requirements × 10 pts = 4410 max</p>
+<p class="sub">Self-improving skill loop · 9 plans (3×brief) × {TOTAL_REQS} requirements × {MAX_REQ_SCORE} pts = {MAX_SCORE} max</p>
 
 <div class="grid">
   <div class="card">
     <div class="card-label">Latest Score</div>
-    <div class="card-value">{latest_score}</div>
-    <div class="card-sub">{latest_pct}% of {MAX_SCORE}</div>
-    <div class="progress-bar"><div class="progress-fill" style="width:{latest_pct}%"></div></div>
+    <div class="card-value" id="latestScore">–</div>
+    <div class="card-sub" id="latestPct"></div>
+    <div class="progress-bar"><div class="progress-fill" id="latestBar" style="width:0%"></div></div>
   </div>
   <div class="card">
     <div class="card-label">Champion Score</div>
-    <div class="card-value">{champion}</div>
-    <div class="card-sub">{champ_pct}% of {MAX_SCORE}</div>
-    <div class="progress-bar"><div class="progress-fill" style="width:{champ_pct}%"></div></div>
+    <div class="card-value" id="championScore">–</div>
+    <div class="card-sub" id="championPct"></div>
+    <div class="progress-bar"><div class="progress-fill" id="championBar" style="width:0%"></div></div>
   </div>
   <div class="card">
     <div class="card-label">Iterations Run</div>
-    <div class="card-value">{len(rows)}</div>
+    <div class="card-value" id="iterationCount">–</div>
     <div class="card-sub">including baseline</div>
   </div>
   <div class="card">
     <div class="card-label">Improvements</div>
-    <div class="card-value">{sum(1 for r in rows if r.get('status') == 'keep')}</div>
+    <div class="card-value" id="improvementCount">–</div>
     <div class="card-sub">prompt versions kept</div>
   </div>
+  <div class="card">
+    <div class="card-label">Plan Archive</div>
+    <div class="card-value" id="archiveCount">–</div>
+    <div class="card-sub" id="archiveSub">no plan pack yet</div>
+  </div>
 </div>
 
 <div class="chart-row">
   <div class="chart-card">
-    <div class="chart-title">Score over iterations</div>
+    <div class="chart-title" id="trendTitle">Score over iterations</div>
     <canvas id="trendChart" height="200"></canvas>
   </div>
   <div class="chart-card">
-    <div class="chart-title">Latest iteration — per-test breakdown (%)</div>
+    <div class="chart-title" id="barTitle">Latest iteration — per-test breakdown (%)</div>
     <canvas id="barChart" height="200"></canvas>
   </div>
 </div>
 
+<div class="chart-card lazy" data-chunk="spend" style="margin-bottom:28px">
+  <div class="chart-title">API cost and latency per iteration</div>
+  <canvas id="spendChart" height="80"></canvas>
+</div>
+
+<div class="chart-card lazy" data-chunk="heatmap" style="margin-bottom:28px">
+  <div class="chart-title" id="heatmapTitle">Requirement scores over all iterations (mean per plan, 0–10)</div>
+  <div class="heatmap-wrap"><canvas id="heatmap"></canvas></div>
+  <div class="heatmap-tip" id="heatmapTip">&nbsp;</div>
+</div>
+
 <div class="chart-card" style="margin-bottom:28px">
   <div class="chart-title">All iterations</div>
   <div style="overflow-x:auto">
@@ -283,72 +429,251 @@ def generate_html(rows: list[dict], latest_score_data: dict | None) -> str:
         <th>Status</th><th>Brief</th><th>Analysis — click row to expand</th>
       </tr>
     </thead>
-    <tbody>{table_rows}</tbody>
+    <tbody id="resultRows"></tbody>
   </table>
   </div>
+  <button class="load-more" id="loadOlder" hidden>Load older iterations</button>
 </div>
 
 <script>
-const trendCtx = document.getElementById('trendChart').getContext('2d');
-new Chart(trendCtx, {{
-  type: 'line',
-  data: {{
-    labels: {trend_labels},
-    datasets: [
-      {{
-        label: 'Score',
-        data: {trend_scores},
-        borderColor: '#6366f1',
-        backgroundColor: 'rgba(99,102,241,0.1)',
-        tension: 0.3,
-        fill: true,
-        pointRadius: 4,
-      }},
-      {{
-        label: 'Champion',
-        data: {trend_champs},
-        borderColor: '#22c55e',
-        borderDash: [6, 3],
-        tension: 0.3,
-        fill: false,
-        pointRadius: 0,
+const DASH = {{}};
+const waiting = {{}};
+function dashboardChunk(name, data) {{
+  DASH[name] = data;
+  (waiting[name] || []).forEach(resolve => resolve(data));
+}}
+function loadChunk(name) {{
+  if (DASH[name]) return Promise.resolve(DASH[name]);
+  return new Promise(resolve => {{
+    if (!waiting[name]) {{
+      waiting[name] = [];
+      const s = document.createElement('script');
+      s.src = 'dashboard_data/' + name + '.js?v=' + Date.now();
+      document.head.appendChild(s);
+    }}
+    waiting[name].push(resolve);
+  }});
+}}
+
+const axis = {{ grid: {{ color: '#334155' }}, ticks: {{ color: '#94a3b8' }} }};
+const legend = {{ legend: {{ labels: {{ color: '#cbd5e1' }} }} }};
+
+function pct(v, max) {{ return max ? Math.round(1000 * v / max) / 10 : 0; }}
+function text(id, value) {{ document.getElementById(id).textContent = value; }}
+
+loadChunk('summary').then(s => {{
+  text('latestScore', s.latest);
+  text('latestPct', pct(s.latest, s.max) + '% of ' + s.max);
+  document.getElementById('latestBar').style.width = pct(s.latest, s.max) + '%';
+  text('championScore', s.champion);
+  text('championPct', pct(s.champion, s.max) + '% of ' + s.max);
+  document.getElementById('championBar').style.width = pct(s.champion, s.max) + '%';
+  text('iterationCount', s.iterations);
+  text('improvementCount', s.improvements);
+  if (s.archive) {{
+    const a = s.archive;
+    text('archiveCount', a.plans);
+    text('archiveSub', a.blobs + ' distinct · ' + Math.round(a.packed_bytes / 1024) + ' KiB packed'
+      + (a.packed_bytes ? ' (' + (a.raw_bytes / a.packed_bytes).toFixed(1) + '× smaller)' : ''));
+  }}
+  if (s.tests.iteration !== null) text('barTitle', 'Latest iteration (#' + s.tests.iteration + ') — per-test breakdown (%)');
+  new Chart(document.getElementById('barChart'), {{
+    type: 'bar',
+    data: {{
+      labels: s.tests.labels,
+      datasets: [{{
+        label: '% score',
+        data: s.tests.pcts,
+        backgroundColor: s.tests.pcts.map(p => p >= 80 ? '#22c55e' : p >= 50 ? '#f59e0b' : '#ef4444'),
+        borderRadius: 4,
+      }}]
+    }},
+    options: {{
+      indexAxis: 'y',
+      responsive: true,
+      scales: {{
+        x: {{ min: 0, max: 100, grid: {{ color: '#334155' }},
+              ticks: {{ color: '#94a3b8', callback: v => v + '%' }} }},
+        y: {{ grid: {{ display: false }}, ticks: {{ color: '#94a3b8', font: {{ size: 11 }} }} }}
       }},
-    ]
-  }},
-  options: {{
-    responsive: true,
-    scales: {{
-      y: {{ min: 0, max: {MAX_SCORE}, grid: {{ color: '#334155' }},
-            ticks: {{ color: '#94a3b8' }} }},
-      x: {{ grid: {{ color: '#334155' }}, ticks: {{ color: '#94a3b8' }} }}
+      plugins: {{ legend: {{ display: false }} }}
+    }}
+  }});
+  nextRows = s.chunks - 1;
+  loadOlder();
+}});
+
+loadChunk('trend').then(t => {{
+  if (t.scores.length < t.total) text('trendTitle', 'Score over iterations (' + t.scores.length + ' of ' + t.total + ' points, LTTB)');
+  new Chart(document.getElementById('trendChart'), {{
+    type: 'line',
+    data: {{
+      datasets: [
+        {{
+          label: 'Score',
+          data: t.scores,
+          borderColor: '#6366f1',
+          backgroundColor: 'rgba(99,102,241,0.1)',
+          tension: 0.3,
+          fill: true,
+          pointRadius: t.scores.length > 200 ? 0 : 4,
+        }},
+        {{
+          label: 'Champion',
+          data: t.champions,
+          borderColor: '#22c55e',
+          borderDash: [6, 3],
+          stepped: true,
+          fill: false,
+          pointRadius: 0,
+        }},
+      ]
     }},
-    plugins: {{ legend: {{ labels: {{ color: '#cbd5e1' }} }} }}
-  }}
+    options: {{
+      responsive: true,
+      animation: false,
+      parsing: false,
+      scales: {{ y: {{ min: 0, max: t.max, ...axis }}, x: {{ type: 'linear', ...axis }} }},
+      plugins: legend
+    }}
+  }});
 }});
 
-const barCtx = document.getElementById('barChart').getContext('2d');
-new Chart(barCtx, {{
-  type: 'bar',
-  data: {{
-    labels: {bar_labels},
-    datasets: [{{
-      label: '% score',
-      data: {bar_data},
-      backgroundColor: {bar_colors},
-      borderRadius: 4,
-    }}]
-  }},
-  options: {{
-    indexAxis: 'y',
-    responsive: true,
-    scales: {{
-      x: {{ min: 0, max: 100, grid: {{ color: '#334155' }},
-            ticks: {{ color: '#94a3b8', callback: v => v + '%' }} }},
-      y: {{ grid: {{ display: false }}, ticks: {{ color: '#94a3b8', font: {{ size: 11 }} }} }}
+const renderers = {{
+  spend: d => new Chart(document.getElementById('spendChart'), {{
+    data: {{
+      datasets: [
+        {{
+          type: 'bar',
+          label: 'Cost ($)',
+          data: d.cost,
+          backgroundColor: 'rgba(245,158,11,0.6)',
+          borderRadius: 4,
+          yAxisID: 'cost',
+        }},
+        {{
+          type: 'line',
+          label: 'API time (s, summed over calls)',
+          data: d.seconds,
+          borderColor: '#38bdf8',
+          tension: 0.3,
+          pointRadius: 3,
+          yAxisID: 'secs',
+        }},
+      ]
     }},
-    plugins: {{ legend: {{ display: false }} }}
+    options: {{
+      responsive: true,
+      animation: false,
+      parsing: false,
+      scales: {{
+        cost: {{ position: 'left', beginAtZero: true, grid: {{ color: '#334155' }},
+                 ticks: {{ color: '#94a3b8', callback: v => '$' + v }} }},
+        secs: {{ position: 'right', beginAtZero: true, grid: {{ display: false }},
+                 ticks: {{ color: '#94a3b8', callback: v => v + 's' }} }},
+        x: {{ type: 'linear', ...axis }}
+      }},
+      plugins: legend
+    }}
+  }}),
+  heatmap: drawHeatmap,
+}};
+
+// Charts below the fold load their data only when scrolled into view.
+const observer = new IntersectionObserver(entries => entries.forEach(entry => {{
+  if (!entry.isIntersecting) return;
+  observer.unobserve(entry.target);
+  const name = entry.target.dataset.chunk;
+  loadChunk(name).then(renderers[name]);
+}}));
+document.querySelectorAll('.lazy').forEach(el => observer.observe(el));
+
+function heatColor(v, max) {{
+  if (v === null) return '#0f172a';
+  const t = v / max;
+  const [r, g, b] = t < 0.5
+    ? [239, 68 + (158 - 68) * t * 2, 68 - (68 - 11) * t * 2]
+    : [245 - (245 - 34) * (t - 0.5) * 2, 158 + (197 - 158) * (t - 0.5) * 2, 11 + (94 - 11) * (t - 0.5) * 2];
+  return `rgb(${{r | 0}},${{g | 0}},${{b | 0}})`;
+}}
+
+function drawHeatmap(h) {{
+  const canvas = document.getElementById('heatmap');
+  const label = 96, cellH = 10;
+  const cellW = Math.max(2, Math.min(24, Math.floor((canvas.parentElement.clientWidth - label) / Math.max(1, h.columns.length))));
+  canvas.width = label + cellW * h.columns.length;
+  canvas.height = cellH * h.rows.length;
+  const ctx = canvas.getContext('2d');
+  ctx.font = '9px monospace';
+  ctx.fillStyle = '#94a3b8';
+  h.rows.forEach((name, y) => ctx.fillText(name, 2, y * cellH + 8));
+  h.values.forEach((column, x) => column.forEach((v, y) => {{
+    ctx.fillStyle = heatColor(v, h.max);
+    ctx.fillRect(label + x * cellW, y * cellH, cellW - (cellW > 3 ? 1 : 0), cellH - 1);
+  }}));
+  if (h.bucket > 1) text('heatmapTitle', 'Requirement scores over all iterations (mean per plan, 0–10; ' + h.bucket + ' score files per column)');
+  canvas.onmousemove = e => {{
+    const x = Math.floor((e.offsetX - label) / cellW), y = Math.floor(e.offsetY / cellH);
+    const v = x >= 0 && x < h.values.length && y >= 0 && y < h.rows.length ? h.values[x][y] : undefined;
+    text('heatmapTip', v === undefined ? '\\u00a0'
+      : 'iteration ' + h.columns[x] + ' · ' + h.rows[y] + ': ' + (v === null ? 'n/a' : (v / 10).toFixed(1)));
+  }};
+}}
+
+let nextRows = -1;
+function loadOlder() {{
+  const button = document.getElementById('loadOlder');
+  if (nextRows < 0) {{ button.hidden = true; return; }}
+  loadChunk('rows_' + String(nextRows).padStart(4, '0')).then(rows => {{
+    rows.slice().reverse().forEach(appendRow);
+    nextRows -= 1;
+    button.hidden = nextRows < 0;
+  }});
+}}
+document.getElementById('loadOlder').onclick = loadOlder;
+
+const BADGES = ['keep', 'discard', 'baseline', 'aborted', 'prereject', 'undecided'];
+let rowCount = 0;
+function appendRow([iteration, candidate, ts, score, champion, status, brief, preview, bullets, plans, bound]) {{
+  const body = document.getElementById('resultRows');
+  const id = 'detail-' + rowCount++;
+  const max = DASH.summary.max;
+  const badge = BADGES.includes(status) ? 'badge-' + status : 'badge-discard';
+  const row = document.createElement('tr');
+  row.className = 'data-row';
+  row.onclick = () => toggleDetail(id);
+  row.innerHTML = `
+    <td class="iter-cell"></td><td class="ts-cell"></td>
+    <td class="score-cell"><span class="score-num"></span><span class="score-pct"></span>
+      <div class="row-bar"><div class="row-bar-fill" style="width:${{pct(score, max)}}%"></div></div></td>
+    <td class="champ-val"></td><td><span class="badge ${{badge}}"></span></td><td class="brief-cell"></td>
+    <td class="expand-cell"><span class="expand-icon">▸</span> <span class="preview-text"></span></td>`;
+  const cells = row.children;
+  cells[0].textContent = '#' + iteration + (candidate ? '.' + candidate : '');
+  cells[1].textContent = ts;
+  cells[2].querySelector('.score-num').textContent = score ?? '—';
+  cells[2].querySelector('.score-pct').textContent = score === null
+    ? (bound === null ? '' : 'at most ' + bound) : pct(score, max) + '%';
+  cells[3].textContent = champion;
+  cells[4].firstChild.textContent = status;
+  cells[5].textContent = brief;
+  cells[6].querySelector('.preview-text').textContent = preview + '…';
+  const detail = document.createElement('tr');
+  detail.className = 'detail-row';
+  detail.id = id;
+  detail.innerHTML = `<td colspan="7"><div class="analysis-panel"><div class="analysis-label">Analysis</div>
+    <div class="analysis-body"><ul></ul></div></div></td>`;
+  const list = detail.querySelector('ul');
+  bullets.forEach(b => {{ const li = document.createElement('li'); li.textContent = b; list.appendChild(li); }});
+  if (plans.length) {{
+    const line = document.createElement('div');
+    line.className = 'plans-line';
+    line.textContent = 'Plans: ' + plans.map(([n, b, v, s]) => '#' + n + ' ' + b + ' v' + v + ': ' + (s ?? '–')).join(' · ');
+    detail.querySelector('.analysis-panel').appendChild(line);
   }}
-}});
+  body.appendChild(row);
+  body.appendChild(detail);
+}}
 </script>
 <script>
 function toggleDetail(id) {{
@@ -364,18 +689,16 @@ function toggleDetail(id) {{
 
 
 def main() -> None:
+    start = time.perf_counter()
     rows = load_results()
     if not rows:
         print("No results yet. Run score_baseline.py first, then run.py.")
         return
 
-    latest_score_data = load_latest_score_data()
-    html = generate_html(rows, latest_score_data)
-
-    with open(DASHBOARD, "w", encoding="utf-8") as f:
-        f.write(html)
+    written, total = build(rows)
 
-    print(f"Dashboard written to: {DASHBOARD}")
+    print(f"Dashboard written to: {DASHBOARD} ({len(rows)} rows; {written}/{total} data chunks "
+          f"updated in {time.perf_counter() - start:.2f}s)")
     webbrowser.open(f"file://{DASHBOARD}")
 
 
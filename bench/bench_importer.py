@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+bench/bench_importer.py — Benchmark the phasecompiler_import.py template offline.
+
+The importer script is extracted from SKILL.md and run against a local fake of
+GitHub's Issues and Milestones REST endpoints (real HTTP over 127.0.0.1, so the
+pooled session, pagination and rate-limit handling are all exercised).
+
+For every scenario (phase count × tasks per phase × pre-existing issues) it runs:
+  - import:  first sync with no state file
+  - rerun:   idempotent re-sync with the state file (should be ~free)
+  - full:    re-sync with --full, rebuilding state from the marker scan
+  - shrink:  sync a plan with its last phase dropped (closes that phase)
+  - refull:  --full again on the shrunk plan (closed items must stay closed)
+  - usered:  a person closes a planned task and its milestone and edits another
+             issue's body on GitHub, then --full (none of it may be undone)
+
+and reports HTTP requests, pages fetched, writes, rate-limit responses and wall
+time as JSON. --check exits non-zero if an idempotent re-run makes any write or
+more than one request, or if any --full rebuild writes anything, so this can gate CI.
+
+Run: python bench/bench_importer.py [--latency-ms 20] [--inject-every 25] [--check]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT       = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKILL_FILE = os.path.join(ROOT, "SKILL.md")
+
+PHASE_COUNTS    = [6, 9, 12]
+TASKS_PER_PHASE = [3, 8]
+EXISTING_ISSUES = [0, 3000]
+MAX_PER_PAGE    = 100  # GitHub caps per_page at 100
+
+# ── fake github ────────────────────────────────────────────────────────────────
+
+class FakeGitHub:
+    """In-memory issues + milestones for one repo, with request accounting."""
+
+    def __init__(self, existing_issues: int, latency_s: float, inject_every: int) -> None:
+        self.lock = threading.Lock()
+        self.latency_s = latency_s
+        self.inject_every = inject_every
+        self.issues: list[dict] = [
+            {"number": i + 1, "title": f"Existing issue {i + 1}", "body": "Unrelated.", "state": "open"}
+            for i in range(existing_issues)
+        ]
+        self.milestones: list[dict] = []
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        self.requests = 0
+        self.pages = 0
+        self.writes = 0
+        self.rate_limited = 0
+
+    # Returns (status, payload, extra headers)
+    def handle(self, method: str, path: str, query: dict, body: dict | None) -> tuple[int, object, dict]:
+        time.sleep(self.latency_s)
+        with self.lock:
+            self.requests += 1
+            if self.inject_every and self.requests % self.inject_every == 0:
+                self.rate_limited += 1
+                status = 429 if self.rate_limited % 2 else 403
+                return status, {"message": "You have exceeded a secondary rate limit."}, {"Retry-After": "0"}
+
+            parts = path.strip("/").split("/")  # repos/{owner}/{repo}/{collection}[/{number}]
+            if len(parts) < 4 or parts[0] != "repos" or parts[3] not in {"issues", "milestones"}:
+                return 404, {"message": "Not Found"}, {}
+            items = self.issues if parts[3] == "issues" else self.milestones
+            number = int(parts[4]) if len(parts) > 4 else None
+
+            if method == "GET" and number is None:
+                self.pages += 1
+                per_page = min(int(query.get("per_page", ["30"])[0]), MAX_PER_PAGE)
+                page = int(query.get("page", ["1"])[0])
+                newest_first = list(reversed(items))
+                return 200, newest_first[(page - 1) * per_page: page * per_page], {}
+            if method == "GET":
+                if 0 < number <= len(items):
+                    return 200, items[number - 1], {}
+                return 404, {"message": "Not Found"}, {}
+            if method == "POST" and number is None:
+                self.writes += 1
+                item = {"number": len(items) + 1, "state": "open", **(body or {})}
+                items.append(item)
+                return 201, item, {}
+            if method == "PATCH" and number is not None and 0 < number <= len(items):
+                self.writes += 1
+                items[number - 1].update(body or {})
+                return 200, items[number - 1], {}
+            return 422, {"message": "Unprocessable"}, {}
+
+
+def serve(fake: FakeGitHub) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def _dispatch(self) -> None:
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+            status, payload, headers = fake.handle(self.command, url.path, parse_qs(url.query), body)
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("X-RateLimit-Remaining", "5000")
+            self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PATCH = _dispatch
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# ── importer ───────────────────────────────────────────────────────────────────
+
+def load_importer(api_base: str) -> types.ModuleType:
+    """Extract the phasecompiler_import.py template from SKILL.md as a module."""
+    with open(SKILL_FILE, encoding="utf-8") as f:
+        match = re.search(r"```py\n(.*?)```", f.read(), re.DOTALL)
+    if not match:
+        sys.exit("phasecompiler_import.py template not found in SKILL.md.")
+    module = types.ModuleType("phasecompiler_import")
+    sys.modules[module.__name__] = module  # dataclasses look the module up by name
+    exec(compile(match.group(1), "phasecompiler_import.py", "exec"), module.__dict__)
+    module.API_BASE = api_base
+    return module
+
+
+def synthetic_plan(num_phases: int, tasks_per_phase: int) -> dict:
+    return {
+        "phases": [
+            {
+                "id": p,
+                "title": f"Synthetic phase {p}",
+                "tasks": [f"Write component {p}.{t} and its unit tests" for t in range(1, tasks_per_phase + 1)],
+            }
+            for p in range(1, num_phases + 1)
+        ]
+    }
+
+
+def run_importer(importer: types.ModuleType, fake: FakeGitHub, argv: list[str]) -> dict:
+    fake.reset_counters()
+    start = time.perf_counter()
+    old_argv = sys.argv
+    sys.argv = ["phasecompiler_import.py", *argv, "--repo", "bench/repo", "--token", "bench"]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            importer.main()
+    finally:
+        sys.argv = old_argv
+    return {
+        "requests": fake.requests,
+        "pages": fake.pages,
+        "writes": fake.writes,
+        "rate_limited": fake.rate_limited,
+        "wall_s": round(time.perf_counter() - start, 3),
+    }
+
+# ── scenarios ──────────────────────────────────────────────────────────────────
+
+def user_edits(fake: FakeGitHub) -> None:
+    """Close the first imported task and its milestone, and annotate the second task, as a person would."""
+    with fake.lock:
+        tasks = [i for i in fake.issues if "phasecompiler:key=phase:1:" in (i.get("body") or "")]
+        tasks[0]["state"] = "closed"
+        tasks[1]["body"] += "\nNotes added on GitHub.\n"
+        fake.milestones[0]["state"] = "closed"
+
+
+def run_scenario(
+    num_phases: int,
+    tasks_per_phase: int,
+    existing_issues: int,
+    latency_s: float,
+    inject_every: int,
+) -> dict:
+    fake = FakeGitHub(existing_issues, latency_s, inject_every)
+    server = serve(fake)
+    importer = load_importer(f"http://127.0.0.1:{server.server_address[1]}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            plan_path = os.path.join(tmp, "plan.json")
+            state_path = os.path.join(tmp, "import-state.json")
+            with open(plan_path, "w", encoding="utf-8") as f:
+                json.dump(synthetic_plan(num_phases, tasks_per_phase), f)
+            args = [plan_path, "--state", state_path]
+            result = {
+                "phases": num_phases,
+                "tasks_per_phase": tasks_per_phase,
+                "existing_issues": existing_issues,
+                "import": run_importer(importer, fake, args),
+                "rerun": run_importer(importer, fake, args),
+                "full": run_importer(importer, fake, [*args, "--full"]),
+            }
+            with open(plan_path, "w", encoding="utf-8") as f:
+                json.dump(synthetic_plan(num_phases - 1, tasks_per_phase), f)
+            result["shrink"] = run_importer(importer, fake, args)
+            result["refull"] = run_importer(importer, fake, [*args, "--full"])
+            user_edits(fake)
+            result["usered"] = run_importer(importer, fake, [*args, "--full"])
+            return result
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark the SKILL.md importer against a fake GitHub.")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="simulated per-request latency")
+    ap.add_argument("--inject-every", type=int, default=0,
+                    help="answer every Nth request with a 429/403 rate limit (0 = never)")
+    ap.add_argument("--out", help="also write the JSON report to this path")
+    ap.add_argument("--check", action="store_true",
+                    help="fail if an idempotent re-run writes anything or makes more than one request, "
+                         "or a --full rebuild writes anything")
+    args = ap.parse_args()
+
+    results = [
+        run_scenario(phases, tasks, existing, args.latency_ms / 1000, args.inject_every)
+        for phases in PHASE_COUNTS
+        for tasks in TASKS_PER_PHASE
+        for existing in EXISTING_ISSUES
+    ]
+    report = json.dumps({"latency_ms": args.latency_ms, "inject_every": args.inject_every,
+                         "scenarios": results}, indent=2)
+    print(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+
+    if args.check:
+        # Injected rate limits add retried requests, so compare successful ones only.
+        bad = [
+            r for r in results
+            if r["rerun"]["writes"] > 0 or r["rerun"]["requests"] - r["rerun"]["rate_limited"] > 1
+            or any(r[step]["writes"] > 0 for step in ("full", "refull", "usered"))
+        ]
+        if bad:
+            sys.exit(f"Idempotent re-run regressed in {len(bad)} scenario(s).")
+
+
+if __name__ == "__main__":
+    main()